@@ -14,6 +14,10 @@ Capabilities:
 Tools:
 - send_message: Send tasks to individual buyer agents
 - execute_buyer_workflow: Execute the complete sequential buyer workflow
+- execute_buyer_workflow_batch: Execute several buyer workflows as a pipeline with overlapping stages
+- resume_buyer_workflow: Resume a checkpointed buyer workflow, re-running only unfinished steps such as a delayed purchase order generation
+- get_buyer_workflow_status: Get the state and results of a workflow started in job mode
+- cancel_buyer_workflow: Cancel a workflow still running in job mode, canceling the remote agent tasks it waits on
 
 Workflow:
 1. Inventory Management Agent: Analyzes current stock levels and demand patterns
@@ -26,10 +30,59 @@ This agent uses A2AClient to communicate with the three buyer agents via HTTP:
 - Purchase Validation Agent (port 8002) 
 - Purchase Order Agent (port 8003)
 
-Environment Variables:
+Direct workflow runs:
+- POST /workflow with an optional JSON body {"request": "..."} runs the buyer workflow without
+  the orchestrator LLM and returns its workflow results
+- python __main__.py --interface workflow [--request "..."] does the same once from the command line
+
+Monitoring:
+- GET /stats reports connection pool saturation, per-replica routing and circuit state, hedging,
+  caches and workflow jobs
+
+Environment Variables (each agent URL variable accepts a comma-separated list of replica URLs):
 - INVENTORY_AGENT_URL: URL for inventory management agent (default: http://localhost:8001)
 - PURCHASE_VALIDATION_AGENT_URL: URL for purchase validation agent (default: http://localhost:8002)
 - PURCHASE_ORDER_AGENT_URL: URL for purchase order agent (default: http://localhost:8003)
+- A2A_HTTP_TIMEOUT: Timeout in seconds for requests to remote agents (default: 30)
+- A2A_HTTP_MAX_CONNECTIONS / A2A_HTTP_MAX_KEEPALIVE_CONNECTIONS: Shared connection pool limits (default: 100 / 20)
+- A2A_HTTP_KEEPALIVE_EXPIRY: Seconds an idle pooled connection is kept open (default: 30)
+- A2A_HTTP_MAX_CONNECTIONS_PER_HOST: Concurrent requests allowed per remote agent host (default: 20)
+- A2A_HTTP2: Use HTTP/2 multiplexing when the h2 package is installed (default: true)
+- A2A_STREAMING: Delegate over message/stream to agents that advertise streaming (default: true)
+- A2A_REPLICA_MAX_FAILURES: Consecutive transport failures before a replica is ejected (default: 3)
+- A2A_HEALTH_CHECK_INTERVAL: Seconds between replica health checks (default: 15)
+- A2A_BREAKER_FAILURE_RATE / A2A_BREAKER_SLOW_CALL_RATE: Share of failed or slow calls in the window that opens a replica's circuit (default: 0.5 / 0.5)
+- A2A_BREAKER_SLOW_CALL_SECONDS: Call duration counted as slow (default: 60)
+- A2A_BREAKER_WINDOW_SIZE / A2A_BREAKER_MINIMUM_CALLS: Calls considered and calls needed before the circuit can open (default: 20 / 5)
+- A2A_BREAKER_OPEN_SECONDS: Seconds a circuit stays open before a half-open probe is allowed (default: 30)
+- HEDGED_AGENTS: Comma-separated names of read-only agents whose slow requests are hedged on a second replica, e.g. 'Inventory Management Agent' (default: none; Purchase Order Agent and Production Queue Management Agent are never hedged)
+- HEDGE_PERCENTILE / HEDGE_MIN_SAMPLES / HEDGE_SAMPLE_WINDOW: Latency percentile that triggers a hedge, calls timed before hedging starts, and calls kept for the percentile (default: 95 / 10 / 200)
+- WORKFLOW_DEADLINE_SECONDS: Time budget for one workflow, shared between its steps and sent to agents in message metadata (default: 600)
+- A2A_RETRY_MAX_ATTEMPTS / A2A_RETRY_BASE_DELAY / A2A_RETRY_MAX_DELAY: Attempts per agent call and jittered exponential backoff bounds in seconds (default: 3 / 0.5 / 8)
+- A2A_RETRY_MIN_ATTEMPT_SECONDS: Least time that must be left before the deadline to retry (default: 1)
+- WORKFLOW_STORE_PATH: SQLite file workflow step checkpoints are kept in (default: ~/.cache/a2a_adk_agents/buyer_orchestrator_workflows.sqlite3)
+- WORKFLOW_STORE_RETENTION: Seconds checkpointed workflows are kept (default: 604800)
+- WORKFLOW_JOB_MODE: Run workflow tools as background jobs that return a workflow_id at once, can be polled with tasks/get and stopped with tasks/cancel (default: false)
+- WORKFLOW_JOB_CONCURRENCY: Background workflow jobs run at once; further jobs wait as submitted (default: 100)
+- A2A_PUSH_NOTIFICATIONS: Set to true to have agents that support it push task updates to a webhook instead of holding a connection open (fastapi interface only, default: false)
+- A2A_PUSH_WEBHOOK_URL: Address remote agents should POST task updates to (default: the agent card URL + /a2a/push)
+- A2A_PUSH_TOKEN: Token remote agents must send with each push notification (default: random per process)
+- A2A_PUSH_FALLBACK_POLL_SECONDS: Seconds without a final push update before the task is polled (default: 30)
+- RESULT_CACHE_AGENTS: Comma-separated agent names whose completed results are reused for identical tasks, e.g. Inventory Management Agent (default: none; agents whose tasks are not idempotent are never cached)
+- RESULT_CACHE_TTL_SECONDS: Seconds a cached result is reused for (default: 300)
+- RESULT_CACHE_MAX_ENTRIES: Cached results kept before the least recently used is evicted (default: 256)
+- RESULT_CACHE_DATA_VERSION: Token for the current version of the agents' underlying data; change it to stop reusing results computed from older data (default: empty)
+- A2A_SINGLE_FLIGHT: Let concurrent identical tasks for idempotent agents share one in-flight call (default: true)
+- STATUS_UPDATE_COALESCE_SECONDS: Window in seconds within which the A2A server merges the agent's partial responses into one working status update; 0 sends each one (default: 0.25)
+- STATUS_UPDATE_COALESCE_MAX_CHARS: Characters of held partial responses that send them before the window ends (default: 4000)
+- AGENT_STARTUP_DEADLINE: Seconds to wait for agent cards at startup before continuing without them (default: 10)
+- AGENT_CARD_RETRY_INTERVAL: Initial backoff in seconds for background card retries (default: 2)
+- AGENT_CARD_CACHE_PATH: On-disk agent card cache file (default: ~/.cache/a2a_adk_agents/<orchestrator>_agent_cards.json)
+- AGENT_CARD_CACHE_TTL: Seconds a cached agent card is used without waiting for a refetch (default: 3600)
+- HANDOFF_MAX_CHARS: Maximum characters of a step's output passed on to the next step (default: 4000)
+- INVENTORY_SHARDS: Comma-separated shards for step 1, e.g. 'category:Office,sku:A000-A999'; empty analyzes the whole catalog at once
+- INVENTORY_SHARD_CONCURRENCY: Shards analyzed at the same time (default: number of shards)
+- PIPELINE_INVENTORY_CONCURRENCY / PIPELINE_VALIDATION_CONCURRENCY / PIPELINE_PURCHASE_ORDER_CONCURRENCY: Requests each stage of execute_buyer_workflow_batch works on at once (default: 1)
 
 Usage:
 The agent will automatically detect and connect to available buyer agents on startup.
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import logging
 import os
 import traceback
@@ -10,8 +11,15 @@ from dotenv import load_dotenv
 import gradio as gr
 import uvicorn
 
-from agent import root_agent
+from agent import (
+    BUYER_WORKFLOW_PROMPT,
+    BuyerOrchestratorAgent,
+    create_root_agent,
+    get_buyer_orchestrator,
+)
 from agent_executor import ADKAgentExecutor
+from push_receiver import PushNotificationReceiver
+from workflow_jobs import json_safe
 
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.events import Event
@@ -28,6 +36,9 @@ from a2a.types import (
     AgentCard,
     AgentSkill,
 )
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
 
 
 logger = logging.getLogger(__name__)
@@ -109,12 +120,17 @@ async def run_gradio_interface(host: str, port: int, runner: Runner, session_ser
         app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
     )
     print('ADK session created successfully.')
-
-    # Predefined prompt for buyer workflow
-    BUYER_WORKFLOW_PROMPT = "Analyze inventory levels and validate purchase requirements. Create PO documents as required and send to respective supplier email."
+    # The orchestrator, its remote connections and background tasks live on this loop
+    loop = asyncio.get_running_loop()
 
     async def trigger_buyer_workflow():
         """Trigger the buyer workflow and return the response."""
+        # Gradio calls handlers on its own event loop; run the agent on the orchestrator's
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(run_buyer_workflow(), loop)
+        )
+
+    async def run_buyer_workflow():
         try:
             event_iterator: AsyncIterator[Event] = runner.run_async(
                 user_id=USER_ID,
@@ -159,7 +175,7 @@ async def run_gradio_interface(host: str, port: int, runner: Runner, session_ser
             
         except Exception as e:
             error_msg = f'❌ **Error:** {e}'
-            print(f'Error in trigger_buyer_workflow: {e}')
+            print(f'Error in run_buyer_workflow: {e}')
             traceback.print_exc()
             return error_msg
 
@@ -195,14 +211,66 @@ async def run_gradio_interface(host: str, port: int, runner: Runner, session_ser
     demo.queue().launch(
         server_name=host,
         server_port=port,
+        prevent_thread_lock=True,
     )
-    print('Gradio application has been shut down.')
+    try:
+        # Gradio serves from its own thread; keep this loop free for the
+        # orchestrator's health checks and card retries until shutdown
+        await asyncio.Event().wait()
+    finally:
+        demo.close()
+        print('Gradio application has been shut down.')
+
+
+def workflow_routes(orchestrator: BuyerOrchestratorAgent) -> list[Route]:
+    """Routes that run the buyer workflow directly, without an orchestrator LLM turn."""
+
+    async def run_workflow(request: Request) -> JSONResponse:
+        workflow_request = BUYER_WORKFLOW_PROMPT
+        if await request.body():
+            try:
+                body = await request.json()
+            except ValueError:
+                return JSONResponse({'error': 'Request body must be JSON'}, status_code=400)
+            if not isinstance(body, dict) or not isinstance(body.get('request', ''), str):
+                return JSONResponse({'error': "Expected a JSON object with a 'request' string"}, status_code=400)
+            workflow_request = body.get('request') or BUYER_WORKFLOW_PROMPT
+        results = await orchestrator.run_workflow(workflow_request)
+        return JSONResponse(json_safe(results))
+
+    return [Route('/workflow', run_workflow, methods=['POST'])]
+
+
+def stats_routes(
+    orchestrator: BuyerOrchestratorAgent, executor: ADKAgentExecutor
+) -> list[Route]:
+    """Routes that report connection pool saturation, replica and hedging metrics, and executor load."""
+
+    async def stats(request: Request) -> JSONResponse:
+        return JSONResponse(
+            json_safe({'orchestrator': orchestrator.stats(), 'executor': executor.stats()})
+        )
+
+    return [Route('/stats', stats, methods=['GET'])]
+
+
+async def run_workflow_once(workflow_request: str) -> None:
+    """Run the buyer workflow once, print its results as JSON and exit."""
+    orchestrator = await get_buyer_orchestrator()
+    # Wait for the workflow even in job mode: a background job would be
+    # cancelled when this process exits
+    results = await orchestrator.run_workflow(workflow_request, wait=True)
+    print(json.dumps(json_safe(results), indent=2))
+    if results.get('status') == 'failed':
+        raise SystemExit(1)
+
 
 @click.command()
 @click.option("--host", default="localhost", help="Host to bind the server to")
 @click.option("--port", default=8093, help="Port to bind the server to")
-@click.option("--interface", default="fastapi", type=click.Choice(['fastapi', 'gradio', 'text']), help="Interface to use: fastapi, gradio, or text")
-def main(host: str, port: int, interface: str):
+@click.option("--interface", default="fastapi", type=click.Choice(['fastapi', 'gradio', 'text', 'workflow']), help="Interface to use: fastapi, gradio, text, or workflow to run the buyer workflow once without the LLM")
+@click.option("--request", "workflow_request", default=BUYER_WORKFLOW_PROMPT, help="Workflow request for the workflow interface")
+def main(host: str, port: int, interface: str, workflow_request: str):
     """Run the buyer orchestrator agent server."""
     logger.info("--- 🚀 Starting Buyer Orchestrator Agent Server... ---")
     
@@ -227,6 +295,17 @@ def main(host: str, port: int, interface: str):
         skills=[skill],
     )
 
+    if interface == "workflow":
+        asyncio.run(run_workflow_once(workflow_request))
+        return
+
+    asyncio.run(serve(host, port, interface, agent_card))
+
+
+async def serve(host: str, port: int, interface: str, agent_card: AgentCard):
+    """Build the orchestrator inside this event loop and run the chosen interface."""
+    root_agent = await create_root_agent()
+
     # Create session service
     session_service = InMemorySessionService()
 
@@ -239,25 +318,43 @@ def main(host: str, port: int, interface: str):
         artifact_service=InMemoryArtifactService(),
     )
 
+    push_receiver = PushNotificationReceiver.from_env(agent_card.url)
+    if push_receiver and interface != "fastapi":
+        print('Push notifications need the fastapi interface to receive them; waiting on remote agents directly.')
+
     if interface == "gradio":
         # Run Gradio interface
-        asyncio.run(run_gradio_interface(host, port, runner, session_service))
+        await run_gradio_interface(host, port, runner, session_service)
     elif interface == "text":
         # Run simple text client
-        asyncio.run(run_text_client(runner, session_service))
+        await run_text_client(runner, session_service)
     else:
         # Run FastAPI server (default)
-        executor = ADKAgentExecutor(runner, agent_card)
+        # Workflow jobs live in the server's task store so tasks/get can poll
+        # them and tasks/cancel can stop them
+        task_store = InMemoryTaskStore()
+        orchestrator = await get_buyer_orchestrator()
+        orchestrator.jobs.attach_task_store(task_store)
+        executor = ADKAgentExecutor(runner, agent_card, jobs=orchestrator.jobs)
         
         app = A2AFastAPIApplication(
             agent_card=agent_card,
             http_handler=DefaultRequestHandler(
                 agent_executor=executor,
-                task_store=InMemoryTaskStore(),
+                task_store=task_store,
             )
-        )
-        uvicorn.run(app.build(), host=host, port=port)
-
+        ).build()
+        # POST /workflow runs the workflow without the orchestrator LLM
+        app.router.routes.extend(workflow_routes(orchestrator))
+        # GET /stats reports connection pool and replica metrics
+        app.router.routes.extend(stats_routes(orchestrator, executor))
+        if push_receiver:
+            # Remote agents push task updates to a webhook on this server
+            app.router.routes.extend(push_receiver.routes())
+            orchestrator.push_receiver = push_receiver
+            print(f'Receiving push notifications at {push_receiver.webhook_url}')
+        server = uvicorn.Server(uvicorn.Config(app, host=host, port=port))
+        await server.serve()
 
 async def send_text_to_agent(text: str, runner: Runner, session_service: InMemorySessionService) -> str:
     """
@@ -325,8 +422,9 @@ async def run_text_client(runner: Runner, session_service: InMemorySessionServic
 
     while True:
         try:
-            # Get user input
-            user_input = input("You: ").strip()
+            # Wait for input in a thread, so the orchestrator's background
+            # tasks keep running on this loop meanwhile
+            user_input = (await asyncio.to_thread(input, "You: ")).strip()
             
             if user_input.lower() in ['quit', 'exit', 'q']:
                 print("Goodbye!")
@@ -342,7 +440,7 @@ async def run_text_client(runner: Runner, session_service: InMemorySessionServic
             print(response)
             print()
             
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             print("\nGoodbye!")
             break
         except Exception as e:
@@ -1,37 +1,11 @@
-import asyncio
-import json
-import logging
-import os
-import uuid
-from typing import Any
-
-import httpx
-
-from a2a.client import A2ACardResolver
-from a2a.types import (
-    AgentCard,
-    MessageSendParams,
-    Part,
-    SendMessageRequest,
-    SendMessageResponse,
-    SendMessageSuccessResponse,
-    Task,
-)
-from remote_agent_connection import (
-    RemoteAgentConnections,
-    TaskUpdateCallback,
-)
-from dotenv import load_dotenv
-from google.adk.agents import LlmAgent
-from google.adk.agents.callback_context import CallbackContext
-from google.adk.agents.readonly_context import ReadonlyContext
-from google.adk.tools.tool_context import ToolContext
-
 # ruff: noqa: E501
 # pylint: disable=logging-fstring-interpolation
 import asyncio
+import contextlib
+import contextvars
 import json
 import os
+import time
 import uuid
 
 from typing import Any
@@ -41,16 +15,35 @@ import httpx
 from a2a.client import A2ACardResolver
 from a2a.types import (
     AgentCard,
+    MessageSendConfiguration,
     MessageSendParams,
     Part,
     SendMessageRequest,
     SendMessageResponse,
     SendMessageSuccessResponse,
+    SendStreamingMessageRequest,
     Task,
 )
+from card_cache import AgentCardCache
+from push_receiver import PushNotificationReceiver
+from remote_progress import forward_remote_update
 from remote_agent_connection import (
+    NON_IDEMPOTENT_AGENTS,
     RemoteAgentConnections,
     TaskUpdateCallback,
+    call_deadline,
+    get_shared_transport,
+)
+from result_cache import ResultCache, normalize_task_text
+from retry_policy import Deadline, DeadlineExceededError, RetryPolicy
+from single_flight import SingleFlight
+from workflow_jobs import WorkflowJobManager
+from workflow_store import WorkflowStore
+from workflow_handoff import (
+    extract_task_output,
+    format_handoff,
+    handoff_token_counts,
+    merge_handoffs,
 )
 from dotenv import load_dotenv
 from google.adk import Agent
@@ -61,6 +54,19 @@ from google.adk.tools.tool_context import ToolContext
 
 load_dotenv()
 
+# The fixed request the Gradio button and scheduled runs start the workflow with
+BUYER_WORKFLOW_PROMPT = "Analyze inventory levels and validate purchase requirements. Create PO documents as required and send to respective supplier email."
+
+
+class DirectToolContext:
+    """Stands in for the ADK ToolContext when a workflow runs without the LLM.
+
+    Workflow steps only use the context to keep per-run state.
+    """
+
+    def __init__(self):
+        self.state: dict[str, Any] = {}
+
 
 def convert_part(part: Part, tool_context: ToolContext):
     """Convert a part to text. Only text parts are supported."""
@@ -98,6 +104,17 @@ def create_send_message_payload(
     return payload
 
 
+def _describe_inventory_shard(shard: str) -> str:
+    """Describe an INVENTORY_SHARDS entry such as 'category:Office' or 'sku:A000-A999'."""
+    kind, _, value = shard.partition(':')
+    if kind == 'category' and value:
+        return f"the '{value}' category"
+    if kind == 'sku' and value:
+        first, _, last = value.partition('-')
+        return f'SKUs {first} through {last}' if last else f'SKU {first}'
+    return shard
+
+
 class BuyerOrchestratorAgent:
     """The Buyer Orchestrator agent.
 
@@ -113,36 +130,194 @@ class BuyerOrchestratorAgent:
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
         self.agents: str = ''
+        self.startup_deadline = float(os.getenv('AGENT_STARTUP_DEADLINE', '10'))
+        self.card_retry_interval = float(
+            os.getenv('AGENT_CARD_RETRY_INTERVAL', '2')
+        )
+        self.card_retry_max_interval = 60.0
+        self.inventory_shards = [
+            shard.strip()
+            for shard in os.getenv('INVENTORY_SHARDS', '').split(',')
+            if shard.strip()
+        ]
+        self.inventory_shard_concurrency = int(
+            os.getenv(
+                'INVENTORY_SHARD_CONCURRENCY', str(max(len(self.inventory_shards), 1))
+            )
+        )
+        self.pipeline_stage_limits = {
+            'inventory': int(os.getenv('PIPELINE_INVENTORY_CONCURRENCY', '1')),
+            'validation': int(os.getenv('PIPELINE_VALIDATION_CONCURRENCY', '1')),
+            'purchase_order': int(os.getenv('PIPELINE_PURCHASE_ORDER_CONCURRENCY', '1')),
+        }
+        self._unresolved_addresses: set[str] = set()
+        self._resolution_tasks: dict[str, asyncio.Task] = {}
+        self._background_tasks: set[asyncio.Task] = set()
+        self.health_check_interval = float(
+            os.getenv('A2A_HEALTH_CHECK_INTERVAL', '15')
+        )
+        self._health_check_task: asyncio.Task | None = None
+        self.card_cache = AgentCardCache.from_env('buyer_orchestrator')
+        self.retry_policy = RetryPolicy.from_env()
+        self.result_cache = ResultCache.from_env(NON_IDEMPOTENT_AGENTS)
+        self.in_flight = SingleFlight(
+            os.getenv('A2A_SINGLE_FLIGHT', 'true').lower() == 'true'
+        )
+        self.workflow_store = WorkflowStore.from_env('buyer_orchestrator')
+        self.jobs = WorkflowJobManager.from_env()
+        self.job_mode = os.getenv('WORKFLOW_JOB_MODE', 'false').lower() == 'true'
+        # Set by the server when remote agents should push task updates to it
+        self.push_receiver: PushNotificationReceiver | None = None
 
     async def _async_init_components(
         self, remote_agent_addresses: list[str]
     ) -> None:
-        """Asynchronous part of initialization."""
-        # Use a single httpx.AsyncClient for all card resolutions for efficiency
-        async with httpx.AsyncClient(timeout=30) as client:
-            for address in remote_agent_addresses:
-                card_resolver = A2ACardResolver(
-                    client, address
-                )  # Constructor is sync
-                try:
-                    card = (
-                        await card_resolver.get_agent_card()
-                    )  # get_agent_card is async
+        """Asynchronous part of initialization.
 
-                    remote_connection = RemoteAgentConnections(
-                        agent_card=card, agent_url=address
-                    )
-                    self.remote_agent_connections[card.name] = remote_connection
-                    self.cards[card.name] = card
-                except httpx.ConnectError as e:
-                    print(
-                        f'ERROR: Failed to get agent card from {address}: {e}'
-                    )
-                except Exception as e:  # Catch other potential errors
+        Cards that are fresh in the on-disk cache are used right away and
+        revalidated in the background. The rest are resolved concurrently under
+        one startup deadline. Agents that have not answered by then keep being
+        retried in the background and are added once they come up.
+        """
+        attempts: dict[str, asyncio.Task] = {}
+        expired_cards: dict[str, AgentCard] = {}
+        for address in remote_agent_addresses:
+            cached = self.card_cache.get(address)
+            if cached is not None and cached[1]:
+                self._register_agent_card(address, cached[0])
+                self._start_background_task(
+                    self._revalidate_agent_card(address)
+                )
+                continue
+            if cached is not None:
+                expired_cards[address] = cached[0]
+            self._unresolved_addresses.add(address)
+            attempts[address] = asyncio.create_task(
+                self._resolve_agent_card(address)
+            )
+
+        if attempts:
+            await asyncio.wait(
+                attempts.values(), timeout=self.startup_deadline
+            )
+        for address, attempt in attempts.items():
+            if not attempt.done():
+                print(
+                    f'WARNING: {address} did not answer within the {self.startup_deadline}s startup deadline; retrying in the background'
+                )
+            if address in self._unresolved_addresses:
+                if address in expired_cards:
                     print(
-                        f'ERROR: Failed to initialize connection for {address}: {e}'
+                        f'WARNING: Using expired cached agent card for {address} until it can be refreshed'
                     )
+                    self._register_agent_card(address, expired_cards[address])
+                self._resolution_tasks[address] = asyncio.create_task(
+                    self._retry_agent_card(address, attempt)
+                )
+
+        self._ensure_background_tasks()
+        self._refresh_agent_listing()
 
+    async def _resolve_agent_card(self, address: str) -> bool:
+        """Fetch the agent card at address, cache it and register its connection."""
+        # Card resolution shares the process-wide connection pool with send_message
+        transport = get_shared_transport()
+        card_resolver = A2ACardResolver(
+            transport.client, address
+        )  # Constructor is sync
+        try:
+            async with transport.host_slot(address):
+                card = (
+                    await card_resolver.get_agent_card()
+                )  # get_agent_card is async
+
+            self._register_agent_card(address, card)
+            self._unresolved_addresses.discard(address)
+            await self.card_cache.put(address, card)
+            return True
+        except httpx.ConnectError as e:
+            print(
+                f'ERROR: Failed to get agent card from {address}: {e}'
+            )
+        except Exception as e:  # Catch other potential errors
+            print(
+                f'ERROR: Failed to initialize connection for {address}: {e}'
+            )
+        return False
+
+    def _register_agent_card(self, address: str, card: AgentCard) -> None:
+        """Register address as a replica of the agent named on its card."""
+        existing = self.remote_agent_connections.get(card.name)
+        if existing is None:
+            self.remote_agent_connections[card.name] = RemoteAgentConnections(
+                agent_card=card, agent_url=address, transport=get_shared_transport()
+            )
+            self.cards[card.name] = card
+            return
+        if address not in existing.replica_urls:
+            existing.add_replica(address)
+        elif existing.card != card:
+            existing.card = card
+            self.cards[card.name] = card
+
+    async def _revalidate_agent_card(self, address: str) -> None:
+        """Refresh a card that was served from the cache."""
+        if await self._resolve_agent_card(address):
+            self._refresh_agent_listing()
+
+    def _start_background_task(self, coro) -> asyncio.Task:
+        """Run coro in the background, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def _retry_agent_card(
+        self, address: str, first_attempt: asyncio.Task | None = None
+    ) -> None:
+        """Keep resolving the agent card at address with backoff until it succeeds."""
+        if first_attempt is not None and await first_attempt:
+            self._refresh_agent_listing()
+            return
+        delay = self.card_retry_interval
+        while address in self._unresolved_addresses:
+            await asyncio.sleep(delay)
+            if await self._resolve_agent_card(address):
+                print(f'Agent at {address} is now available')
+                self._refresh_agent_listing()
+                return
+            delay = min(delay * 2, self.card_retry_max_interval)
+
+    async def _health_check_loop(self) -> None:
+        """Periodically health-check every replica of every remote agent."""
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await asyncio.gather(
+                *(
+                    connection.health_check()
+                    for connection in list(self.remote_agent_connections.values())
+                )
+            )
+
+    def _ensure_background_tasks(self) -> None:
+        """Restart card retries and health checks that are not running on the current loop.
+
+        Tasks started under a loop that has since closed (for example the one
+        used by asyncio.run at import time) are finished and get rescheduled here.
+        """
+        if self._health_check_task is None or self._health_check_task.done():
+            self._health_check_task = asyncio.create_task(
+                self._health_check_loop()
+            )
+        for address in self._unresolved_addresses:
+            task = self._resolution_tasks.get(address)
+            if task is None or task.done():
+                self._resolution_tasks[address] = asyncio.create_task(
+                    self._retry_agent_card(address)
+                )
+
+    def _refresh_agent_listing(self) -> None:
+        """Rebuild the agent listing used in the root instruction."""
         # Populate self.agents using the logic from original __init__ (via list_remote_agents)
         agent_info = []
         for agent_detail_dict in self.list_remote_agents():
@@ -156,8 +331,14 @@ class BuyerOrchestratorAgent:
         task_callback: TaskUpdateCallback | None = None,
     ) -> 'BuyerOrchestratorAgent':
         """Create and asynchronously initialize an instance of the BuyerOrchestratorAgent."""
+        started = time.perf_counter()
         instance = cls(task_callback)
         await instance._async_init_components(remote_agent_addresses)
+        cache_stats = instance.card_cache.stats()
+        print(
+            f'Agent card cache: {cache_stats["hits"]} hit(s), {cache_stats["misses"]} miss(es); '
+            f'startup took {time.perf_counter() - started:.2f}s'
+        )
         return instance
 
     def create_agent(self) -> Agent:
@@ -175,6 +356,10 @@ class BuyerOrchestratorAgent:
             tools=[
                 self.send_message,
                 self.execute_buyer_workflow,
+                self.execute_buyer_workflow_batch,
+                self.resume_buyer_workflow,
+                self.get_buyer_workflow_status,
+                self.cancel_buyer_workflow,
             ],
         )
 
@@ -208,6 +393,10 @@ class BuyerOrchestratorAgent:
 
         **Usage Instructions:**
         - For complete workflow: Use `execute_buyer_workflow` with the overall request
+        - For several independent workflow requests at once: Use `execute_buyer_workflow_batch` with the list of requests
+        - To finish an earlier workflow that failed or whose purchase order generation was delayed: Use `resume_buyer_workflow` with its workflow_id
+        - When a workflow tool returns a submitted workflow_id: Use `get_buyer_workflow_status` with that workflow_id to report its progress and results
+        - When the user drops or replaces a submitted workflow that is still running: Use `cancel_buyer_workflow` with its workflow_id
         - For individual agent tasks: Use `send_message` with specific agent name and task
         - Always provide comprehensive context when delegating tasks
         """
@@ -226,6 +415,7 @@ class BuyerOrchestratorAgent:
     def before_model_callback(
         self, callback_context: CallbackContext, llm_request
     ):
+        self._ensure_background_tasks()
         state = callback_context.state
         if 'session_active' not in state or not state['session_active']:
             if 'session_id' not in state:
@@ -261,6 +451,113 @@ class BuyerOrchestratorAgent:
         Yields:
             A dictionary of JSON data.
         """
+        return await self._delegate(agent_name, task, tool_context)
+
+    async def _delegate(
+        self,
+        agent_name: str,
+        task: str,
+        tool_context: ToolContext,
+        *,
+        deadline: Deadline | None = None,
+    ):
+        """Send a task to a remote buyer agent, retrying transient failures.
+
+        Failed attempts are retried with jittered exponential backoff as long
+        as the retry policy allows and, when a deadline is given, enough of it
+        is left for another attempt. Each attempt is cut off at the deadline,
+        which is also sent to the agent in the message metadata. For agents
+        whose results are cached, an identical new task recently completed
+        is answered from the result cache without calling the agent.
+
+        New tasks for idempotent agents that are identical to a task already
+        in flight wait for that call's result instead of making their own;
+        the shared call runs under the deadline of the caller that started it.
+
+        Raises:
+            DeadlineExceededError: If the deadline passes before the agent answers.
+        """
+        idempotent = agent_name not in NON_IDEMPOTENT_AGENTS
+        # Follow-ups on a remote task always go to the agent
+        if not idempotent or 'task_id' in tool_context.state:
+            return await self._delegate_with_retries(
+                agent_name, task, tool_context, deadline, idempotent
+            )
+        cached = self.result_cache.get(agent_name, task)
+        if cached is not None:
+            print(f'Using cached result of {agent_name} for an identical task')
+            return cached
+
+        async def call():
+            result = await self._delegate_with_retries(
+                agent_name, task, tool_context, deadline, idempotent
+            )
+            self.result_cache.put(agent_name, task, result)
+            return result
+
+        shared = self.in_flight.do((agent_name, normalize_task_text(task)), call)
+        if deadline is None:
+            return await shared
+        try:
+            return await asyncio.wait_for(shared, deadline.remaining())
+        except DeadlineExceededError:
+            raise
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceededError(
+                f'{agent_name} did not answer within the {deadline.seconds:.1f}s step deadline'
+            ) from e
+
+    async def _delegate_with_retries(
+        self,
+        agent_name: str,
+        task: str,
+        tool_context: ToolContext,
+        deadline: Deadline | None,
+        idempotent: bool,
+    ):
+        """Send a task to a remote agent, retrying failures the retry policy allows."""
+        attempt = 0
+        while True:
+            attempt += 1
+            if deadline and deadline.expired:
+                raise DeadlineExceededError(
+                    f'Deadline exceeded before {agent_name} could be called'
+                )
+            try:
+                call = self._send_message(agent_name, task, tool_context, deadline)
+                if deadline is None:
+                    return await call
+                # Lets the connection tell a call cut off by the deadline
+                # from other cancellations
+                deadline_token = call_deadline.set(deadline.expires_at)
+                try:
+                    return await asyncio.wait_for(call, deadline.remaining())
+                finally:
+                    call_deadline.reset(deadline_token)
+            except asyncio.TimeoutError as e:
+                if deadline and deadline.expired:
+                    raise DeadlineExceededError(
+                        f'{agent_name} did not answer within the {deadline.seconds:.1f}s step deadline'
+                    ) from e
+                error = e
+            except Exception as e:
+                error = e
+            delay = self.retry_policy.backoff(attempt)
+            if not self.retry_policy.should_retry(
+                error, attempt, delay, deadline, idempotent
+            ):
+                raise error
+            print(f'Retrying {agent_name} in {delay:.2f}s after attempt {attempt} failed: {error!r}')
+            await asyncio.sleep(delay)
+
+    async def _send_message(
+        self,
+        agent_name: str,
+        task: str,
+        tool_context: ToolContext,
+        deadline: Deadline | None = None,
+    ):
+        """Send a task to a remote buyer agent once."""
         if agent_name not in self.remote_agent_connections:
             raise ValueError(f'Buyer agent {agent_name} not found')
         
@@ -271,7 +568,8 @@ class BuyerOrchestratorAgent:
         if not client:
             raise ValueError(f'Client not available for {agent_name}')
         
-        task_id = state['task_id'] if 'task_id' in state else str(uuid.uuid4())
+        # Only continue a remote task we already know about; new tasks get their ID from the agent
+        task_id = state['task_id'] if 'task_id' in state else None
 
         if 'context_id' in state:
             context_id = state['context_id']
@@ -286,6 +584,8 @@ class BuyerOrchestratorAgent:
                 message_id = state['input_message_metadata']['message_id']
         if not message_id:
             message_id = str(uuid.uuid4())
+        if deadline:
+            metadata.update(deadline.metadata())
 
         payload = {
             'message': {
@@ -303,9 +603,58 @@ class BuyerOrchestratorAgent:
         if context_id:
             payload['message']['contextId'] = context_id
 
-        message_request = SendMessageRequest(
-            id=message_id, params=MessageSendParams.model_validate(payload)
-        )
+        if metadata:
+            payload['message']['metadata'] = metadata
+
+        params = MessageSendParams.model_validate(payload)
+        if self.push_receiver and client.supports_push_notifications:
+            # Let the agent push task updates to our webhook instead of
+            # holding a connection open until the remote Task finishes.
+            params.configuration = MessageSendConfiguration(
+                blocking=False,
+                push_notification_config=self.push_receiver.push_config(),
+            )
+            send_response, replica_url = await client.send_message_for_push(
+                SendMessageRequest(id=message_id, params=params)
+            )
+            if not isinstance(send_response.root, SendMessageSuccessResponse) or not isinstance(send_response.root.result, Task):
+                print('received non-task response. Aborting get task ')
+                return None
+            remote_task = send_response.root.result
+
+            on_update = None
+            if self.task_callback:
+                # Pushed updates arrive in the webhook's context; forward
+                # them in this request's context
+                request_context = contextvars.copy_context()
+
+                def on_update(update: Task) -> None:
+                    request_context.run(self.task_callback, update, client.card)
+
+            try:
+                return await self.push_receiver.wait_for_task(
+                    remote_task,
+                    poll=lambda: client.get_task(remote_task.id, replica_url),
+                    on_update=on_update,
+                )
+            except asyncio.CancelledError:
+                # Nobody waits for the task any more; free the agent for other work
+                client.abandon_task(remote_task.id, replica_url)
+                raise
+
+        if client.supports_streaming:
+            # Stream progress back through task_callback instead of holding
+            # one request open until the remote Task finishes.
+            result = await client.send_message_streaming(
+                SendStreamingMessageRequest(id=message_id, params=params),
+                task_callback=self.task_callback,
+            )
+            if not isinstance(result, Task):
+                print('received non-task response. Aborting get task ')
+                return None
+            return result
+
+        message_request = SendMessageRequest(id=message_id, params=params)
         send_response: SendMessageResponse = await client.send_message(
             message_request=message_request
         )
@@ -334,80 +683,270 @@ class BuyerOrchestratorAgent:
         2. Purchase Validation Agent - validates purchase requirements  
         3. Purchase Order Agent - generates purchase orders
 
+        In job mode the workflow runs in the background and this returns its
+        workflow_id right away; use get_buyer_workflow_status to follow it.
+
         Args:
             workflow_request: The overall workflow request and context.
             tool_context: The tool context this method runs in.
 
+        Yields:
+            A dictionary of workflow results, or of the submitted job in job mode.
+        """
+        if self.job_mode:
+            workflow_id = str(uuid.uuid4())
+            return await self.jobs.submit(
+                workflow_id,
+                'buyer',
+                lambda: self._run_buyer_workflow(
+                    workflow_request, tool_context, workflow_id=workflow_id
+                ),
+            )
+        return await self._run_buyer_workflow(workflow_request, tool_context)
+
+    async def run_workflow(
+        self, workflow_request: str = BUYER_WORKFLOW_PROMPT, wait: bool = False
+    ) -> dict[str, Any]:
+        """Run the buyer workflow directly, without an orchestrator LLM turn.
+
+        Returns the same workflow results as the execute_buyer_workflow tool,
+        or the submitted job in job mode. With wait, the workflow runs to the
+        end and its results are returned even in job mode, e.g. for a
+        one-shot run that exits afterwards.
+        """
+        if wait:
+            return await self._run_buyer_workflow(
+                workflow_request, DirectToolContext()
+            )
+        return await self.execute_buyer_workflow(
+            workflow_request, DirectToolContext()
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Connection pool saturation, replica routing and hedging of the remote agents,
+        with the state of the caches and workflow jobs."""
+        stats = {
+            'transport': get_shared_transport().metrics(),
+            'agents': {
+                name: {
+                    'replicas': connection.replica_stats(),
+                    'hedging': connection.hedge_stats(),
+                }
+                for name, connection in self.remote_agent_connections.items()
+            },
+            'agent_card_cache': self.card_cache.stats(),
+            'result_cache': self.result_cache.stats(),
+            'single_flight': self.in_flight.stats(),
+            'jobs': self.jobs.stats(),
+        }
+        if self.push_receiver:
+            stats['push_notifications'] = self.push_receiver.stats()
+        return stats
+
+    async def get_buyer_workflow_status(
+        self, workflow_id: str, tool_context: ToolContext
+    ):
+        """Gets the status of a buyer workflow, and its results once it has finished.
+
+        Args:
+            workflow_id: The workflow_id returned when the workflow was started.
+            tool_context: The tool context this method runs in.
+
+        Yields:
+            A dictionary with the workflow state and, when finished, its results.
+        """
+        status = await self.jobs.status(workflow_id)
+        if status is not None:
+            return status
+        # Not a job of this process; fall back to the workflow's checkpoint.
+        checkpoint = await self.workflow_store.load(workflow_id)
+        if checkpoint is None:
+            return {'workflow_id': workflow_id, 'state': 'not_found'}
+        return {
+            'workflow_id': workflow_id,
+            'workflow_type': checkpoint['workflow_type'],
+            'state': checkpoint['status'],
+            'summary': checkpoint['summary'],
+            'finished_steps': sorted(checkpoint['steps']),
+        }
+
+    async def cancel_buyer_workflow(
+        self, workflow_id: str, tool_context: ToolContext
+    ):
+        """Cancels a buyer workflow that is still running in the background.
+
+        Use this when a newer request supersedes the workflow. It stops at
+        once, the remote agent tasks it was waiting on are canceled, and its
+        slot is freed for other workflows.
+
+        Args:
+            workflow_id: The workflow_id returned when the workflow was started.
+            tool_context: The tool context this method runs in.
+
+        Yields:
+            A dictionary with the workflow's state.
+        """
+        if await self.jobs.cancel(workflow_id):
+            return {'workflow_id': workflow_id, 'state': 'canceled'}
+        status = await self.jobs.status(workflow_id)
+        return {
+            'workflow_id': workflow_id,
+            'state': status['state'] if status else 'not_found',
+            'note': 'The workflow is not running in the background, so there is nothing to cancel.',
+        }
+
+    async def resume_buyer_workflow(
+        self, workflow_id: str, tool_context: ToolContext
+    ):
+        """Resumes a buyer workflow from its last checkpoint.
+
+        Steps that finished before are reused. Only the steps that did not
+        finish run again, including a delayed purchase order generation. A
+        workflow that is still running in the background is not resumed.
+
+        Args:
+            workflow_id: The workflow_id of an earlier buyer workflow run.
+            tool_context: The tool context this method runs in.
+
         Yields:
             A dictionary of workflow results.
         """
+        checkpoint = await self.workflow_store.load(workflow_id)
+        if checkpoint is None or checkpoint['workflow_type'] != 'buyer':
+            return {
+                'workflow_id': workflow_id,
+                'status': 'not_found',
+                'error': f'No checkpointed buyer workflow {workflow_id}',
+            }
+        if self.jobs.is_running(workflow_id):
+            return {
+                'workflow_id': workflow_id,
+                'status': 'running',
+                'error': f'Buyer workflow {workflow_id} is still running; wait for it or cancel it before resuming',
+            }
+        if self.job_mode:
+            return await self.jobs.submit(
+                workflow_id,
+                'buyer',
+                lambda: self._run_buyer_workflow(
+                    checkpoint['request'], tool_context, checkpoint=checkpoint
+                ),
+            )
+        return await self._run_buyer_workflow(
+            checkpoint['request'], tool_context, checkpoint=checkpoint
+        )
+
+    async def execute_buyer_workflow_batch(
+        self, workflow_requests: list[str], tool_context: ToolContext
+    ):
+        """Executes several buyer workflows as a pipeline.
+
+        Every request still goes through Inventory Management → Purchase
+        Validation → Purchase Order Generation, but the stages overlap: request
+        k+1 can be in inventory analysis while request k is in validation. Each
+        stage admits a limited number of requests at a time.
+
+        Args:
+            workflow_requests: The workflow requests to execute, in order.
+            tool_context: The tool context this method runs in.
+
+        Yields:
+            A dictionary with one workflow result per request, in request order.
+        """
+        started = time.perf_counter()
+        stage_slots = {
+            stage: asyncio.Semaphore(limit)
+            for stage, limit in self.pipeline_stage_limits.items()
+        }
+        workflows = await asyncio.gather(
+            *(
+                self._run_buyer_workflow(request, tool_context, stage_slots)
+                for request in workflow_requests
+            )
+        )
+        failed = sum(1 for workflow in workflows if workflow['status'] == 'failed')
+        return {
+            'batch_id': str(uuid.uuid4()),
+            'status': 'completed' if not failed else 'partially_failed',
+            'workflows': workflows,
+            'stage_limits': dict(self.pipeline_stage_limits),
+            'elapsed_seconds': round(time.perf_counter() - started, 3),
+        }
+
+    async def _run_buyer_workflow(
+        self,
+        workflow_request: str,
+        tool_context: ToolContext,
+        stage_slots: dict[str, asyncio.Semaphore] | None = None,
+        checkpoint: dict[str, Any] | None = None,
+        workflow_id: str | None = None,
+    ) -> dict[str, Any]:
+        """Run one buyer workflow, holding a stage slot for each step when pipelined.
+
+        Every finished step is checkpointed in the workflow store. When
+        resuming from a checkpoint, its finished steps are reused and only the
+        others run. The workflow must finish within WORKFLOW_DEADLINE_SECONDS,
+        not counting time spent waiting for pipeline stage slots. Each step
+        that runs gets an even share of the time that is left when it starts.
+        """
+        stage_slots = stage_slots or {}
+        checkpointed = checkpoint['steps'] if checkpoint else {}
+        deadline = Deadline.from_env()
         workflow_results = {
-            'workflow_id': str(uuid.uuid4()),
+            'workflow_id': checkpoint['workflow_id'] if checkpoint else workflow_id or str(uuid.uuid4()),
             'status': 'starting',
+            'deadline_seconds': deadline.seconds,
+            'resumed_steps': sorted(checkpointed),
             'steps': []
         }
-        
+        workflow_id = workflow_results['workflow_id']
+        if checkpoint is None:
+            await self.workflow_store.create(workflow_id, 'buyer', workflow_request)
+
+        async def run_step(number: int, stage: str, run) -> dict[str, Any]:
+            if number in checkpointed:
+                print(f"Reusing checkpointed Step {number} of workflow {workflow_id}")
+                step = checkpointed[number]
+            else:
+                steps_left = sum(1 for n in (1, 2, 3) if n >= number and n not in checkpointed)
+                queued_at = time.perf_counter()
+                async with stage_slots.get(stage) or contextlib.nullcontext():
+                    # Waiting for a pipeline stage slot does not use up the deadline
+                    deadline.extend(time.perf_counter() - queued_at)
+                    step = await run(deadline.split(steps_left))
+                await self.workflow_store.save_step(workflow_id, step)
+            workflow_results['steps'].append(step)
+            return step
+
         try:
-            # Step 1: Inventory Management
-            print("Executing Step 1: Inventory Management")
-            inventory_task = f"Analyze current inventory levels and demand patterns. Context: {workflow_request}"
-            inventory_result = await self.send_message(
-                "Inventory Management Agent", 
-                inventory_task, 
-                tool_context
+            inventory_step = await run_step(
+                1,
+                'inventory',
+                lambda step_deadline: self._run_inventory_step(
+                    workflow_request, tool_context, step_deadline
+                ),
             )
-            workflow_results['steps'].append({
-                'step': 1,
-                'agent': 'Inventory Management Agent',
-                'task': inventory_task,
-                'result': inventory_result
-            })
-
-            # Step 2: Purchase Validation
-            print("Executing Step 2: Purchase Validation")
-            validation_task = f"Validate purchase requirements based on inventory analysis: {inventory_result}. Original request: {workflow_request}"
-            validation_result = await self.send_message(
-                "Purchase Validation Agent",
-                validation_task,
-                tool_context
+            validation_step = await run_step(
+                2,
+                'validation',
+                lambda step_deadline: self._run_validation_step(
+                    workflow_request, inventory_step, tool_context, step_deadline
+                ),
             )
-            workflow_results['steps'].append({
-                'step': 2,
-                'agent': 'Purchase Validation Agent',
-                'task': validation_task,
-                'result': validation_result
-            })
-
-            # Step 3: Purchase Order Generation (with error handling for delays)
-            print("Executing Step 3: Purchase Order Generation")
-            try:
-                po_task = f"Generate purchase orders based on validation results: {validation_result}. Inventory context: {inventory_result}"
-                po_result = await self.send_message(
-                    "Purchase Order Agent",
-                    po_task,
-                    tool_context
-                )
-                workflow_results['steps'].append({
-                    'step': 3,
-                    'agent': 'Purchase Order Agent',
-                    'task': po_task,
-                    'result': po_result
-                })
-                workflow_results['status'] = 'completed'
-                workflow_results['summary'] = 'Buyer workflow completed successfully across all three agents'
-            except Exception as po_error:
-                print(f"Step 3 (Purchase Order Generation) experienced delays: {po_error}")
-                workflow_results['steps'].append({
-                    'step': 3,
-                    'agent': 'Purchase Order Agent',
-                    'task': po_task,
-                    'result': None,
-                    'status': 'delayed',
-                    'note': 'Purchase order generation delayed but can be completed separately'
-                })
-                # Mark as completed since Steps 1 and 2 succeeded
-                workflow_results['status'] = 'completed'
+            po_step = await run_step(
+                3,
+                'purchase_order',
+                lambda step_deadline: self._run_purchase_order_step(
+                    inventory_step, validation_step, tool_context, step_deadline
+                ),
+            )
+
+            # Steps 1 and 2 succeeded, so a delayed Step 3 still completes the workflow
+            workflow_results['status'] = 'completed'
+            if po_step.get('status') == 'delayed':
                 workflow_results['summary'] = 'Buyer workflow completed successfully through validation. Purchase order generation delayed but inventory analysis and validation are complete.'
+            else:
+                workflow_results['summary'] = 'Buyer workflow completed successfully across all three agents'
 
         except Exception as e:
             # Only fail if Steps 1 or 2 fail
@@ -415,32 +954,227 @@ class BuyerOrchestratorAgent:
             workflow_results['status'] = 'failed'
             workflow_results['error'] = str(e)
 
+        if self.result_cache.agents:
+            workflow_results['result_cache'] = self.result_cache.stats()
+        workflow_results['single_flight'] = self.in_flight.stats()
+        await self.workflow_store.finish(
+            workflow_id,
+            workflow_results['status'],
+            workflow_results.get('summary') or workflow_results.get('error'),
+        )
         return workflow_results
 
+    async def _run_inventory_step(
+        self,
+        workflow_request: str,
+        tool_context: ToolContext,
+        deadline: Deadline | None = None,
+    ) -> dict[str, Any]:
+        """Step 1: Inventory Management."""
+        if self.inventory_shards:
+            return await self._run_sharded_inventory_step(
+                workflow_request, tool_context, deadline
+            )
+        print("Executing Step 1: Inventory Management")
+        inventory_task = f"Analyze current inventory levels and demand patterns. Context: {workflow_request}"
+        inventory_result = await self._delegate(
+            "Inventory Management Agent", 
+            inventory_task, 
+            tool_context,
+            deadline=deadline
+        )
+        return {
+            'step': 1,
+            'agent': 'Inventory Management Agent',
+            'task': inventory_task,
+            'result': inventory_result,
+            'output': extract_task_output(inventory_result),
+        }
 
-def _get_initialized_buyer_orchestrator_sync() -> Agent:
-    """Synchronously creates and initializes the BuyerOrchestratorAgent."""
+    async def _run_sharded_inventory_step(
+        self,
+        workflow_request: str,
+        tool_context: ToolContext,
+        deadline: Deadline | None = None,
+    ) -> dict[str, Any]:
+        """Step 1 split into concurrent per-shard analyses whose reports are merged.
+
+        Shards that fail are reported in the step. The step only fails when no
+        shard succeeded.
+        """
+        print(f"Executing Step 1: Inventory Management across {len(self.inventory_shards)} shards")
+        slots = asyncio.Semaphore(self.inventory_shard_concurrency)
+
+        async def analyze_shard(shard: str) -> dict[str, Any]:
+            shard_task = f"Analyze current inventory levels and demand patterns for {_describe_inventory_shard(shard)} only, and list the items in that scope that need restocking. Context: {workflow_request}"
+            async with slots:
+                shard_result = await self._delegate(
+                    "Inventory Management Agent",
+                    shard_task,
+                    tool_context,
+                    deadline=deadline
+                )
+            return {
+                'shard': shard,
+                'task': shard_task,
+                'result': shard_result,
+                'output': extract_task_output(shard_result),
+            }
+
+        outcomes = await asyncio.gather(
+            *(analyze_shard(shard) for shard in self.inventory_shards),
+            return_exceptions=True,
+        )
+        shards = []
+        for shard, outcome in zip(self.inventory_shards, outcomes):
+            # A cancelled shard comes back as a CancelledError, a BaseException
+            if isinstance(outcome, BaseException):
+                print(f"Inventory shard {shard} failed: {outcome!r}")
+                shards.append({'shard': shard, 'status': 'failed', 'error': str(outcome) or type(outcome).__name__})
+            else:
+                shards.append(outcome)
+        succeeded = [shard for shard in shards if 'output' in shard]
+        if not succeeded:
+            raise RuntimeError('Inventory analysis failed for every shard')
+
+        return {
+            'step': 1,
+            'agent': 'Inventory Management Agent',
+            'task': f"Analyze current inventory levels and demand patterns in {len(self.inventory_shards)} shards. Context: {workflow_request}",
+            'result': [shard['result'] for shard in succeeded],
+            'output': merge_handoffs(
+                [(shard['shard'], shard['output']) for shard in succeeded]
+            ),
+            'shards': shards,
+        }
+
+    async def _run_validation_step(
+        self,
+        workflow_request: str,
+        inventory_step: dict[str, Any],
+        tool_context: ToolContext,
+        deadline: Deadline | None = None,
+    ) -> dict[str, Any]:
+        """Step 2: Purchase Validation."""
+        print("Executing Step 2: Purchase Validation")
+        inventory_context = format_handoff('Inventory analysis', inventory_step['output'])
+        validation_task = f"Validate purchase requirements based on the inventory analysis below. Original request: {workflow_request}\n{inventory_context}"
+        validation_tokens = handoff_token_counts(str(inventory_step['result']), inventory_context)
+        print(f"Step 2 context tokens: {validation_tokens['before']} -> {validation_tokens['after']}")
+        validation_result = await self._delegate(
+            "Purchase Validation Agent",
+            validation_task,
+            tool_context,
+            deadline=deadline
+        )
+        return {
+            'step': 2,
+            'agent': 'Purchase Validation Agent',
+            'task': validation_task,
+            'result': validation_result,
+            'output': extract_task_output(validation_result),
+            'context_tokens': validation_tokens,
+        }
 
-    async def _async_main() -> Agent:
-        buyer_orchestrator_instance = await BuyerOrchestratorAgent.create(
-            remote_agent_addresses=[
-                os.getenv('INVENTORY_AGENT_URL', 'http://localhost:8088'),
-                os.getenv('PURCHASE_VALIDATION_AGENT_URL', 'http://localhost:8089'),
-                os.getenv('PURCHASE_ORDER_AGENT_URL', 'http://localhost:8090'),
-            ]
+    async def _run_purchase_order_step(
+        self,
+        inventory_step: dict[str, Any],
+        validation_step: dict[str, Any],
+        tool_context: ToolContext,
+        deadline: Deadline | None = None,
+    ) -> dict[str, Any]:
+        """Step 3: Purchase Order Generation, marked delayed instead of failing."""
+        print("Executing Step 3: Purchase Order Generation")
+        po_context = (
+            f"{format_handoff('Validation results', validation_step['output'])}\n"
+            f"{format_handoff('Inventory analysis', inventory_step['output'])}"
         )
-        return buyer_orchestrator_instance.create_agent()
+        po_tokens = handoff_token_counts(f"{validation_step['result']}{inventory_step['result']}", po_context)
+        print(f"Step 3 context tokens: {po_tokens['before']} -> {po_tokens['after']}")
+        po_task = f"Generate purchase orders based on the validation results and inventory context below.\n{po_context}"
+        try:
+            po_result = await self._delegate(
+                "Purchase Order Agent",
+                po_task,
+                tool_context,
+                deadline=deadline
+            )
+        except Exception as po_error:
+            print(f"Step 3 (Purchase Order Generation) experienced delays: {po_error}")
+            return {
+                'step': 3,
+                'agent': 'Purchase Order Agent',
+                'task': po_task,
+                'result': None,
+                'context_tokens': po_tokens,
+                'status': 'delayed',
+                'note': 'Purchase order generation delayed but can be completed separately'
+            }
+        return {
+            'step': 3,
+            'agent': 'Purchase Order Agent',
+            'task': po_task,
+            'result': po_result,
+            'output': extract_task_output(po_result),
+            'context_tokens': po_tokens,
+        }
+
+def _agent_urls(env_var: str, default: str) -> list[str]:
+    """Read a comma-separated list of replica URLs for one remote agent."""
+    return [url.strip() for url in os.getenv(env_var, default).split(',') if url.strip()]
+
 
+_buyer_orchestrator: BuyerOrchestratorAgent | None = None
+_root_agent: Agent | None = None
+_init_lock = asyncio.Lock()
+
+
+async def get_buyer_orchestrator() -> BuyerOrchestratorAgent:
+    """Return the process-wide BuyerOrchestratorAgent, creating it on first use."""
+    global _buyer_orchestrator
+    async with _init_lock:
+        if _buyer_orchestrator is None:
+            _buyer_orchestrator = await BuyerOrchestratorAgent.create(
+                remote_agent_addresses=[
+                    *_agent_urls('INVENTORY_AGENT_URL', 'http://localhost:8088'),
+                    *_agent_urls('PURCHASE_VALIDATION_AGENT_URL', 'http://localhost:8089'),
+                    *_agent_urls('PURCHASE_ORDER_AGENT_URL', 'http://localhost:8090'),
+                ],
+                # Remote task updates reach the executor streaming the request
+                task_callback=forward_remote_update,
+            )
+    return _buyer_orchestrator
+
+
+async def create_root_agent() -> Agent:
+    """Create the root agent inside the caller's event loop.
+
+    Servers should await this instead of importing ``root_agent``, which would
+    have to spin up its own event loop.
+    """
+    global _root_agent
+    if _root_agent is None:
+        _root_agent = (await get_buyer_orchestrator()).create_agent()
+    return _root_agent
+
+
+def _get_initialized_buyer_orchestrator_sync() -> Agent:
+    """Synchronously creates and initializes the BuyerOrchestratorAgent."""
     try:
-        return asyncio.run(_async_main())
+        return asyncio.run(create_root_agent())
     except RuntimeError as e:
         if 'asyncio.run() cannot be called from a running event loop' in str(e):
             print(
                 f'Warning: Could not initialize BuyerOrchestratorAgent with asyncio.run(): {e}. '
                 'This can happen if an event loop is already running (e.g., in Jupyter). '
-                'Consider initializing BuyerOrchestratorAgent within an async function in your application.'
+                'Use `await create_root_agent()` within an async function in your application instead.'
             )
         raise
 
 
-root_agent = _get_initialized_buyer_orchestrator_sync()
+def __getattr__(name: str):
+    # root_agent is built on first access so importing this module stays free
+    # of network I/O.
+    if name == 'root_agent':
+        return _root_agent or _get_initialized_buyer_orchestrator_sync()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
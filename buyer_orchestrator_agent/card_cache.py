@@ -0,0 +1,107 @@
+"""
+On-disk agent card cache used for fast buyer orchestrator cold starts.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+
+from a2a.types import AgentCard
+
+
+logger = logging.getLogger(__name__)
+
+
+class AgentCardCache:
+    """A JSON file of agent cards keyed by agent URL.
+
+    Entries younger than ``ttl`` seconds are fresh and can be used right away
+    while they are revalidated in the background. Older entries are only a
+    fallback for agents that cannot be reached at startup. The file is
+    written from a worker thread, so discovery never waits on disk.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600.0):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, dict] = self._load()
+        # Snapshots are numbered so a slow write never replaces a newer one
+        self._version = 0
+        self._saved_version = 0
+        self._save_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, name: str) -> 'AgentCardCache':
+        """Build a cache configured from ``AGENT_CARD_CACHE_*`` environment variables."""
+        default_path = os.path.join(
+            os.path.expanduser('~'),
+            '.cache',
+            'a2a_adk_agents',
+            f'{name}_agent_cards.json',
+        )
+        return cls(
+            path=os.getenv('AGENT_CARD_CACHE_PATH', default_path),
+            ttl=float(os.getenv('AGENT_CARD_CACHE_TTL', '3600')),
+        )
+
+    def get(self, url: str) -> tuple[AgentCard, bool] | None:
+        """Return the cached card for url and whether it is still fresh."""
+        entry = self._entries.get(url)
+        if entry is None:
+            self.misses += 1
+            return None
+        try:
+            card = AgentCard.model_validate(entry['card'])
+        except Exception as e:
+            logger.warning(f'Discarding unreadable cached card for {url}: {e}')
+            self._entries.pop(url, None)
+            self.misses += 1
+            return None
+        fresh = time.time() - entry['fetched_at'] < self.ttl
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return card, fresh
+
+    async def put(self, url: str, card: AgentCard) -> None:
+        """Store a freshly fetched card and persist the cache file."""
+        self._entries[url] = {
+            'card': card.model_dump(mode='json', exclude_none=True),
+            'fetched_at': time.time(),
+        }
+        self._version += 1
+        await asyncio.to_thread(self._save, dict(self._entries), self._version)
+
+    def stats(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f'Ignoring unreadable agent card cache {self.path}: {e}')
+            return {}
+
+    def _save(self, entries: dict[str, dict], version: int) -> None:
+        with self._save_lock:
+            if version <= self._saved_version:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = f'{self.path}.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f'Could not write agent card cache {self.path}: {e}')
+                return
+            self._saved_version = version
@@ -0,0 +1,132 @@
+"""
+Circuit breaker used by the buyer orchestrator to fail fast on degraded agents.
+"""
+
+import logging
+import os
+import time
+
+from collections import deque
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a remote agent whose circuits are all open."""
+
+
+class CircuitBreaker:
+    """Tracks recent call outcomes for one remote agent replica.
+
+    The circuit opens when, over the last ``window_size`` calls, the share of
+    failed calls or of calls slower than ``slow_call_seconds`` reaches its
+    threshold. While open, calls are refused until ``open_seconds`` have passed.
+    Then a single probe call is let through (half-open). The circuit closes if
+    the probe succeeds and opens again if it fails.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        name: str = '',
+        *,
+        failure_rate_threshold: float = 0.5,
+        slow_call_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 60.0,
+        window_size: int = 20,
+        minimum_calls: int = 5,
+        open_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self.times_opened = 0
+        self.rejected_calls = 0
+        self._outcomes: deque[tuple[bool, bool]] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @classmethod
+    def from_env(cls, name: str = '') -> 'CircuitBreaker':
+        """Build a breaker configured from ``A2A_BREAKER_*`` environment variables."""
+        return cls(
+            name,
+            failure_rate_threshold=float(
+                os.getenv('A2A_BREAKER_FAILURE_RATE', '0.5')
+            ),
+            slow_call_rate_threshold=float(
+                os.getenv('A2A_BREAKER_SLOW_CALL_RATE', '0.5')
+            ),
+            slow_call_seconds=float(os.getenv('A2A_BREAKER_SLOW_CALL_SECONDS', '60')),
+            window_size=int(os.getenv('A2A_BREAKER_WINDOW_SIZE', '20')),
+            minimum_calls=int(os.getenv('A2A_BREAKER_MINIMUM_CALLS', '5')),
+            open_seconds=float(os.getenv('A2A_BREAKER_OPEN_SECONDS', '30')),
+        )
+
+    def is_available(self) -> bool:
+        """Whether a call could be let through right now, without claiming it."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            return time.monotonic() - self._opened_at >= self.open_seconds
+        return not self._probe_in_flight
+
+    def acquire(self) -> bool:
+        """Claim permission for one call, moving an expired open circuit to half-open."""
+        if not self.is_available():
+            self.rejected_calls += 1
+            return False
+        if self.state == self.OPEN:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = True
+        return True
+
+    def release(self) -> None:
+        """Give back a claimed call that ended without a usable outcome (e.g. cancelled)."""
+        self._probe_in_flight = False
+
+    def record(self, duration: float, failed: bool) -> None:
+        """Record the outcome of a call that acquire() let through."""
+        slow = duration >= self.slow_call_seconds
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+            if failed or slow:
+                self._open('half-open probe failed')
+            else:
+                self.state = self.CLOSED
+                self._outcomes.clear()
+            return
+
+        self._outcomes.append((failed, slow))
+        if len(self._outcomes) < self.minimum_calls:
+            return
+        calls = len(self._outcomes)
+        failure_rate = sum(f for f, _ in self._outcomes) / calls
+        slow_rate = sum(s for _, s in self._outcomes) / calls
+        if failure_rate >= self.failure_rate_threshold:
+            self._open(f'failure rate {failure_rate:.0%} over {calls} calls')
+        elif slow_rate >= self.slow_call_rate_threshold:
+            self._open(f'slow call rate {slow_rate:.0%} over {calls} calls')
+
+    def _open(self, reason: str) -> None:
+        logger.warning(f'Opening circuit for {self.name}: {reason}')
+        self.state = self.OPEN
+        self.times_opened += 1
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+    def stats(self) -> dict[str, object]:
+        return {
+            'state': self.state,
+            'times_opened': self.times_opened,
+            'rejected_calls': self.rejected_calls,
+        }
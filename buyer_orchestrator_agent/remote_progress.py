@@ -0,0 +1,42 @@
+"""
+Forwarding of remote agent task updates to the A2A executor running the buyer request, so it can stream them.
+"""
+
+import logging
+
+from collections.abc import Callable
+from contextvars import ContextVar
+
+from a2a.types import AgentCard, Task, TaskArtifactUpdateEvent, TaskStatusUpdateEvent
+
+
+logger = logging.getLogger(__name__)
+
+# Called with each Task, status or artifact update of a remote agent task and
+# the card of the agent running it.
+RemoteUpdateListener = Callable[
+    [Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent, AgentCard], None
+]
+
+# Set by the executor for the request it is running. Delegations run in that
+# request's context, including inside ADK tool calls, so they see it.
+remote_update_listener: ContextVar[RemoteUpdateListener | None] = ContextVar(
+    'remote_update_listener', default=None
+)
+
+
+def forward_remote_update(
+    event: Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent, card: AgentCard
+) -> None:
+    """Pass a remote task update to the current request's listener, if any.
+
+    This is the orchestrator's task_callback. A failing listener is logged and
+    never fails the delegation.
+    """
+    listener = remote_update_listener.get()
+    if listener is None:
+        return
+    try:
+        listener(event, card)
+    except Exception as e:
+        logger.warning(f'Could not forward update of {card.name}: {e}')
@@ -0,0 +1,128 @@
+"""
+Workflow deadlines and retry backoff used by the buyer orchestrator.
+"""
+
+import os
+import random
+import time
+
+import httpx
+
+from a2a.client import A2AClientHTTPError
+from circuit_breaker import CircuitOpenError
+from remote_agent_connection import AgentOverloadedError, is_transport_failure
+
+
+# Message metadata key carrying the absolute deadline (Unix time in seconds)
+# a remote agent should finish by.
+DEADLINE_METADATA_KEY = 'deadline'
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a workflow's time budget runs out before a step completes."""
+
+
+class Deadline:
+    """An absolute point in time a workflow, or one of its steps, must finish by."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.time() + seconds
+
+    @classmethod
+    def from_env(cls) -> 'Deadline':
+        """A workflow deadline of ``WORKFLOW_DEADLINE_SECONDS`` from now."""
+        return cls(float(os.getenv('WORKFLOW_DEADLINE_SECONDS', '600')))
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.time(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def extend(self, seconds: float) -> None:
+        """Move the deadline back, e.g. by time spent queued instead of working."""
+        self.expires_at += seconds
+
+    def split(self, steps_left: int) -> 'Deadline':
+        """The deadline for the next of steps_left steps sharing what is left.
+
+        Time a step does not use is left over for the steps after it.
+        """
+        return Deadline(self.remaining() / max(steps_left, 1))
+
+    def metadata(self) -> dict[str, float]:
+        return {DEADLINE_METADATA_KEY: self.expires_at}
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for retrying remote agent calls."""
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        min_attempt_seconds: float = 1.0,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.min_attempt_seconds = min_attempt_seconds
+
+    @classmethod
+    def from_env(cls) -> 'RetryPolicy':
+        """Build a policy configured from ``A2A_RETRY_*`` environment variables."""
+        return cls(
+            max_attempts=int(os.getenv('A2A_RETRY_MAX_ATTEMPTS', '3')),
+            base_delay=float(os.getenv('A2A_RETRY_BASE_DELAY', '0.5')),
+            max_delay=float(os.getenv('A2A_RETRY_MAX_DELAY', '8')),
+            min_attempt_seconds=float(
+                os.getenv('A2A_RETRY_MIN_ATTEMPT_SECONDS', '1')
+            ),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait after the given failed attempt (1 for the first)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def should_retry(
+        self,
+        error: BaseException,
+        attempt: int,
+        delay: float,
+        deadline: Deadline | None,
+        idempotent: bool = True,
+    ) -> bool:
+        """Whether a call that failed with error on attempt should be tried again after delay.
+
+        Nothing is retried once max_attempts is reached or when the deadline
+        would leave less than min_attempt_seconds for the next attempt.
+        """
+        if attempt >= self.max_attempts or not is_retryable(error, idempotent):
+            return False
+        if deadline is None:
+            return True
+        return deadline.remaining() - delay >= self.min_attempt_seconds
+
+
+def is_retryable(error: BaseException, idempotent: bool = True) -> bool:
+    """Return True for transient failures worth another attempt.
+
+    Calls to agents that are not idempotent are only retried when the request
+    never reached the agent, or the agent turned it away at capacity, so it
+    cannot have been carried out already.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, AgentOverloadedError):
+        return True
+    if idempotent:
+        return is_transport_failure(error)
+    if isinstance(error, A2AClientHTTPError) and error.status_code == 429:
+        return True
+    cause = error.__cause__ if isinstance(error, A2AClientHTTPError) else error
+    return isinstance(cause, (httpx.ConnectError, httpx.ConnectTimeout))
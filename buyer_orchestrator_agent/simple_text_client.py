@@ -5,7 +5,7 @@ This demonstrates how to use the send_text_to_agent function for direct text int
 import asyncio
 from dotenv import load_dotenv
 
-from agent import root_agent
+from agent import create_root_agent
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory import InMemoryMemoryService
 from google.adk.runners import Runner
@@ -23,7 +23,7 @@ async def main():
     
     runner = Runner(
         app_name=APP_NAME,
-        agent=root_agent,
+        agent=await create_root_agent(),
         session_service=session_service,
         memory_service=InMemoryMemoryService(),
         artifact_service=InMemoryArtifactService(),
@@ -36,8 +36,9 @@ async def main():
 
     while True:
         try:
-            # Get user input
-            user_input = input("You: ").strip()
+            # Wait for input in a thread, so the orchestrator's background
+            # tasks keep running on this loop meanwhile
+            user_input = (await asyncio.to_thread(input, "You: ")).strip()
             
             if user_input.lower() in ['quit', 'exit', 'q']:
                 print("Goodbye!")
@@ -53,7 +54,7 @@ async def main():
             print(response)
             print()
             
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             print("\nGoodbye!")
             break
         except Exception as e:
@@ -0,0 +1,64 @@
+"""
+Coalescing of concurrent identical calls from the buyer orchestrator to remote agents.
+"""
+
+import asyncio
+
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Lets concurrent callers with the same key share one in-flight call.
+
+    The first caller for a key starts the call; callers arriving while it
+    runs await its result, or its exception, instead of starting their own.
+    A caller that is cancelled stops waiting without cancelling the call for
+    the others. The call itself is only cancelled once no caller is left
+    waiting for it.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.calls = 0
+        self.coalesced = 0
+        self._flights: dict[Hashable, _Flight] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run call, or wait for the call already running under key."""
+        if not self.enabled:
+            self.calls += 1
+            return await call()
+        flight = self._flights.get(key)
+        if flight is None:
+            self.calls += 1
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            self.coalesced += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._flights),
+        }
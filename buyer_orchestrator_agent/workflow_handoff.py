@@ -0,0 +1,144 @@
+"""
+Structured, size-bounded handoff of results between buyer workflow steps.
+"""
+
+import json
+import os
+
+from typing import Any
+
+from a2a.types import DataPart, Message, Task, TextPart
+
+
+def _handoff_max_chars() -> int:
+    """The ``HANDOFF_MAX_CHARS`` cap, read when a handoff is built so .env values apply."""
+    return int(os.getenv('HANDOFF_MAX_CHARS', '4000'))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for text, assuming about four characters per token."""
+    return (len(text) + 3) // 4
+
+
+def _cap(text: str, max_chars: int) -> tuple[str, bool]:
+    if len(text) <= max_chars:
+        return text, False
+    return text[:max_chars] + ' ...[truncated]', True
+
+
+def extract_task_output(
+    result: Task | Message | None, max_chars: int | None = None
+) -> dict[str, Any]:
+    """Reduce a remote agent result to the output the next step needs.
+
+    Only the Task's artifacts are kept, or the final status message when it has
+    none. History and metadata are dropped. Text and serialized data are each
+    capped to max_chars, by default HANDOFF_MAX_CHARS.
+    """
+    if max_chars is None:
+        max_chars = _handoff_max_chars()
+    handoff: dict[str, Any] = {'text': '', 'data': [], 'truncated': False}
+    if result is None:
+        return handoff
+
+    parts = []
+    if isinstance(result, Task):
+        handoff['task_id'] = result.id
+        handoff['state'] = result.status.state.value
+        for artifact in result.artifacts or []:
+            parts.extend(artifact.parts)
+        if not parts and result.status.message:
+            parts = result.status.message.parts
+    else:
+        parts = result.parts
+
+    texts = []
+    for part in parts:
+        root = part.root
+        if isinstance(root, TextPart):
+            texts.append(root.text)
+        elif isinstance(root, DataPart):
+            handoff['data'].append(root.data)
+
+    handoff['text'], text_truncated = _cap('\n'.join(texts), max_chars)
+    if handoff['data']:
+        serialized = json.dumps(handoff['data'], default=str)
+        if len(serialized) > max_chars:
+            handoff['data'] = [_cap(serialized, max_chars)[0]]
+            text_truncated = True
+    handoff['truncated'] = text_truncated
+    return handoff
+
+
+def format_handoff(label: str, handoff: dict[str, Any]) -> str:
+    """Render a handoff as a compact JSON block for the next step's prompt."""
+    payload = {
+        key: value
+        for key, value in handoff.items()
+        if key in ('state', 'text', 'data', 'truncated') and value
+    }
+    return f'{label}:\n{json.dumps(payload, default=str)}'
+
+
+def handoff_token_counts(
+    raw_context: str, handoff_context: str
+) -> dict[str, int]:
+    """Estimated prompt tokens for a step's context before and after the handoff layer."""
+    return {
+        'before': estimate_tokens(raw_context),
+        'after': estimate_tokens(handoff_context),
+    }
+
+
+def _item_key(item: Any) -> str:
+    if isinstance(item, dict):
+        for key in ('sku', 'SKU', 'product_id', 'item_id', 'id'):
+            if item.get(key) is not None:
+                return str(item[key])
+    return json.dumps(item, sort_keys=True, default=str)
+
+
+def merge_handoffs(
+    labelled_handoffs: list[tuple[str, dict[str, Any]]],
+    max_chars: int | None = None,
+) -> dict[str, Any]:
+    """Merge the handoffs of several shards of one step into a single handoff.
+
+    Item lists found in the shards' structured data are merged into one list,
+    de-duplicated by SKU or ID. Shard text is kept under a header per shard and
+    capped to max_chars as a whole, by default HANDOFF_MAX_CHARS.
+    """
+    if max_chars is None:
+        max_chars = _handoff_max_chars()
+    items: dict[str, Any] = {}
+    other_data = []
+    sections = []
+    truncated = False
+    for label, handoff in labelled_handoffs:
+        truncated = truncated or handoff.get('truncated', False)
+        if handoff.get('text'):
+            sections.append(f'[{label}]\n{handoff["text"]}')
+        for data in handoff.get('data', []):
+            found = None
+            if isinstance(data, list):
+                found = data
+            elif isinstance(data, dict):
+                found = next(
+                    (value for value in data.values() if isinstance(value, list)),
+                    None,
+                )
+            if found is None:
+                other_data.append(data)
+                continue
+            for item in found:
+                items.setdefault(_item_key(item), item)
+
+    data = other_data
+    if items:
+        data = [{'items': list(items.values())}] + other_data
+    text, text_truncated = _cap('\n\n'.join(sections), max_chars)
+    return {
+        'text': text,
+        'data': data,
+        'truncated': truncated or text_truncated,
+    }
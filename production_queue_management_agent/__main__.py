@@ -2,11 +2,13 @@ import logging
 import os
 
 import click
+import httpx
 from dotenv import load_dotenv
 import uvicorn
 
 from agent import root_agent
 from agent_executor import ADKAgentExecutor
+from task_store import PushNotifyingTaskStore
 
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory import InMemoryMemoryService
@@ -15,12 +17,18 @@ from google.adk.sessions import InMemorySessionService
 
 from a2a.server.apps import A2AFastAPIApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
+from a2a.server.tasks import (
+    BasePushNotificationSender,
+    InMemoryPushNotificationConfigStore,
+)
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
     AgentSkill,
 )
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
 
 
 logger = logging.getLogger(__name__)
@@ -28,6 +36,15 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
+def stats_routes(executor: ADKAgentExecutor) -> list[Route]:
+    """Routes that report the agent's load: runs in progress, queue depth and wait times."""
+
+    async def stats(request: Request) -> JSONResponse:
+        return JSONResponse(executor.stats())
+
+    return [Route('/stats', stats, methods=['GET'])]
+
+
 @click.command()
 @click.option("--host", default="localhost", help="Host to bind the server to")
 @click.option("--port", default=8092, help="Port to bind the server to")
@@ -52,7 +69,7 @@ def main(host: str, port: int):
         version='1.0.0',
         defaultInputModes=['text'],
         defaultOutputModes=['text'],
-        capabilities=AgentCapabilities(streaming=True),
+        capabilities=AgentCapabilities(streaming=True, pushNotifications=True),
         skills=[skill],
     )
 
@@ -68,15 +85,24 @@ def main(host: str, port: int):
     # Create executor
     executor = ADKAgentExecutor(runner=runner, card=agent_card)
 
+    # POST task updates to the webhooks callers register with their requests
+    push_config_store = InMemoryPushNotificationConfigStore()
+    push_sender = BasePushNotificationSender(
+        httpx.AsyncClient(), config_store=push_config_store
+    )
+
     # Create app
     app = A2AFastAPIApplication(
         agent_card=agent_card,
         http_handler=DefaultRequestHandler(
             agent_executor=executor,
-            task_store=InMemoryTaskStore(),
+            task_store=PushNotifyingTaskStore(push_sender, push_config_store),
+            push_config_store=push_config_store,
         )
-    )
-    uvicorn.run(app.build(), host=host, port=port)
+    ).build()
+    # GET /stats reports load for monitoring and load balancing
+    app.router.routes.extend(stats_routes(executor))
+    uvicorn.run(app, host=host, port=port)
 
 
 if __name__ == "__main__":
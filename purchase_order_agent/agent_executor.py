@@ -1,6 +1,12 @@
+import asyncio
 import logging
+import os
+import statistics
+import time
 
-from typing import TYPE_CHECKING
+from collections import deque
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any
 
 from a2a.server.agent_execution import AgentExecutor
 from a2a.server.agent_execution.context import RequestContext
@@ -11,10 +17,11 @@ from a2a.types import (
     FilePart,
     FileWithBytes,
     FileWithUri,
+    InternalError,
     Part,
+    TaskNotCancelableError,
     TaskState,
     TextPart,
-    UnsupportedOperationError,
 )
 from a2a.utils.errors import ServerError
 from google.adk import Runner
@@ -30,6 +37,18 @@ logger.setLevel(logging.DEBUG)
 
 # Constants
 DEFAULT_USER_ID = 'self'
+# Message metadata key carrying the absolute deadline (Unix time in seconds)
+# set by the calling orchestrator.
+DEADLINE_METADATA_KEY = 'deadline'
+# Longest wait for a canceled run to stop before reporting it canceled
+CANCEL_WAIT_SECONDS = 10.0
+# States a task can no longer be canceled in
+FINISHED_TASK_STATES = (
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+)
 
 
 class ADKAgentExecutor(AgentExecutor):
@@ -40,6 +59,18 @@ class ADKAgentExecutor(AgentExecutor):
         self._card = card
         # Track active sessions for potential cancellation
         self._active_sessions: set[str] = set()
+        # asyncio task running each task ID, so it can be canceled
+        self._running: dict[str, asyncio.Task] = {}
+        self.tasks_canceled = 0
+        self.admission = AdmissionControl.from_env()
+        self.status_coalesce_seconds = float(
+            os.getenv('STATUS_UPDATE_COALESCE_SECONDS', '0.25')
+        )
+        self.status_coalesce_max_chars = int(
+            os.getenv('STATUS_UPDATE_COALESCE_MAX_CHARS', '4000')
+        )
+        self.status_events_received = 0
+        self.status_updates_emitted = 0
 
     async def _process_request(
         self,
@@ -54,30 +85,39 @@ class ADKAgentExecutor(AgentExecutor):
 
         # Track this session as active
         self._active_sessions.add(session_id)
+        status_updates = StatusUpdateCoalescer(
+            task_updater,
+            self.status_coalesce_seconds,
+            self.status_coalesce_max_chars,
+        )
 
         try:
-            async for event in self.runner.run_async(
-                session_id=session_id,
-                user_id=DEFAULT_USER_ID,
-                new_message=new_message,
-            ):
-                if event.is_final_response():
-                    parts = [
-                        convert_genai_part_to_a2a(part)
-                        for part in event.content.parts
-                        if (part.text or part.file_data or part.inline_data)
-                    ]
-                    logger.debug('Yielding final response: %s', parts)
-                    await task_updater.add_artifact(parts)
-                    await task_updater.update_status(
-                        TaskState.completed, final=True
-                    )
-                    break
-                if not event.get_function_calls():
-                    logger.debug('Yielding update response')
-                    await task_updater.update_status(
-                        TaskState.working,
-                        message=task_updater.new_agent_message(
+            # Closing the run when the loop ends, or when the task is
+            # canceled, stops the agent and abandons its pending tool calls
+            async with aclosing(
+                self.runner.run_async(
+                    session_id=session_id,
+                    user_id=DEFAULT_USER_ID,
+                    new_message=new_message,
+                )
+            ) as events:
+                async for event in events:
+                    if event.is_final_response():
+                        parts = [
+                            convert_genai_part_to_a2a(part)
+                            for part in event.content.parts
+                            if (part.text or part.file_data or part.inline_data)
+                        ]
+                        logger.debug('Yielding final response: %s', parts)
+                        await status_updates.flush()
+                        await task_updater.add_artifact(parts)
+                        await task_updater.update_status(
+                            TaskState.completed, final=True
+                        )
+                        break
+                    if not event.get_function_calls():
+                        logger.debug('Yielding update response')
+                        await status_updates.add(
                             [
                                 convert_genai_part_to_a2a(part)
                                 for part in event.content.parts
@@ -87,11 +127,13 @@ class ADKAgentExecutor(AgentExecutor):
                                     or part.inline_data
                                 )
                             ],
-                        ),
-                    )
-                else:
-                    logger.debug('Skipping event')
+                        )
+                    else:
+                        logger.debug('Skipping event')
         finally:
+            status_updates.close()
+            self.status_events_received += status_updates.received
+            self.status_updates_emitted += status_updates.emitted
             # Remove from active sessions when done
             self._active_sessions.discard(session_id)
 
@@ -102,9 +144,41 @@ class ADKAgentExecutor(AgentExecutor):
     ):
         # Run the agent until either complete or the task is suspended.
         updater = TaskUpdater(event_queue, context.task_id, context.context_id)
-        # Immediately notify that the task is submitted.
-        if not context.current_task:
-            await updater.update_status(TaskState.submitted)
+        # Turn the request away before any event is sent when the agent is
+        # at capacity, so the caller gets a retryable error instead of a task
+        admission = self.admission.reserve()
+        try:
+            # Immediately notify that the task is submitted.
+            if not context.current_task:
+                await updater.update_status(TaskState.submitted)
+            timeout = _deadline_timeout(context)
+            if timeout is not None and timeout <= 0:
+                await _fail_deadline_exceeded(updater)
+                return
+            self._running[context.task_id] = asyncio.current_task()
+            try:
+                await asyncio.wait_for(
+                    self._run_admitted(admission, context, updater), timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f'Task {context.task_id} stopped at its caller\'s deadline'
+                )
+                await _fail_deadline_exceeded(updater)
+            finally:
+                self._running.pop(context.task_id, None)
+        finally:
+            admission.release()
+        logger.debug('[purchase_order] execute exiting')
+
+    async def _run_admitted(
+        self,
+        admission: '_Admission',
+        context: RequestContext,
+        updater: TaskUpdater,
+    ) -> None:
+        """Wait in the queue for a run slot, then run the agent on the request."""
+        await admission.wait()
         await updater.update_status(TaskState.working)
         await self._process_request(
             types.UserContent(
@@ -116,27 +190,43 @@ class ADKAgentExecutor(AgentExecutor):
             context.context_id,
             updater,
         )
-        logger.debug('[purchase_order] execute exiting')
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue):
         """Cancel the execution for the given context.
 
-        Currently logs the cancellation attempt as the underlying ADK runner
-        doesn't support direct cancellation of ongoing tasks.
+        A run in progress is stopped: its task is canceled, which closes the
+        ADK run and abandons the tool calls it is waiting on. The task is
+        then reported as canceled.
+
+        Raises:
+            ServerError: If the task has already finished.
         """
-        session_id = context.context_id
-        if session_id in self._active_sessions:
+        task = context.current_task
+        if task is not None and task.status.state in FINISHED_TASK_STATES:
+            raise ServerError(error=TaskNotCancelableError())
+        running = self._running.get(context.task_id)
+        if running is not None:
             logger.info(
-                f'Cancellation requested for active purchase order session: {session_id}'
+                f'Cancelling active purchase order task: {context.task_id}'
             )
-            # TODO: Implement proper cancellation when ADK supports it
-            self._active_sessions.discard(session_id)
+            running.cancel()
+            await asyncio.wait({running}, timeout=CANCEL_WAIT_SECONDS)
         else:
             logger.debug(
-                f'Cancellation requested for inactive purchase order session: {session_id}'
+                f'Cancelling inactive purchase order task: {context.task_id}'
             )
+        self.tasks_canceled += 1
+        await TaskUpdater(event_queue, context.task_id, context.context_id).cancel()
 
-        raise ServerError(error=UnsupportedOperationError())
+    def stats(self) -> dict[str, Any]:
+        """Load and queueing of agent runs, working-status events received
+        from the agent versus updates sent for them, and tasks canceled."""
+        return {
+            **self.admission.stats(),
+            'status_events_received': self.status_events_received,
+            'status_updates_emitted': self.status_updates_emitted,
+            'tasks_canceled': self.tasks_canceled,
+        }
 
     async def _upsert_session(self, session_id: str) -> 'Session':
         """Retrieves a session if it exists, otherwise creates a new one.
@@ -157,6 +247,194 @@ class ADKAgentExecutor(AgentExecutor):
         return session
 
 
+class AdmissionControl:
+    """Limits the agent runs in progress and the requests waiting for one.
+
+    Up to ``max_concurrency`` requests run at once and up to ``max_queue``
+    more wait for a slot in arrival order. Requests beyond that are rejected
+    at once with a retryable error, so callers back off instead of piling
+    up LLM runs and MCP calls the agent cannot serve.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_queue: int = 16):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_queue = max(max_queue, 0)
+        self.running = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._slots: asyncio.Semaphore | None = None
+        # Seconds admitted requests waited in the queue
+        self._waits: deque[float] = deque(maxlen=200)
+
+    @classmethod
+    def from_env(cls) -> 'AdmissionControl':
+        """Build admission control configured from ``AGENT_MAX_*`` environment variables."""
+        return cls(
+            max_concurrency=int(os.getenv('AGENT_MAX_CONCURRENCY', '4')),
+            max_queue=int(os.getenv('AGENT_MAX_QUEUE', '16')),
+        )
+
+    def reserve(self) -> '_Admission':
+        """Take a place for a new request, in a run slot or in the queue.
+
+        Raises:
+            ServerError: A retryable InternalError if every slot and queue
+                place is taken.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        if self.running + self.queued >= self.max_concurrency + self.max_queue:
+            self.rejected += 1
+            logger.warning(
+                f'Rejecting request: {self.running} running, {self.queued} queued'
+            )
+            raise ServerError(
+                error=InternalError(
+                    message='Agent is at capacity, retry later',
+                    data={
+                        'retryable': True,
+                        'running': self.running,
+                        'queued': self.queued,
+                    },
+                )
+            )
+        self.queued += 1
+        return _Admission(self)
+
+    def stats(self) -> dict[str, Any]:
+        waits = list(self._waits)
+        return {
+            'running': self.running,
+            'queued': self.queued,
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+            'queue_wait_p50_seconds': statistics.median(waits) if waits else None,
+            'queue_wait_max_seconds': max(waits) if waits else None,
+        }
+
+
+class _Admission:
+    """One request's place in an AdmissionControl: queued until wait() returns."""
+
+    def __init__(self, control: AdmissionControl):
+        self._control = control
+        self._reserved_at = time.perf_counter()
+        self._running = False
+        self._released = False
+
+    async def wait(self) -> None:
+        """Wait in the queue until a run slot is free, and take it."""
+        control = self._control
+        await control._slots.acquire()
+        self._running = True
+        control.queued -= 1
+        control.running += 1
+        control.admitted += 1
+        control._waits.append(time.perf_counter() - self._reserved_at)
+
+    def release(self) -> None:
+        """Give up the run slot, or the queue place if the request never ran."""
+        if self._released:
+            return
+        self._released = True
+        if self._running:
+            self._control.running -= 1
+            self._control._slots.release()
+        else:
+            self._control.queued -= 1
+
+
+class StatusUpdateCoalescer:
+    """Merges consecutive working-status updates of one task into fewer messages.
+
+    An update arriving ``window`` seconds or more after the last one sent is
+    sent at once. Updates arriving sooner are held and sent together, as one
+    message with all their parts, when the window ends or once they hold
+    ``max_chars`` characters of text. A window of 0 sends every update.
+    """
+
+    def __init__(self, updater: TaskUpdater, window: float, max_chars: int):
+        self._updater = updater
+        self.window = window
+        self.max_chars = max_chars
+        self.received = 0
+        self.emitted = 0
+        self._pending: list[Part] = []
+        self._pending_chars = 0
+        self._last_sent = float('-inf')
+        self._timer: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    async def add(self, parts: list[Part]) -> None:
+        """Send or hold the parts of one agent event."""
+        self.received += 1
+        if not parts:
+            return
+        self._pending.extend(parts)
+        self._pending_chars += sum(
+            len(root.text)
+            for root in (getattr(part, 'root', part) for part in parts)
+            if isinstance(root, TextPart)
+        )
+        wait = self._last_sent + self.window - time.monotonic()
+        if wait <= 0 or self._pending_chars >= self.max_chars:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later(wait))
+
+    async def flush(self) -> None:
+        """Send held updates now, such as before the final artifact."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._send()
+
+    def close(self) -> None:
+        """Stop a pending delayed send once the task has ended."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer = None
+        await self._send()
+
+    async def _send(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+            parts, self._pending, self._pending_chars = self._pending, [], 0
+            self._last_sent = time.monotonic()
+            self.emitted += 1
+            await self._updater.update_status(
+                TaskState.working,
+                message=self._updater.new_agent_message(parts),
+            )
+
+
+def _deadline_timeout(context: RequestContext) -> float | None:
+    """Seconds left until the deadline in the request's message metadata, if any."""
+    metadata = (context.message.metadata if context.message else None) or {}
+    try:
+        return float(metadata[DEADLINE_METADATA_KEY]) - time.time()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+async def _fail_deadline_exceeded(updater: TaskUpdater) -> None:
+    await updater.update_status(
+        TaskState.failed,
+        message=updater.new_agent_message(
+            [Part(root=TextPart(text='Deadline exceeded before the task completed'))]
+        ),
+        final=True,
+    )
+
+
 def convert_a2a_part_to_genai(part: Part) -> types.Part:
     """Convert a single A2A Part type into a Google Gen AI Part type.
 
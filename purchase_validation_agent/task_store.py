@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import os
+
+from a2a.server.tasks import (
+    InMemoryTaskStore,
+    PushNotificationConfigStore,
+    PushNotificationSender,
+)
+from a2a.types import Task
+
+
+logger = logging.getLogger(__name__)
+
+
+class PushNotifyingTaskStore(InMemoryTaskStore):
+    """An in-memory task store that pushes every saved task to its webhooks.
+
+    The request handler only pushes a task once for a non-blocking
+    ``message/send``, but the task is saved on every state change, so
+    pushing from here notifies callers of each change up to the final one.
+
+    Pushes are sent in the background, so saving a task never waits on a
+    slow or unreachable webhook, and a push is given up after
+    ``push_timeout`` seconds. The pushes of one task are sent in order.
+    Tasks without a registered webhook are not pushed.
+    """
+
+    def __init__(
+        self,
+        push_sender: PushNotificationSender,
+        config_store: PushNotificationConfigStore,
+        push_timeout: float | None = None,
+    ):
+        super().__init__()
+        self._push_sender = push_sender
+        self._config_store = config_store
+        self.push_timeout = (
+            push_timeout
+            if push_timeout is not None
+            else float(os.getenv('PUSH_NOTIFICATION_TIMEOUT', '5'))
+        )
+        # Latest push of each task, which the task's next push waits for
+        self._pushes: dict[str, asyncio.Task] = {}
+
+    async def save(self, task: Task, *args, **kwargs) -> None:
+        await super().save(task, *args, **kwargs)
+        if not await self._config_store.get_info(task.id):
+            return
+        push = asyncio.create_task(
+            self._push(task.model_copy(deep=True), self._pushes.get(task.id))
+        )
+        self._pushes[task.id] = push
+        push.add_done_callback(lambda done: self._forget(task.id, done))
+
+    async def _push(self, task: Task, previous: asyncio.Task | None) -> None:
+        if previous is not None:
+            await asyncio.wait({previous})
+        try:
+            await asyncio.wait_for(
+                self._push_sender.send_notification(task), self.push_timeout
+            )
+        except Exception as e:
+            logger.warning(f'Could not push task {task.id} ({task.status.state.value}): {e!r}')
+
+    def _forget(self, task_id: str, push: asyncio.Task) -> None:
+        if self._pushes.get(task_id) is push:
+            del self._pushes[task_id]
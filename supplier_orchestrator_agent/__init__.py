@@ -27,19 +27,82 @@ Workflows:
 1. Standard Supplier Workflow:
    - Order Intelligence Agent: Processes incoming orders and extracts details
    - Production Queue Management Agent: Records orders and manages production queue
+   - Several orders found in one run are recorded concurrently, one call per order
+   - Orders whose email message ID or PO number was already recorded are dropped
+     before the Production Queue Management Agent is called
 
 2. Order Monitoring Workflow:
    - Continuous monitoring of incoming orders
    - Real-time processing and production queue updates
+   - Only runs production queue management when new orders were found
+   - With ORDER_MONITOR_ENABLED, runs in the background on an interval that
+     shortens while orders arrive and backs off while none do
 
 Tools Available:
 - send_message: Send structured messages to other agents
 - execute_supplier_workflow: Orchestrate the complete supplier process
 - execute_order_monitoring_workflow: Execute continuous order monitoring
+- resume_supplier_workflow: Resume a checkpointed supplier or monitoring workflow, re-running only unfinished steps
+- get_supplier_workflow_status: Get the state and results of a workflow started in job mode
+- cancel_supplier_workflow: Cancel a supplier or monitoring workflow still running in job mode, canceling the remote agent tasks it waits on
 
-Environment Variables:
+Direct workflow runs:
+- POST /workflow with an optional JSON body {"workflow": "supplier" | "monitoring", "request": "..."}
+  runs a workflow without the orchestrator LLM and returns its workflow results
+- python __main__.py --interface workflow [--workflow monitoring] [--request "..."] does the same once from the command line
+
+Monitoring:
+- GET /stats reports connection pool saturation, per-replica routing and circuit state, hedging,
+  caches, workflow jobs, the processed order index and the order monitor
+
+Environment Variables (each agent URL variable accepts a comma-separated list of replica URLs):
 - ORDER_INTELLIGENCE_AGENT_URL: URL for Order Intelligence Agent (default: http://localhost:8091)
 - PRODUCTION_QUEUE_AGENT_URL: URL for Production Queue Agent (default: http://localhost:8092)
+- A2A_HTTP_TIMEOUT: Timeout in seconds for requests to remote agents (default: 30)
+- A2A_HTTP_MAX_CONNECTIONS / A2A_HTTP_MAX_KEEPALIVE_CONNECTIONS: Shared connection pool limits (default: 100 / 20)
+- A2A_HTTP_KEEPALIVE_EXPIRY: Seconds an idle pooled connection is kept open (default: 30)
+- A2A_HTTP_MAX_CONNECTIONS_PER_HOST: Concurrent requests allowed per remote agent host (default: 20)
+- A2A_HTTP2: Use HTTP/2 multiplexing when the h2 package is installed (default: true)
+- A2A_STREAMING: Delegate over message/stream to agents that advertise streaming (default: true)
+- A2A_REPLICA_MAX_FAILURES: Consecutive transport failures before a replica is ejected (default: 3)
+- A2A_HEALTH_CHECK_INTERVAL: Seconds between replica health checks (default: 15)
+- A2A_BREAKER_FAILURE_RATE / A2A_BREAKER_SLOW_CALL_RATE: Share of failed or slow calls in the window that opens a replica's circuit (default: 0.5 / 0.5)
+- A2A_BREAKER_SLOW_CALL_SECONDS: Call duration counted as slow (default: 60)
+- A2A_BREAKER_WINDOW_SIZE / A2A_BREAKER_MINIMUM_CALLS: Calls considered and calls needed before the circuit can open (default: 20 / 5)
+- A2A_BREAKER_OPEN_SECONDS: Seconds a circuit stays open before a half-open probe is allowed (default: 30)
+- HEDGED_AGENTS: Comma-separated names of read-only agents whose slow requests are hedged on a second replica, e.g. 'Order Intelligence Agent' (default: none; Purchase Order Agent and Production Queue Management Agent are never hedged)
+- HEDGE_PERCENTILE / HEDGE_MIN_SAMPLES / HEDGE_SAMPLE_WINDOW: Latency percentile that triggers a hedge, calls timed before hedging starts, and calls kept for the percentile (default: 95 / 10 / 200)
+- WORKFLOW_DEADLINE_SECONDS: Time budget for one workflow, shared between its steps and sent to agents in message metadata (default: 600)
+- A2A_RETRY_MAX_ATTEMPTS / A2A_RETRY_BASE_DELAY / A2A_RETRY_MAX_DELAY: Attempts per agent call and jittered exponential backoff bounds in seconds (default: 3 / 0.5 / 8)
+- A2A_RETRY_MIN_ATTEMPT_SECONDS: Least time that must be left before the deadline to retry (default: 1)
+- WORKFLOW_STORE_PATH: SQLite file workflow step checkpoints are kept in (default: ~/.cache/a2a_adk_agents/supplier_orchestrator_workflows.sqlite3)
+- WORKFLOW_STORE_RETENTION: Seconds checkpointed workflows are kept (default: 604800)
+- WORKFLOW_JOB_MODE: Run workflow tools as background jobs that return a workflow_id at once, can be polled with tasks/get and stopped with tasks/cancel (default: false)
+- WORKFLOW_JOB_CONCURRENCY: Background workflow jobs run at once; further jobs wait as submitted (default: 100)
+- A2A_PUSH_NOTIFICATIONS: Set to true to have agents that support it push task updates to a webhook instead of holding a connection open (fastapi interface only, default: false)
+- A2A_PUSH_WEBHOOK_URL: Address remote agents should POST task updates to (default: the agent card URL + /a2a/push)
+- A2A_PUSH_TOKEN: Token remote agents must send with each push notification (default: random per process)
+- A2A_PUSH_FALLBACK_POLL_SECONDS: Seconds without a final push update before the task is polled (default: 30)
+- RESULT_CACHE_AGENTS: Comma-separated agent names whose completed results are reused for identical tasks, e.g. Order Intelligence Agent (default: none; agents whose tasks are not idempotent are never cached, nor are order monitoring checks)
+- RESULT_CACHE_TTL_SECONDS: Seconds a cached result is reused for (default: 300)
+- RESULT_CACHE_MAX_ENTRIES: Cached results kept before the least recently used is evicted (default: 256)
+- RESULT_CACHE_DATA_VERSION: Token for the current version of the agents' underlying data; change it to stop reusing results computed from older data (default: empty)
+- A2A_SINGLE_FLIGHT: Let concurrent identical tasks for idempotent agents share one in-flight call (default: true)
+- PRODUCTION_FANOUT_CONCURRENCY: Orders recorded with the Production Queue Management Agent at the same time when a step finds several (default: 8)
+- PROCESSED_ORDER_STORE_PATH: SQLite file of the email message IDs and PO numbers of recorded orders (default: ~/.cache/a2a_adk_agents/supplier_orchestrator_processed_orders.sqlite3)
+- PROCESSED_ORDER_RETENTION: Seconds a recorded order is remembered for dropping repeats (default: 2592000)
+- SESSION_CACHE_SIZE: Conversation sessions the A2A server keeps before deleting the least recently used (default: 1000)
+- STATUS_UPDATE_COALESCE_SECONDS: Window in seconds within which the A2A server merges the agent's partial responses into one working status update; 0 sends each one (default: 0.25)
+- STATUS_UPDATE_COALESCE_MAX_CHARS: Characters of held partial responses that send them before the window ends (default: 4000)
+- ORDER_MONITOR_ENABLED: Check for new orders in the background of the A2A server, without LLM turns (default: false)
+- ORDER_MONITOR_MIN_INTERVAL: Seconds between checks while new orders keep arriving (default: 30)
+- ORDER_MONITOR_MAX_INTERVAL: Longest wait between checks when no orders arrive (default: 600)
+- ORDER_MONITOR_BACKOFF_FACTOR: Factor the wait grows by after each check without new orders (default: 2)
+- AGENT_STARTUP_DEADLINE: Seconds to wait for agent cards at startup before continuing without them (default: 10)
+- AGENT_CARD_RETRY_INTERVAL: Initial backoff in seconds for background card retries (default: 2)
+- AGENT_CARD_CACHE_PATH: On-disk agent card cache file (default: ~/.cache/a2a_adk_agents/<orchestrator>_agent_cards.json)
+- AGENT_CARD_CACHE_TTL: Seconds a cached agent card is used without waiting for a refetch (default: 3600)
+- HANDOFF_MAX_CHARS: Maximum characters of a step's output passed on to the next step (default: 4000)
 - MCP_SERVER_URL: MCP server endpoint (default: http://localhost:8080/mcp)
 - GOOGLE_API_KEY: API key for Google Gemini model
 - MODEL_NAME: Model name (default: gemini-2.0-flash-exp)
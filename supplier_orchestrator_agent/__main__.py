@@ -1,3 +1,5 @@
+import asyncio
+import json
 import logging
 import os
 
@@ -5,8 +7,15 @@ import click
 from dotenv import load_dotenv
 import uvicorn
 
-from agent import root_agent
+from agent import (
+    WORKFLOW_PROMPTS,
+    SupplierOrchestratorAgent,
+    create_root_agent,
+    get_supplier_orchestrator,
+)
 from agent_executor import ADKAgentExecutor
+from push_receiver import PushNotificationReceiver
+from workflow_jobs import json_safe
 
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory import InMemoryMemoryService
@@ -21,6 +30,9 @@ from a2a.types import (
     AgentCard,
     AgentSkill,
 )
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
 
 
 logger = logging.getLogger(__name__)
@@ -28,10 +40,66 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 
+def workflow_routes(orchestrator: SupplierOrchestratorAgent) -> list[Route]:
+    """Routes that run supplier workflows directly, without an orchestrator LLM turn."""
+
+    async def run_workflow(request: Request) -> JSONResponse:
+        body = {}
+        if await request.body():
+            try:
+                body = await request.json()
+            except ValueError:
+                return JSONResponse({'error': 'Request body must be JSON'}, status_code=400)
+        if (
+            not isinstance(body, dict)
+            or body.get('workflow', 'supplier') not in WORKFLOW_PROMPTS
+            or not isinstance(body.get('request', ''), str)
+        ):
+            return JSONResponse(
+                {'error': f"Expected a JSON object with a 'request' string and a 'workflow' of {', '.join(WORKFLOW_PROMPTS)}"},
+                status_code=400,
+            )
+        results = await orchestrator.run_workflow(
+            body.get('workflow', 'supplier'), body.get('request')
+        )
+        return JSONResponse(json_safe(results))
+
+    return [Route('/workflow', run_workflow, methods=['POST'])]
+
+
+def stats_routes(
+    orchestrator: SupplierOrchestratorAgent, executor: ADKAgentExecutor
+) -> list[Route]:
+    """Routes that report connection pool saturation, replica and hedging metrics, and executor load."""
+
+    async def stats(request: Request) -> JSONResponse:
+        return JSONResponse(
+            json_safe({'orchestrator': orchestrator.stats(), 'executor': executor.stats()})
+        )
+
+    return [Route('/stats', stats, methods=['GET'])]
+
+
+async def run_workflow_once(workflow_type: str, workflow_request: str | None) -> None:
+    """Run one workflow, print its results as JSON and exit."""
+    orchestrator = await get_supplier_orchestrator()
+    # Wait for the workflow even in job mode: a background job would be
+    # cancelled when this process exits
+    results = await orchestrator.run_workflow(
+        workflow_type, workflow_request, wait=True
+    )
+    print(json.dumps(json_safe(results), indent=2))
+    if results.get('status') == 'failed':
+        raise SystemExit(1)
+
+
 @click.command()
 @click.option("--host", default="localhost", help="Host to bind the server to")
 @click.option("--port", default=8094, help="Port to bind the server to")
-def main(host: str, port: int):
+@click.option("--interface", default="fastapi", type=click.Choice(['fastapi', 'workflow']), help="Interface to use: fastapi, or workflow to run one workflow without the LLM")
+@click.option("--workflow", "workflow_type", default="supplier", type=click.Choice(list(WORKFLOW_PROMPTS)), help="Workflow the workflow interface runs")
+@click.option("--request", "workflow_request", default=None, help="Workflow request for the workflow interface (default: the workflow's standard request)")
+def main(host: str, port: int, interface: str, workflow_type: str, workflow_request: str | None):
     """Run the supplier orchestrator agent server."""
     logger.info("--- 🚀 Starting Supplier Orchestrator Agent Server... ---")
     
@@ -56,6 +124,17 @@ def main(host: str, port: int):
         skills=[skill],
     )
 
+    if interface == "workflow":
+        asyncio.run(run_workflow_once(workflow_type, workflow_request))
+        return
+
+    asyncio.run(serve(host, port, agent_card))
+
+
+async def serve(host: str, port: int, agent_card: AgentCard):
+    """Build the orchestrator inside this event loop and run the A2A server."""
+    root_agent = await create_root_agent()
+
     # Create runner
     runner = Runner(
         app_name=agent_card.name,
@@ -65,18 +144,43 @@ def main(host: str, port: int):
         artifact_service=InMemoryArtifactService(),
     )
 
+    # Workflow jobs live in the server's task store so tasks/get can poll them
+    # and tasks/cancel can stop them
+    task_store = InMemoryTaskStore()
+    orchestrator = await get_supplier_orchestrator()
+    orchestrator.jobs.attach_task_store(task_store)
+
     # Create executor
-    executor = ADKAgentExecutor(runner, agent_card)
+    executor = ADKAgentExecutor(runner, agent_card, jobs=orchestrator.jobs)
 
     # Create app
     app = A2AFastAPIApplication(
         agent_card=agent_card,
         http_handler=DefaultRequestHandler(
             agent_executor=executor,
-            task_store=InMemoryTaskStore(),
+            task_store=task_store,
         )
-    )
-    uvicorn.run(app.build(), host=host, port=port)
+    ).build()
+    # POST /workflow runs a workflow without the orchestrator LLM
+    app.router.routes.extend(workflow_routes(orchestrator))
+    # GET /stats reports connection pool and replica metrics
+    app.router.routes.extend(stats_routes(orchestrator, executor))
+    push_receiver = PushNotificationReceiver.from_env(agent_card.url)
+    if push_receiver:
+        # Remote agents push task updates to a webhook on this server
+        app.router.routes.extend(push_receiver.routes())
+        orchestrator.push_receiver = push_receiver
+        print(f'Receiving push notifications at {push_receiver.webhook_url}')
+    if orchestrator.order_monitor:
+        # Poll for new orders in the background, without LLM turns
+        orchestrator.order_monitor.start()
+        print(f'Monitoring orders every {orchestrator.order_monitor.min_interval:.0f}s to {orchestrator.order_monitor.max_interval:.0f}s')
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port))
+    try:
+        await server.serve()
+    finally:
+        if orchestrator.order_monitor:
+            await orchestrator.order_monitor.stop()
 
 
 if __name__ == "__main__":
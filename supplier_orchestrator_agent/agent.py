@@ -1,8 +1,10 @@
 # ruff: noqa: E501
 # pylint: disable=logging-fstring-interpolation
 import asyncio
+import contextvars
 import json
 import os
+import time
 import uuid
 
 from typing import Any
@@ -12,16 +14,39 @@ import httpx
 from a2a.client import A2ACardResolver
 from a2a.types import (
     AgentCard,
+    MessageSendConfiguration,
     MessageSendParams,
     Part,
     SendMessageRequest,
     SendMessageResponse,
     SendMessageSuccessResponse,
+    SendStreamingMessageRequest,
     Task,
 )
+from card_cache import AgentCardCache
+from order_batching import ORDER_LIST_INSTRUCTION, order_label, split_orders
+from order_monitor import NO_NEW_ORDERS_MARKER, OrderMonitor, has_new_orders
+from processed_orders import ProcessedOrderIndex
+from push_receiver import PushNotificationReceiver
+from remote_progress import forward_remote_update
 from remote_agent_connection import (
+    NON_IDEMPOTENT_AGENTS,
     RemoteAgentConnections,
     TaskUpdateCallback,
+    call_deadline,
+    get_shared_transport,
+)
+from result_cache import ResultCache, normalize_task_text
+from retry_policy import Deadline, DeadlineExceededError, RetryPolicy
+from single_flight import SingleFlight
+from workflow_jobs import WorkflowJobManager
+from workflow_progress import report_step
+from workflow_store import FAILED_TASK_STATES, WorkflowStore
+from workflow_handoff import (
+    extract_task_output,
+    format_handoff,
+    handoff_token_counts,
+    merge_handoffs,
 )
 from dotenv import load_dotenv
 from google.adk import Agent
@@ -32,6 +57,24 @@ from google.adk.tools.tool_context import ToolContext
 
 load_dotenv()
 
+# The fixed requests scheduled runs start each workflow with
+SUPPLIER_WORKFLOW_PROMPT = "Process new purchase order emails, extract the order details and add the orders to the production queue."
+ORDER_MONITORING_PROMPT = "Monitor incoming emails for new purchase orders and process any new orders through production queue management."
+WORKFLOW_PROMPTS = {
+    'supplier': SUPPLIER_WORKFLOW_PROMPT,
+    'monitoring': ORDER_MONITORING_PROMPT,
+}
+
+
+class DirectToolContext:
+    """Stands in for the ADK ToolContext when a workflow runs without the LLM.
+
+    Workflow steps only use the context to keep per-run state.
+    """
+
+    def __init__(self):
+        self.state: dict[str, Any] = {}
+
 
 def convert_part(part: Part, tool_context: ToolContext):
     """Convert a part to text. Only text parts are supported."""
@@ -84,36 +127,185 @@ class SupplierOrchestratorAgent:
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
         self.agents: str = ''
+        self.startup_deadline = float(os.getenv('AGENT_STARTUP_DEADLINE', '10'))
+        self.card_retry_interval = float(
+            os.getenv('AGENT_CARD_RETRY_INTERVAL', '2')
+        )
+        self.card_retry_max_interval = 60.0
+        self._unresolved_addresses: set[str] = set()
+        self._resolution_tasks: dict[str, asyncio.Task] = {}
+        self._background_tasks: set[asyncio.Task] = set()
+        self.health_check_interval = float(
+            os.getenv('A2A_HEALTH_CHECK_INTERVAL', '15')
+        )
+        self._health_check_task: asyncio.Task | None = None
+        self.card_cache = AgentCardCache.from_env('supplier_orchestrator')
+        self.retry_policy = RetryPolicy.from_env()
+        self.result_cache = ResultCache.from_env(NON_IDEMPOTENT_AGENTS)
+        self.in_flight = SingleFlight(
+            os.getenv('A2A_SINGLE_FLIGHT', 'true').lower() == 'true'
+        )
+        self.workflow_store = WorkflowStore.from_env('supplier_orchestrator')
+        self.jobs = WorkflowJobManager.from_env()
+        self.job_mode = os.getenv('WORKFLOW_JOB_MODE', 'false').lower() == 'true'
+        self.processed_orders = ProcessedOrderIndex.from_env('supplier_orchestrator')
+        self.production_fanout_concurrency = int(
+            os.getenv('PRODUCTION_FANOUT_CONCURRENCY', '8')
+        )
+        # Started by the server when ORDER_MONITOR_ENABLED is set
+        self.order_monitor = OrderMonitor.from_env(self.run_monitoring_cycle)
+        # Set by the server when remote agents should push task updates to it
+        self.push_receiver: PushNotificationReceiver | None = None
 
     async def _async_init_components(
         self, remote_agent_addresses: list[str]
     ) -> None:
-        """Asynchronous part of initialization."""
-        # Use a single httpx.AsyncClient for all card resolutions for efficiency
-        async with httpx.AsyncClient(timeout=30) as client:
-            for address in remote_agent_addresses:
-                card_resolver = A2ACardResolver(
-                    client, address
-                )  # Constructor is sync
-                try:
-                    card = (
-                        await card_resolver.get_agent_card()
-                    )  # get_agent_card is async
+        """Asynchronous part of initialization.
 
-                    remote_connection = RemoteAgentConnections(
-                        agent_card=card, agent_url=address
-                    )
-                    self.remote_agent_connections[card.name] = remote_connection
-                    self.cards[card.name] = card
-                except httpx.ConnectError as e:
-                    print(
-                        f'ERROR: Failed to get agent card from {address}: {e}'
-                    )
-                except Exception as e:  # Catch other potential errors
+        Cards that are fresh in the on-disk cache are used right away and
+        revalidated in the background. The rest are resolved concurrently under
+        one startup deadline. Agents that have not answered by then keep being
+        retried in the background and are added once they come up.
+        """
+        attempts: dict[str, asyncio.Task] = {}
+        expired_cards: dict[str, AgentCard] = {}
+        for address in remote_agent_addresses:
+            cached = self.card_cache.get(address)
+            if cached is not None and cached[1]:
+                self._register_agent_card(address, cached[0])
+                self._start_background_task(
+                    self._revalidate_agent_card(address)
+                )
+                continue
+            if cached is not None:
+                expired_cards[address] = cached[0]
+            self._unresolved_addresses.add(address)
+            attempts[address] = asyncio.create_task(
+                self._resolve_agent_card(address)
+            )
+
+        if attempts:
+            await asyncio.wait(
+                attempts.values(), timeout=self.startup_deadline
+            )
+        for address, attempt in attempts.items():
+            if not attempt.done():
+                print(
+                    f'WARNING: {address} did not answer within the {self.startup_deadline}s startup deadline; retrying in the background'
+                )
+            if address in self._unresolved_addresses:
+                if address in expired_cards:
                     print(
-                        f'ERROR: Failed to initialize connection for {address}: {e}'
+                        f'WARNING: Using expired cached agent card for {address} until it can be refreshed'
                     )
+                    self._register_agent_card(address, expired_cards[address])
+                self._resolution_tasks[address] = asyncio.create_task(
+                    self._retry_agent_card(address, attempt)
+                )
+
+        self._ensure_background_tasks()
+        self._refresh_agent_listing()
+
+    async def _resolve_agent_card(self, address: str) -> bool:
+        """Fetch the agent card at address, cache it and register its connection."""
+        # Card resolution shares the process-wide connection pool with send_message
+        transport = get_shared_transport()
+        card_resolver = A2ACardResolver(
+            transport.client, address
+        )  # Constructor is sync
+        try:
+            async with transport.host_slot(address):
+                card = (
+                    await card_resolver.get_agent_card()
+                )  # get_agent_card is async
+
+            self._register_agent_card(address, card)
+            self._unresolved_addresses.discard(address)
+            await self.card_cache.put(address, card)
+            return True
+        except httpx.ConnectError as e:
+            print(
+                f'ERROR: Failed to get agent card from {address}: {e}'
+            )
+        except Exception as e:  # Catch other potential errors
+            print(
+                f'ERROR: Failed to initialize connection for {address}: {e}'
+            )
+        return False
+
+    def _register_agent_card(self, address: str, card: AgentCard) -> None:
+        """Register address as a replica of the agent named on its card."""
+        existing = self.remote_agent_connections.get(card.name)
+        if existing is None:
+            self.remote_agent_connections[card.name] = RemoteAgentConnections(
+                agent_card=card, agent_url=address, transport=get_shared_transport()
+            )
+            self.cards[card.name] = card
+            return
+        if address not in existing.replica_urls:
+            existing.add_replica(address)
+        elif existing.card != card:
+            existing.card = card
+            self.cards[card.name] = card
+
+    async def _revalidate_agent_card(self, address: str) -> None:
+        """Refresh a card that was served from the cache."""
+        if await self._resolve_agent_card(address):
+            self._refresh_agent_listing()
+
+    def _start_background_task(self, coro) -> asyncio.Task:
+        """Run coro in the background, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def _retry_agent_card(
+        self, address: str, first_attempt: asyncio.Task | None = None
+    ) -> None:
+        """Keep resolving the agent card at address with backoff until it succeeds."""
+        if first_attempt is not None and await first_attempt:
+            self._refresh_agent_listing()
+            return
+        delay = self.card_retry_interval
+        while address in self._unresolved_addresses:
+            await asyncio.sleep(delay)
+            if await self._resolve_agent_card(address):
+                print(f'Agent at {address} is now available')
+                self._refresh_agent_listing()
+                return
+            delay = min(delay * 2, self.card_retry_max_interval)
+
+    async def _health_check_loop(self) -> None:
+        """Periodically health-check every replica of every remote agent."""
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await asyncio.gather(
+                *(
+                    connection.health_check()
+                    for connection in list(self.remote_agent_connections.values())
+                )
+            )
+
+    def _ensure_background_tasks(self) -> None:
+        """Restart card retries and health checks that are not running on the current loop.
+
+        Tasks started under a loop that has since closed (for example the one
+        used by asyncio.run at import time) are finished and get rescheduled here.
+        """
+        if self._health_check_task is None or self._health_check_task.done():
+            self._health_check_task = asyncio.create_task(
+                self._health_check_loop()
+            )
+        for address in self._unresolved_addresses:
+            task = self._resolution_tasks.get(address)
+            if task is None or task.done():
+                self._resolution_tasks[address] = asyncio.create_task(
+                    self._retry_agent_card(address)
+                )
 
+    def _refresh_agent_listing(self) -> None:
+        """Rebuild the agent listing used in the root instruction."""
         # Populate self.agents using the logic from original __init__ (via list_remote_agents)
         agent_info = []
         for agent_detail_dict in self.list_remote_agents():
@@ -127,8 +319,14 @@ class SupplierOrchestratorAgent:
         task_callback: TaskUpdateCallback | None = None,
     ) -> 'SupplierOrchestratorAgent':
         """Create and asynchronously initialize an instance of the SupplierOrchestratorAgent."""
+        started = time.perf_counter()
         instance = cls(task_callback)
         await instance._async_init_components(remote_agent_addresses)
+        cache_stats = instance.card_cache.stats()
+        print(
+            f'Agent card cache: {cache_stats["hits"]} hit(s), {cache_stats["misses"]} miss(es); '
+            f'startup took {time.perf_counter() - started:.2f}s'
+        )
         return instance
 
     def create_agent(self) -> Agent:
@@ -147,6 +345,9 @@ class SupplierOrchestratorAgent:
                 self.send_message,
                 self.execute_supplier_workflow,
                 self.execute_order_monitoring_workflow,
+                self.resume_supplier_workflow,
+                self.get_supplier_workflow_status,
+                self.cancel_supplier_workflow,
             ],
         )
 
@@ -181,6 +382,9 @@ class SupplierOrchestratorAgent:
         **Usage Instructions:**
         - For complete workflow: Use `execute_supplier_workflow` with the overall request
         - For order monitoring: Use `execute_order_monitoring_workflow` for continuous monitoring
+        - To finish an earlier supplier or monitoring workflow that failed: Use `resume_supplier_workflow` with its workflow_id
+        - When a workflow tool returns a submitted workflow_id: Use `get_supplier_workflow_status` with that workflow_id to report its progress and results
+        - When the user drops or replaces a submitted workflow that is still running: Use `cancel_supplier_workflow` with its workflow_id
         - For individual agent tasks: Use `send_message` with specific agent name and task
         - Always provide comprehensive context when delegating tasks
         """
@@ -199,6 +403,7 @@ class SupplierOrchestratorAgent:
     def before_model_callback(
         self, callback_context: CallbackContext, llm_request
     ):
+        self._ensure_background_tasks()
         state = callback_context.state
         if 'session_active' not in state or not state['session_active']:
             if 'session_id' not in state:
@@ -234,6 +439,117 @@ class SupplierOrchestratorAgent:
         Yields:
             A dictionary of JSON data.
         """
+        return await self._delegate(agent_name, task, tool_context)
+
+    async def _delegate(
+        self,
+        agent_name: str,
+        task: str,
+        tool_context: ToolContext,
+        *,
+        deadline: Deadline | None = None,
+        use_cache: bool = True,
+    ):
+        """Send a task to a remote supplier agent, retrying transient failures.
+
+        Failed attempts are retried with jittered exponential backoff as long
+        as the retry policy allows and, when a deadline is given, enough of it
+        is left for another attempt. Each attempt is cut off at the deadline,
+        which is also sent to the agent in the message metadata. For agents
+        whose results are cached, an identical new task recently completed
+        is answered from the result cache without calling the agent, unless
+        use_cache is False, e.g. for checks whose answer changes as new data
+        arrives.
+
+        New tasks for idempotent agents that are identical to a task already
+        in flight wait for that call's result instead of making their own;
+        the shared call runs under the deadline of the caller that started it.
+
+        Raises:
+            DeadlineExceededError: If the deadline passes before the agent answers.
+        """
+        idempotent = agent_name not in NON_IDEMPOTENT_AGENTS
+        # Follow-ups on a remote task always go to the agent
+        if not idempotent or 'task_id' in tool_context.state:
+            return await self._delegate_with_retries(
+                agent_name, task, tool_context, deadline, idempotent
+            )
+        cached = self.result_cache.get(agent_name, task) if use_cache else None
+        if cached is not None:
+            print(f'Using cached result of {agent_name} for an identical task')
+            return cached
+
+        async def call():
+            result = await self._delegate_with_retries(
+                agent_name, task, tool_context, deadline, idempotent
+            )
+            if use_cache:
+                self.result_cache.put(agent_name, task, result)
+            return result
+
+        shared = self.in_flight.do((agent_name, normalize_task_text(task)), call)
+        if deadline is None:
+            return await shared
+        try:
+            return await asyncio.wait_for(shared, deadline.remaining())
+        except DeadlineExceededError:
+            raise
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceededError(
+                f'{agent_name} did not answer within the {deadline.seconds:.1f}s step deadline'
+            ) from e
+
+    async def _delegate_with_retries(
+        self,
+        agent_name: str,
+        task: str,
+        tool_context: ToolContext,
+        deadline: Deadline | None,
+        idempotent: bool,
+    ):
+        """Send a task to a remote agent, retrying failures the retry policy allows."""
+        attempt = 0
+        while True:
+            attempt += 1
+            if deadline and deadline.expired:
+                raise DeadlineExceededError(
+                    f'Deadline exceeded before {agent_name} could be called'
+                )
+            try:
+                call = self._send_message(agent_name, task, tool_context, deadline)
+                if deadline is None:
+                    return await call
+                # Lets the connection tell a call cut off by the deadline
+                # from other cancellations
+                deadline_token = call_deadline.set(deadline.expires_at)
+                try:
+                    return await asyncio.wait_for(call, deadline.remaining())
+                finally:
+                    call_deadline.reset(deadline_token)
+            except asyncio.TimeoutError as e:
+                if deadline and deadline.expired:
+                    raise DeadlineExceededError(
+                        f'{agent_name} did not answer within the {deadline.seconds:.1f}s step deadline'
+                    ) from e
+                error = e
+            except Exception as e:
+                error = e
+            delay = self.retry_policy.backoff(attempt)
+            if not self.retry_policy.should_retry(
+                error, attempt, delay, deadline, idempotent
+            ):
+                raise error
+            print(f'Retrying {agent_name} in {delay:.2f}s after attempt {attempt} failed: {error!r}')
+            await asyncio.sleep(delay)
+
+    async def _send_message(
+        self,
+        agent_name: str,
+        task: str,
+        tool_context: ToolContext,
+        deadline: Deadline | None = None,
+    ):
+        """Send a task to a remote supplier agent once."""
         if agent_name not in self.remote_agent_connections:
             raise ValueError(f'Supplier agent {agent_name} not found')
         
@@ -244,7 +560,8 @@ class SupplierOrchestratorAgent:
         if not client:
             raise ValueError(f'Client not available for {agent_name}')
         
-        task_id = state['task_id'] if 'task_id' in state else str(uuid.uuid4())
+        # Only continue a remote task we already know about; new tasks get their ID from the agent
+        task_id = state['task_id'] if 'task_id' in state else None
 
         if 'context_id' in state:
             context_id = state['context_id']
@@ -259,6 +576,8 @@ class SupplierOrchestratorAgent:
                 message_id = state['input_message_metadata']['message_id']
         if not message_id:
             message_id = str(uuid.uuid4())
+        if deadline:
+            metadata.update(deadline.metadata())
 
         payload = {
             'message': {
@@ -276,9 +595,58 @@ class SupplierOrchestratorAgent:
         if context_id:
             payload['message']['contextId'] = context_id
 
-        message_request = SendMessageRequest(
-            id=message_id, params=MessageSendParams.model_validate(payload)
-        )
+        if metadata:
+            payload['message']['metadata'] = metadata
+
+        params = MessageSendParams.model_validate(payload)
+        if self.push_receiver and client.supports_push_notifications:
+            # Let the agent push task updates to our webhook instead of
+            # holding a connection open until the remote Task finishes.
+            params.configuration = MessageSendConfiguration(
+                blocking=False,
+                push_notification_config=self.push_receiver.push_config(),
+            )
+            send_response, replica_url = await client.send_message_for_push(
+                SendMessageRequest(id=message_id, params=params)
+            )
+            if not isinstance(send_response.root, SendMessageSuccessResponse) or not isinstance(send_response.root.result, Task):
+                print('received non-task response. Aborting get task ')
+                return None
+            remote_task = send_response.root.result
+
+            on_update = None
+            if self.task_callback:
+                # Pushed updates arrive in the webhook's context; forward
+                # them in this request's context
+                request_context = contextvars.copy_context()
+
+                def on_update(update: Task) -> None:
+                    request_context.run(self.task_callback, update, client.card)
+
+            try:
+                return await self.push_receiver.wait_for_task(
+                    remote_task,
+                    poll=lambda: client.get_task(remote_task.id, replica_url),
+                    on_update=on_update,
+                )
+            except asyncio.CancelledError:
+                # Nobody waits for the task any more; free the agent for other work
+                client.abandon_task(remote_task.id, replica_url)
+                raise
+
+        if client.supports_streaming:
+            # Stream progress back through task_callback instead of holding
+            # one request open until the remote Task finishes.
+            result = await client.send_message_streaming(
+                SendStreamingMessageRequest(id=message_id, params=params),
+                task_callback=self.task_callback,
+            )
+            if not isinstance(result, Task):
+                print('received non-task response. Aborting get task ')
+                return None
+            return result
+
+        message_request = SendMessageRequest(id=message_id, params=params)
         send_response: SendMessageResponse = await client.send_message(
             message_request=message_request
         )
@@ -306,148 +674,618 @@ class SupplierOrchestratorAgent:
         1. Order Intelligence Agent - processes incoming orders and extracts details
         2. Production Queue Management Agent - records orders and manages production
 
+        The workflow must finish within WORKFLOW_DEADLINE_SECONDS. Each step
+        gets an even share of the time that is left when it starts. In job
+        mode the workflow runs in the background and this returns its
+        workflow_id right away; use get_supplier_workflow_status to follow it.
+
         Args:
             workflow_request: The overall workflow request and context.
             tool_context: The tool context this method runs in.
 
+        Yields:
+            A dictionary of workflow results, or of the submitted job in job mode.
+        """
+        if self.job_mode:
+            workflow_id = str(uuid.uuid4())
+            return await self.jobs.submit(
+                workflow_id,
+                'supplier',
+                lambda: self._run_supplier_workflow(
+                    workflow_request, tool_context, workflow_id=workflow_id
+                ),
+            )
+        return await self._run_supplier_workflow(workflow_request, tool_context)
+
+    async def execute_order_monitoring_workflow(
+        self, monitoring_request: str, tool_context: ToolContext
+    ):
+        """Executes the order monitoring workflow for continuous order processing.
+
+        This workflow monitors for new orders and processes them through production management.
+        In job mode it runs in the background like execute_supplier_workflow.
+
+        Args:
+            monitoring_request: The monitoring request and context.
+            tool_context: The tool context this method runs in.
+
+        Yields:
+            A dictionary of monitoring results, or of the submitted job in job mode.
+        """
+        if self.job_mode:
+            workflow_id = str(uuid.uuid4())
+            return await self.jobs.submit(
+                workflow_id,
+                'monitoring',
+                lambda: self._run_order_monitoring_workflow(
+                    monitoring_request, tool_context, workflow_id=workflow_id
+                ),
+            )
+        return await self._run_order_monitoring_workflow(
+            monitoring_request, tool_context
+        )
+
+    async def run_workflow(
+        self,
+        workflow_type: str = 'supplier',
+        request: str | None = None,
+        wait: bool = False,
+    ) -> dict[str, Any]:
+        """Run a supplier or monitoring workflow directly, without an orchestrator LLM turn.
+
+        Returns the same workflow results as the execute_supplier_workflow and
+        execute_order_monitoring_workflow tools, or the submitted job in job
+        mode. With wait, the workflow runs to the end and its results are
+        returned even in job mode, e.g. for a one-shot run that exits
+        afterwards. Without a request, the workflow type's default request is
+        used.
+        """
+        if workflow_type not in WORKFLOW_PROMPTS:
+            raise ValueError(f'Unknown workflow type {workflow_type}')
+        request = request or WORKFLOW_PROMPTS[workflow_type]
+        if wait:
+            if workflow_type == 'monitoring':
+                return await self._run_order_monitoring_workflow(
+                    request, DirectToolContext()
+                )
+            return await self._run_supplier_workflow(request, DirectToolContext())
+        if workflow_type == 'monitoring':
+            return await self.execute_order_monitoring_workflow(
+                request, DirectToolContext()
+            )
+        return await self.execute_supplier_workflow(request, DirectToolContext())
+
+    async def run_monitoring_cycle(self) -> bool:
+        """Check for new orders once, without an LLM turn, and report whether any were found.
+
+        This is the cycle the background order monitor runs. Found orders are
+        passed on to the Production Queue Management Agent.
+        """
+        results = await self._run_order_monitoring_workflow(
+            ORDER_MONITORING_PROMPT, DirectToolContext()
+        )
+        if results['status'] == 'failed':
+            raise RuntimeError(results.get('error') or 'Order monitoring failed')
+        return results['orders_found']
+
+    def stats(self) -> dict[str, Any]:
+        """Connection pool saturation, replica routing and hedging of the remote agents,
+        with the state of the caches and workflow jobs."""
+        stats = {
+            'transport': get_shared_transport().metrics(),
+            'agents': {
+                name: {
+                    'replicas': connection.replica_stats(),
+                    'hedging': connection.hedge_stats(),
+                }
+                for name, connection in self.remote_agent_connections.items()
+            },
+            'agent_card_cache': self.card_cache.stats(),
+            'result_cache': self.result_cache.stats(),
+            'single_flight': self.in_flight.stats(),
+            'jobs': self.jobs.stats(),
+        }
+        stats['processed_orders'] = self.processed_orders.stats()
+        if self.order_monitor:
+            stats['order_monitor'] = self.order_monitor.stats()
+        if self.push_receiver:
+            stats['push_notifications'] = self.push_receiver.stats()
+        return stats
+
+    async def get_supplier_workflow_status(
+        self, workflow_id: str, tool_context: ToolContext
+    ):
+        """Gets the status of a supplier or monitoring workflow, and its results once it has finished.
+
+        Args:
+            workflow_id: The workflow_id returned when the workflow was started.
+            tool_context: The tool context this method runs in.
+
+        Yields:
+            A dictionary with the workflow state and, when finished, its results.
+        """
+        status = await self.jobs.status(workflow_id)
+        if status is not None:
+            return status
+        # Not a job of this process; fall back to the workflow's checkpoint.
+        checkpoint = await self.workflow_store.load(workflow_id)
+        if checkpoint is None:
+            return {'workflow_id': workflow_id, 'state': 'not_found'}
+        return {
+            'workflow_id': workflow_id,
+            'workflow_type': checkpoint['workflow_type'],
+            'state': checkpoint['status'],
+            'summary': checkpoint['summary'],
+            'finished_steps': sorted(checkpoint['steps']),
+        }
+
+    async def cancel_supplier_workflow(
+        self, workflow_id: str, tool_context: ToolContext
+    ):
+        """Cancels a supplier or order monitoring workflow that is still running in the background.
+
+        Use this when a newer request supersedes the workflow. It stops at
+        once, the remote agent tasks it was waiting on are canceled, and its
+        slot is freed for other workflows.
+
+        Args:
+            workflow_id: The workflow_id returned when the workflow was started.
+            tool_context: The tool context this method runs in.
+
+        Yields:
+            A dictionary with the workflow's state.
+        """
+        if await self.jobs.cancel(workflow_id):
+            return {'workflow_id': workflow_id, 'state': 'canceled'}
+        status = await self.jobs.status(workflow_id)
+        return {
+            'workflow_id': workflow_id,
+            'state': status['state'] if status else 'not_found',
+            'note': 'The workflow is not running in the background, so there is nothing to cancel.',
+        }
+
+    async def resume_supplier_workflow(
+        self, workflow_id: str, tool_context: ToolContext
+    ):
+        """Resumes a supplier or order monitoring workflow from its last checkpoint.
+
+        Steps that finished before are reused. Only the steps that did not
+        finish run again. A workflow that is still running in the background
+        is not resumed.
+
+        Args:
+            workflow_id: The workflow_id of an earlier supplier or monitoring workflow run.
+            tool_context: The tool context this method runs in.
+
         Yields:
             A dictionary of workflow results.
         """
+        checkpoint = await self.workflow_store.load(workflow_id)
+        if checkpoint is None or checkpoint['workflow_type'] not in ('supplier', 'monitoring'):
+            return {
+                'workflow_id': workflow_id,
+                'status': 'not_found',
+                'error': f'No checkpointed supplier workflow {workflow_id}',
+            }
+        if self.jobs.is_running(workflow_id):
+            return {
+                'workflow_id': workflow_id,
+                'status': 'running',
+                'error': f'Supplier workflow {workflow_id} is still running; wait for it or cancel it before resuming',
+            }
+        if checkpoint['workflow_type'] == 'monitoring':
+            run = self._run_order_monitoring_workflow
+        else:
+            run = self._run_supplier_workflow
+        if self.job_mode:
+            return await self.jobs.submit(
+                workflow_id,
+                checkpoint['workflow_type'],
+                lambda: run(checkpoint['request'], tool_context, checkpoint),
+            )
+        return await run(checkpoint['request'], tool_context, checkpoint)
+
+    async def _start_workflow(
+        self,
+        workflow_type: str,
+        request: str,
+        checkpoint: dict[str, Any] | None,
+        workflow_id: str | None = None,
+    ) -> dict[str, Any]:
+        """Create the results of a new workflow run, or of a resumed one."""
         workflow_results = {
-            'workflow_id': str(uuid.uuid4()),
+            'workflow_id': checkpoint['workflow_id'] if checkpoint else workflow_id or str(uuid.uuid4()),
             'status': 'starting',
+            'resumed_steps': sorted(checkpoint['steps']) if checkpoint else [],
             'steps': []
         }
-        
-        try:
-            # Step 1: Order Intelligence
+        if workflow_type == 'monitoring':
+            workflow_results['workflow_type'] = 'monitoring'
+        if checkpoint is None:
+            await self.workflow_store.create(
+                workflow_results['workflow_id'], workflow_type, request
+            )
+        return workflow_results
+
+    async def _run_checkpointed_step(
+        self,
+        workflow_results: dict[str, Any],
+        checkpoint: dict[str, Any] | None,
+        number: int,
+        step_count: int,
+        deadline: Deadline,
+        run,
+    ) -> dict[str, Any]:
+        """Reuse step number from checkpoint if it finished, otherwise run and checkpoint it.
+
+        run is called with the step's share of the deadline. The step's start
+        and finish are reported to the executor streaming the workflow.
+        """
+        checkpointed = checkpoint['steps'] if checkpoint else {}
+        workflow_id = workflow_results['workflow_id']
+        if number in checkpointed:
+            print(f"Reusing checkpointed Step {number} of workflow {workflow_id}")
+            step = checkpointed[number]
+        else:
+            await report_step('started', {'workflow_id': workflow_id, 'step': number})
+            steps_left = sum(
+                1 for n in range(number, step_count + 1) if n not in checkpointed
+            )
+            step = await run(deadline.split(steps_left))
+            await self.workflow_store.save_step(workflow_id, step)
+        await report_step('finished', {'workflow_id': workflow_id, **step})
+        workflow_results['steps'].append(step)
+        return step
+
+    async def _run_production_fanout(
+        self,
+        step_number: int,
+        orders: list[Any],
+        request: str,
+        tool_context: ToolContext,
+        deadline: Deadline | None = None,
+        workflow_id: str | None = None,
+    ) -> dict[str, Any]:
+        """Record each order through its own Production Queue Management call.
+
+        Orders whose email message ID or PO number is in the processed order
+        index are dropped before any call is made. Up to
+        PRODUCTION_FANOUT_CONCURRENCY of the others are recorded at a time,
+        spread over the agent's replicas, and their reports are merged.
+        Orders that fail are reported in the step. The step fails when every
+        order failed and is partial when only some did, so resuming the
+        workflow runs it again; the orders it recorded are then dropped as
+        duplicates.
+        """
+        labels = {id(order): order_label(order, number) for number, order in enumerate(orders, start=1)}
+        new_orders, duplicates = self.processed_orders.claim_new(orders)
+        skipped = [labels[id(order)] for order in duplicates]
+        if skipped:
+            print(f"Skipping {len(skipped)} orders that were already recorded: {', '.join(skipped)}")
+        if not new_orders:
+            return {
+                'step': step_number,
+                'agent': 'Production Queue Management Agent',
+                'task': None,
+                'result': [],
+                'output': {'text': 'All orders were already recorded.', 'data': [], 'truncated': False},
+                'orders': [],
+                'failed_orders': 0,
+                'skipped_orders': skipped,
+            }
+        orders = new_orders
+        print(f"Executing Step {step_number}: Production Queue Management for {len(orders)} orders")
+        slots = asyncio.Semaphore(self.production_fanout_concurrency)
+
+        async def record_order(order: Any) -> dict[str, Any]:
+            order_context = format_handoff('Order', {'data': [order]})
+            order_task = f"Record this order and add it to the production queue. Original request: {request}\n{order_context}"
+            try:
+                async with slots:
+                    order_result = await self._delegate(
+                        "Production Queue Management Agent",
+                        order_task,
+                        tool_context,
+                        deadline=deadline
+                    )
+                output = extract_task_output(order_result)
+                if output.get('state') in FAILED_TASK_STATES:
+                    raise RuntimeError(f"Production Queue Management Agent reported the order as {output['state']}")
+            except BaseException:
+                self.processed_orders.release(order)
+                raise
+            await self.processed_orders.mark_processed(order, workflow_id)
+            return {'task': order_task, 'result': order_result, 'output': output}
+
+        outcomes = await asyncio.gather(
+            *(record_order(order) for order in orders), return_exceptions=True
+        )
+        recorded = []
+        for order, outcome in zip(orders, outcomes):
+            label = labels[id(order)]
+            # A cancelled order comes back as a CancelledError, a BaseException
+            if isinstance(outcome, BaseException):
+                print(f"Recording {label} failed: {outcome!r}")
+                recorded.append({'order': label, 'status': 'failed', 'error': str(outcome) or type(outcome).__name__})
+            else:
+                recorded.append({'order': label, **outcome})
+        succeeded = [order for order in recorded if 'output' in order]
+        if not succeeded:
+            raise RuntimeError(f'Recording failed for all {len(orders)} orders')
+
+        step = {
+            'step': step_number,
+            'agent': 'Production Queue Management Agent',
+            'task': f"Record {len(orders)} orders and add them to the production queue. Original request: {request}",
+            'result': [order['result'] for order in succeeded],
+            'output': merge_handoffs(
+                [(order['order'], order['output']) for order in succeeded]
+            ),
+            'orders': recorded,
+            'failed_orders': len(recorded) - len(succeeded),
+            'skipped_orders': skipped,
+        }
+        if step['failed_orders']:
+            step['status'] = 'partial'
+        return step
+
+    async def _run_supplier_workflow(
+        self,
+        workflow_request: str,
+        tool_context: ToolContext,
+        checkpoint: dict[str, Any] | None = None,
+        workflow_id: str | None = None,
+    ) -> dict[str, Any]:
+        """Run the supplier workflow, checkpointing each step as it finishes."""
+        deadline = Deadline.from_env()
+        workflow_results = await self._start_workflow(
+            'supplier', workflow_request, checkpoint, workflow_id
+        )
+        workflow_results['deadline_seconds'] = deadline.seconds
+
+        async def order_intelligence(step_deadline: Deadline) -> dict[str, Any]:
             print("Executing Step 1: Order Intelligence")
-            order_task = f"Process incoming orders and extract order details. Context: {workflow_request}"
-            order_result = await self.send_message(
+            order_task = f"Process incoming orders and extract order details. {ORDER_LIST_INSTRUCTION} Context: {workflow_request}"
+            order_result = await self._delegate(
                 "Order Intelligence Agent", 
                 order_task, 
-                tool_context
+                tool_context,
+                deadline=step_deadline
             )
-            workflow_results['steps'].append({
+            return {
                 'step': 1,
                 'agent': 'Order Intelligence Agent',
                 'task': order_task,
-                'result': order_result
-            })
-
-            # Step 2: Production Queue Management
+                'result': order_result,
+                'output': extract_task_output(order_result),
+            }
+
+        async def production_queue(step_deadline: Deadline) -> dict[str, Any]:
+            orders = split_orders(order_step['result'])
+            if orders:
+                return await self._run_production_fanout(
+                    2,
+                    orders,
+                    workflow_request,
+                    tool_context,
+                    step_deadline,
+                    workflow_results['workflow_id'],
+                )
             print("Executing Step 2: Production Queue Management")
-            production_task = f"Record extracted orders and manage production queue based on order intelligence results: {order_result}. Original request: {workflow_request}"
-            production_result = await self.send_message(
+            order_context = format_handoff('Order intelligence results', order_step['output'])
+            production_task = f"Record extracted orders and manage production queue based on the order intelligence results below. Original request: {workflow_request}\n{order_context}"
+            production_tokens = handoff_token_counts(str(order_step['result']), order_context)
+            print(f"Step 2 context tokens: {production_tokens['before']} -> {production_tokens['after']}")
+            production_result = await self._delegate(
                 "Production Queue Management Agent",
                 production_task,
-                tool_context
+                tool_context,
+                deadline=step_deadline
             )
-            workflow_results['steps'].append({
+            return {
                 'step': 2,
                 'agent': 'Production Queue Management Agent',
                 'task': production_task,
-                'result': production_result
-            })
+                'result': production_result,
+                'output': extract_task_output(production_result),
+                'context_tokens': production_tokens,
+            }
+        
+        try:
+            order_step = await self._run_checkpointed_step(
+                workflow_results, checkpoint, 1, 2, deadline, order_intelligence
+            )
+            production_step = await self._run_checkpointed_step(
+                workflow_results, checkpoint, 2, 2, deadline, production_queue
+            )
 
             workflow_results['status'] = 'completed'
-            workflow_results['summary'] = 'Supplier workflow completed successfully across both agents'
+            if production_step.get('status') == 'partial':
+                workflow_results['summary'] = f"Supplier workflow completed, but {production_step['failed_orders']} orders could not be recorded. Resume the workflow to retry them."
+            else:
+                workflow_results['summary'] = 'Supplier workflow completed successfully across both agents'
 
         except Exception as e:
             print(f"Supplier workflow execution failed: {e}")
             workflow_results['status'] = 'failed'
             workflow_results['error'] = str(e)
 
+        if self.result_cache.agents:
+            workflow_results['result_cache'] = self.result_cache.stats()
+        workflow_results['single_flight'] = self.in_flight.stats()
+        await self.workflow_store.finish(
+            workflow_results['workflow_id'],
+            workflow_results['status'],
+            workflow_results.get('summary') or workflow_results.get('error'),
+        )
         return workflow_results
 
-    async def execute_order_monitoring_workflow(
-        self, monitoring_request: str, tool_context: ToolContext
-    ):
-        """Executes the order monitoring workflow for continuous order processing.
-
-        This workflow monitors for new orders and processes them through production management.
-
-        Args:
-            monitoring_request: The monitoring request and context.
-            tool_context: The tool context this method runs in.
+    async def _run_order_monitoring_workflow(
+        self,
+        monitoring_request: str,
+        tool_context: ToolContext,
+        checkpoint: dict[str, Any] | None = None,
+        workflow_id: str | None = None,
+    ) -> dict[str, Any]:
+        """Run the order monitoring workflow, checkpointing each step as it finishes."""
+        deadline = Deadline.from_env()
+        workflow_results = await self._start_workflow(
+            'monitoring', monitoring_request, checkpoint, workflow_id
+        )
+        workflow_results['deadline_seconds'] = deadline.seconds
 
-        Yields:
-            A dictionary of monitoring results.
-        """
-        workflow_results = {
-            'workflow_id': str(uuid.uuid4()),
-            'workflow_type': 'monitoring',
-            'status': 'starting',
-            'steps': []
-        }
-        
-        try:
-            # Step 1: Order Monitoring
+        async def order_monitoring(step_deadline: Deadline) -> dict[str, Any]:
             print("Executing Order Monitoring")
-            monitoring_task = f"Monitor incoming emails for new purchase orders. {monitoring_request}"
-            monitoring_result = await self.send_message(
+            monitoring_task = f"Monitor incoming emails for new purchase orders. If there are none, reply with only {NO_NEW_ORDERS_MARKER}. {ORDER_LIST_INSTRUCTION} {monitoring_request}"
+            # A cached "no new orders" answer would hide orders that arrived since
+            monitoring_result = await self._delegate(
                 "Order Intelligence Agent",
                 monitoring_task,
-                tool_context
+                tool_context,
+                deadline=step_deadline,
+                use_cache=False,
             )
-            workflow_results['steps'].append({
+            return {
                 'step': 1,
                 'agent': 'Order Intelligence Agent',
                 'task': monitoring_task,
                 'result': monitoring_result,
+                'output': extract_task_output(monitoring_result),
                 'type': 'monitoring'
-            })
+            }
+
+        async def order_processing(step_deadline: Deadline) -> dict[str, Any]:
+            if orders:
+                step = await self._run_production_fanout(
+                    2,
+                    orders,
+                    monitoring_request,
+                    tool_context,
+                    step_deadline,
+                    workflow_results['workflow_id'],
+                )
+                step['type'] = 'processing'
+                return step
+            print("Processing found orders through production management")
+            monitoring_context = format_handoff('Monitoring results', monitoring_step['output'])
+            production_task = f"Process any new orders found during monitoring.\n{monitoring_context}"
+            production_tokens = handoff_token_counts(str(monitoring_step['result']), monitoring_context)
+            print(f"Step 2 context tokens: {production_tokens['before']} -> {production_tokens['after']}")
+            production_result = await self._delegate(
+                "Production Queue Management Agent",
+                production_task,
+                tool_context,
+                deadline=step_deadline
+            )
+            return {
+                'step': 2,
+                'agent': 'Production Queue Management Agent',
+                'task': production_task,
+                'result': production_result,
+                'output': extract_task_output(production_result),
+                'context_tokens': production_tokens,
+                'type': 'processing'
+            }
+        
+        try:
+            # Step 1: Order Monitoring
+            monitoring_step = await self._run_checkpointed_step(
+                workflow_results, checkpoint, 1, 2, deadline, order_monitoring
+            )
+            orders = split_orders(monitoring_step['result'])
+            if orders:
+                # Orders surfaced again by a repeated email are not new
+                orders_found = not all(
+                    self.processed_orders.is_duplicate(order) for order in orders
+                )
+            else:
+                orders_found = has_new_orders(monitoring_step['output'])
+            workflow_results['orders_found'] = orders_found
 
             # Step 2: Process any found orders through production management
-            if monitoring_result and not (isinstance(monitoring_result, dict) and monitoring_result.get('error')):
-                print("Processing found orders through production management")
-                production_task = f"Process any new orders found during monitoring: {monitoring_result}"
-                production_result = await self.send_message(
-                    "Production Queue Management Agent",
-                    production_task,
-                    tool_context
+            if orders_found:
+                processing_step = await self._run_checkpointed_step(
+                    workflow_results, checkpoint, 2, 2, deadline, order_processing
                 )
-                workflow_results['steps'].append({
-                    'step': 2,
-                    'agent': 'Production Queue Management Agent',
-                    'task': production_task,
-                    'result': production_result,
-                    'type': 'processing'
-                })
-
+                if processing_step.get('status') == 'partial':
+                    workflow_results['summary'] = f"Order monitoring workflow completed, but {processing_step['failed_orders']} orders could not be recorded. Resume the workflow to retry them."
+                else:
+                    workflow_results['summary'] = 'Order monitoring workflow completed successfully'
+            else:
+                workflow_results['summary'] = 'Order monitoring workflow completed; no new orders found'
             workflow_results['status'] = 'completed'
-            workflow_results['summary'] = 'Order monitoring workflow completed successfully'
 
         except Exception as e:
             print(f"Order monitoring workflow execution failed: {e}")
             workflow_results['status'] = 'failed'
             workflow_results['error'] = str(e)
 
+        if self.result_cache.agents:
+            workflow_results['result_cache'] = self.result_cache.stats()
+        workflow_results['single_flight'] = self.in_flight.stats()
+        await self.workflow_store.finish(
+            workflow_results['workflow_id'],
+            workflow_results['status'],
+            workflow_results.get('summary') or workflow_results.get('error'),
+        )
         return workflow_results
 
 
-def _get_initialized_supplier_orchestrator_sync() -> Agent:
-    """Synchronously creates and initializes the SupplierOrchestratorAgent."""
+def _agent_urls(env_var: str, default: str) -> list[str]:
+    """Read a comma-separated list of replica URLs for one remote agent."""
+    return [url.strip() for url in os.getenv(env_var, default).split(',') if url.strip()]
 
-    async def _async_main() -> Agent:
-        supplier_orchestrator_instance = await SupplierOrchestratorAgent.create(
-            remote_agent_addresses=[
-                os.getenv('ORDER_INTELLIGENCE_AGENT_URL', 'http://localhost:8004'),
-                os.getenv('PRODUCTION_QUEUE_AGENT_URL', 'http://localhost:8005'),
-            ]
-        )
-        return supplier_orchestrator_instance.create_agent()
 
+_supplier_orchestrator: SupplierOrchestratorAgent | None = None
+_root_agent: Agent | None = None
+_init_lock = asyncio.Lock()
+
+
+async def get_supplier_orchestrator() -> SupplierOrchestratorAgent:
+    """Return the process-wide SupplierOrchestratorAgent, creating it on first use."""
+    global _supplier_orchestrator
+    async with _init_lock:
+        if _supplier_orchestrator is None:
+            _supplier_orchestrator = await SupplierOrchestratorAgent.create(
+                remote_agent_addresses=[
+                    *_agent_urls('ORDER_INTELLIGENCE_AGENT_URL', 'http://localhost:8004'),
+                    *_agent_urls('PRODUCTION_QUEUE_AGENT_URL', 'http://localhost:8005'),
+                ],
+                # Remote task updates reach the executor streaming the request
+                task_callback=forward_remote_update,
+            )
+    return _supplier_orchestrator
+
+
+async def create_root_agent() -> Agent:
+    """Create the root agent inside the caller's event loop.
+
+    Servers should await this instead of importing ``root_agent``, which would
+    have to spin up its own event loop.
+    """
+    global _root_agent
+    if _root_agent is None:
+        _root_agent = (await get_supplier_orchestrator()).create_agent()
+    return _root_agent
+
+
+def _get_initialized_supplier_orchestrator_sync() -> Agent:
+    """Synchronously creates and initializes the SupplierOrchestratorAgent."""
     try:
-        return asyncio.run(_async_main())
+        return asyncio.run(create_root_agent())
     except RuntimeError as e:
         if 'asyncio.run() cannot be called from a running event loop' in str(e):
             print(
                 f'Warning: Could not initialize SupplierOrchestratorAgent with asyncio.run(): {e}. '
                 'This can happen if an event loop is already running (e.g., in Jupyter). '
-                'Consider initializing SupplierOrchestratorAgent within an async function in your application.'
+                'Use `await create_root_agent()` within an async function in your application instead.'
             )
         raise
 
 
-root_agent = _get_initialized_supplier_orchestrator_sync()
+def __getattr__(name: str):
+    # root_agent is built on first access so importing this module stays free
+    # of network I/O.
+    if name == 'root_agent':
+        return _root_agent or _get_initialized_supplier_orchestrator_sync()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
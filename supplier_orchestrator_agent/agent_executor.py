@@ -1,142 +1,572 @@
-from collections.abc import AsyncGenerator
+import asyncio
 import logging
+import os
+import statistics
+import time
 
-from google.adk import Runner
-from google.adk.events import Event
-from google.genai import types
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any
 
-from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.agent_execution import AgentExecutor
+from a2a.server.agent_execution.context import RequestContext
 from a2a.server.events.event_queue import EventQueue
 from a2a.server.tasks import TaskUpdater
 from a2a.types import (
     AgentCard,
+    DataPart,
     FilePart,
     FileWithBytes,
     FileWithUri,
     Part,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskNotCancelableError,
     TaskState,
+    TaskStatusUpdateEvent,
     TextPart,
-    UnsupportedOperationError,
 )
 from a2a.utils.errors import ServerError
+from google.adk import Runner
+from google.genai import types
+from remote_progress import remote_update_listener
+from workflow_jobs import WorkflowJobManager, json_safe
+from workflow_progress import step_listener
+
+
+if TYPE_CHECKING:
+    from google.adk.sessions.session import Session
 
 
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+# Constants
+DEFAULT_USER_ID = 'self'
+# Message metadata key carrying the absolute deadline (Unix time in seconds)
+# set by the calling client.
+DEADLINE_METADATA_KEY = 'deadline'
+# Longest wait for a canceled run to stop before reporting it canceled
+CANCEL_WAIT_SECONDS = 10.0
+# States a task can no longer be canceled in
+FINISHED_TASK_STATES = (
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+)
 
 
 class ADKAgentExecutor(AgentExecutor):
-    """An AgentExecutor that runs an ADK supplier orchestrator agent."""
+    """An AgentExecutor that runs the ADK supplier orchestrator agent.
+
+    Besides the agent's own responses, every supplier workflow step the
+    agent runs is streamed as it happens: a working status update when the
+    step starts, and an artifact with the step's output when it finishes.
+    Status messages and artifacts of the remote agent tasks behind each step
+    are streamed as they arrive.
+    Sessions of the most recent ``max_sessions`` contexts are kept; older
+    ones are removed from the session service. Canceling a task that is a
+    workflow job of ``jobs`` cancels the job.
+    """
 
-    def __init__(self, runner: Runner, card: AgentCard):
+    def __init__(
+        self,
+        runner: Runner,
+        card: AgentCard,
+        max_sessions: int | None = None,
+        jobs: WorkflowJobManager | None = None,
+    ):
         self.runner = runner
         self._card = card
-        self._running_sessions = {}
-
-    def _run_agent(
-        self, session_id, new_message: types.Content
-    ) -> AsyncGenerator[Event, None]:
-        return self.runner.run_async(
-            session_id=session_id, user_id="self", new_message=new_message
+        self.jobs = jobs
+        self.max_sessions = max_sessions or int(os.getenv('SESSION_CACHE_SIZE', '1000'))
+        self._sessions: OrderedDict[str, 'Session'] = OrderedDict()
+        # Track active sessions for potential cancellation
+        self._active_sessions: set[str] = set()
+        # asyncio task running each task ID, so it can be canceled
+        self._running: dict[str, asyncio.Task] = {}
+        self.tasks_canceled = 0
+        # Seconds from receiving a request to its first progress event
+        self._first_event_seconds: deque[float] = deque(maxlen=200)
+        self.status_coalesce_seconds = float(
+            os.getenv('STATUS_UPDATE_COALESCE_SECONDS', '0.25')
         )
+        self.status_coalesce_max_chars = int(
+            os.getenv('STATUS_UPDATE_COALESCE_MAX_CHARS', '4000')
+        )
+        self.status_events_received = 0
+        self.status_updates_emitted = 0
 
     async def _process_request(
         self,
         new_message: types.Content,
         session_id: str,
         task_updater: TaskUpdater,
+        progress: '_Progress',
     ) -> None:
-        session = await self._upsert_session(
-            session_id,
-        )
+        session_obj = await self._upsert_session(session_id)
+        # Update session_id with the ID from the resolved session object.
+        # (it may be the same as the one passed in if it already exists)
+        session_id = session_obj.id
 
-        logger.info(f"Running supplier orchestrator agent for session {session_id}")
+        # Track this session as active
+        self._active_sessions.add(session_id)
+        status_updates = StatusUpdateCoalescer(
+            task_updater,
+            self.status_coalesce_seconds,
+            self.status_coalesce_max_chars,
+        )
+        # Updates of the remote agent tasks this request delegates to
+        remote_updates = RemoteUpdateForwarder(task_updater, status_updates, progress.event)
+        listener_token = remote_update_listener.set(remote_updates)
 
-        async for event in self._run_agent(session_id, new_message):
-            if event.agent_turn_started:
-                await task_updater.update_task(
-                    state=TaskState.IN_PROGRESS,
-                )
-            elif event.agent_content_delta:
-                await task_updater.add_content_delta(event.agent_content_delta)
-            elif event.agent_turn_finished:
-                await task_updater.update_task(
-                    state=TaskState.COMPLETE,
-                )
-            elif event.error:
-                logger.error(f"Error in supplier orchestrator agent: {event.error}")
-                await task_updater.update_task(
-                    state=TaskState.FAILED,
-                    result="Agent execution failed",
+        try:
+            # Closing the run when the loop ends, or when the task is
+            # canceled, stops the agent and abandons its pending tool calls
+            async with aclosing(
+                self.runner.run_async(
+                    session_id=session_id,
+                    user_id=DEFAULT_USER_ID,
+                    new_message=new_message,
                 )
+            ) as events:
+                async for event in events:
+                    if event.is_final_response():
+                        parts = [
+                            convert_genai_part_to_a2a(part)
+                            for part in event.content.parts
+                            if (part.text or part.file_data or part.inline_data)
+                        ]
+                        logger.debug('Yielding final response: %s', parts)
+                        progress.event()
+                        remote_updates.close()
+                        await status_updates.flush()
+                        await task_updater.add_artifact(parts)
+                        await task_updater.update_status(
+                            TaskState.completed, final=True
+                        )
+                        break
+                    parts = [
+                        convert_genai_part_to_a2a(part)
+                        for part in (event.content.parts if event.content else None) or []
+                        if (part.text or part.file_data or part.inline_data)
+                    ]
+                    if parts and not event.get_function_calls():
+                        logger.debug('Yielding update response')
+                        progress.event()
+                        await status_updates.add(parts)
+                    else:
+                        logger.debug('Skipping event')
+        finally:
+            remote_update_listener.reset(listener_token)
+            remote_updates.close()
+            status_updates.close()
+            self.status_events_received += status_updates.received
+            self.status_updates_emitted += status_updates.emitted
+            # Remove from active sessions when done
+            self._active_sessions.discard(session_id)
+
+    async def execute(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+    ):
+        # Run the agent until either complete or the task is suspended.
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        progress = _Progress(self, updater, context.task_id)
+        # Immediately notify that the task is submitted.
+        if not context.current_task:
+            await updater.update_status(TaskState.submitted)
+        await updater.update_status(TaskState.working)
+        timeout = _deadline_timeout(context)
+        if timeout is not None and timeout <= 0:
+            await _fail_deadline_exceeded(updater)
+            return
+        # Workflow steps the agent runs for this request report to progress
+        listener_token = step_listener.set(progress.on_step)
+        self._running[context.task_id] = asyncio.current_task()
+        try:
+            await asyncio.wait_for(
+                self._process_request(
+                    types.UserContent(
+                        parts=[
+                            convert_a2a_part_to_genai(part)
+                            for part in context.message.parts
+                        ],
+                    ),
+                    context.context_id,
+                    updater,
+                    progress,
+                ),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f'Task {context.task_id} stopped at its caller\'s deadline'
+            )
+            await _fail_deadline_exceeded(updater)
+        finally:
+            self._running.pop(context.task_id, None)
+            progress.close()
+            step_listener.reset(listener_token)
+        logger.debug('[supplier_orchestrator] execute exiting')
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue):
+        """Cancel the execution for the given context.
+
+        A run in progress is stopped: its task is canceled, which closes the
+        ADK run and cancels the workflow steps and remote agent calls it is
+        waiting on. Background workflow jobs are canceled through the job
+        manager. The task is then reported as canceled.
+
+        Raises:
+            ServerError: If the task has already finished.
+        """
+        task = context.current_task
+        if task is not None and task.status.state in FINISHED_TASK_STATES:
+            raise ServerError(error=TaskNotCancelableError())
+        running = self._running.get(context.task_id)
+        if running is not None:
+            logger.info(
+                f'Cancelling active supplier orchestrator task: {context.task_id}'
+            )
+            running.cancel()
+            await asyncio.wait({running}, timeout=CANCEL_WAIT_SECONDS)
+        elif self.jobs is not None and await self.jobs.cancel(context.task_id):
+            logger.info(f'Canceled supplier workflow job: {context.task_id}')
+        else:
+            logger.debug(
+                f'Cancelling inactive supplier orchestrator task: {context.task_id}'
+            )
+        self.tasks_canceled += 1
+        await TaskUpdater(event_queue, context.task_id, context.context_id).cancel()
+
+    async def _upsert_session(self, session_id: str) -> 'Session':
+        """Return the session for session_id, creating it if needed.
+
+        Known sessions are answered from the cache without asking the session
+        service. Past max_sessions, the least recently used idle session is
+        dropped from the cache and deleted from the session service.
+        """
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+            return session
+        session = await self.runner.session_service.get_session(
+            app_name=self.runner.app_name,
+            user_id=DEFAULT_USER_ID,
+            session_id=session_id,
+        )
+        if session is None:
+            session = await self.runner.session_service.create_session(
+                app_name=self.runner.app_name,
+                user_id=DEFAULT_USER_ID,
+                session_id=session_id,
+            )
+        self._sessions[session_id] = session
+        for evicted_id in list(self._sessions):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            if evicted_id in self._active_sessions or evicted_id == session_id:
+                continue
+            del self._sessions[evicted_id]
+            await self.runner.session_service.delete_session(
+                app_name=self.runner.app_name,
+                user_id=DEFAULT_USER_ID,
+                session_id=evicted_id,
+            )
+        return session
+
+    def stats(self) -> dict[str, Any]:
+        """Cached sessions, time-to-first-event of recent requests, and
+        working-status events received from the agent versus updates sent, and
+        tasks canceled."""
+        samples = list(self._first_event_seconds)
+        return {
+            'cached_sessions': len(self._sessions),
+            'active_sessions': len(self._active_sessions),
+            'first_event_samples': len(samples),
+            'first_event_p50_seconds': statistics.median(samples) if samples else None,
+            'first_event_max_seconds': max(samples) if samples else None,
+            'status_events_received': self.status_events_received,
+            'status_updates_emitted': self.status_updates_emitted,
+            'tasks_canceled': self.tasks_canceled,
+        }
+
+
+class StatusUpdateCoalescer:
+    """Merges consecutive working-status updates of one task into fewer messages.
+
+    An update arriving ``window`` seconds or more after the last one sent is
+    sent at once. Updates arriving sooner are held and sent together, as one
+    message with all their parts, when the window ends or once they hold
+    ``max_chars`` characters of text. A window of 0 sends every update.
+    """
+
+    def __init__(self, updater: TaskUpdater, window: float, max_chars: int):
+        self._updater = updater
+        self.window = window
+        self.max_chars = max_chars
+        self.received = 0
+        self.emitted = 0
+        self._pending: list[Part] = []
+        self._pending_chars = 0
+        self._last_sent = float('-inf')
+        self._timer: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    async def add(self, parts: list[Part]) -> None:
+        """Send or hold the parts of one agent event."""
+        self.received += 1
+        if not parts:
+            return
+        self._pending.extend(parts)
+        self._pending_chars += sum(
+            len(root.text)
+            for root in (getattr(part, 'root', part) for part in parts)
+            if isinstance(root, TextPart)
+        )
+        wait = self._last_sent + self.window - time.monotonic()
+        if wait <= 0 or self._pending_chars >= self.max_chars:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later(wait))
+
+    async def flush(self) -> None:
+        """Send held updates now, such as before the final artifact."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._send()
 
-    async def _upsert_session(self, session_id: str):
-        """Create or retrieve a session for the supplier orchestrator agent."""
-        if session_id not in self._running_sessions:
-            self._running_sessions[session_id] = await self.runner.create_session(
-                session_id=session_id, user_id="self"
+    def close(self) -> None:
+        """Stop a pending delayed send once the task has ended."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer = None
+        await self._send()
+
+    async def _send(self) -> None:
+        async with self._lock:
+            if not self._pending:
+                return
+            parts, self._pending, self._pending_chars = self._pending, [], 0
+            self._last_sent = time.monotonic()
+            self.emitted += 1
+            await self._updater.update_status(
+                TaskState.working,
+                message=self._updater.new_agent_message(parts),
             )
-        return self._running_sessions[session_id]
 
-    async def execute_request(
-        self, request_context: RequestContext, task_updater: TaskUpdater
+
+class RemoteUpdateForwarder:
+    """Streams the updates of remote agent tasks as updates of one orchestrator task.
+
+    Status messages of a remote task are labeled with the agent's name and go
+    through the task's status coalescer; its artifacts are added to the task
+    under the agent's name. Updates are sent in the order they arrive, and
+    those arriving after the task ended are dropped.
+    """
+
+    def __init__(
+        self,
+        updater: TaskUpdater,
+        status_updates: StatusUpdateCoalescer,
+        on_forward: Callable[[], None] | None = None,
+    ):
+        self._updater = updater
+        self._status_updates = status_updates
+        self._on_forward = on_forward
+        self._lock = asyncio.Lock()
+        self._sends: set[asyncio.Task] = set()
+        self._closed = False
+        self.forwarded = 0
+
+    def __call__(
+        self,
+        event: Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent,
+        card: AgentCard,
     ) -> None:
-        """Execute a request for the supplier orchestrator agent."""
-        try:
-            parts = []
-            for part in request_context.request.content.parts:
-                if isinstance(part, TextPart):
-                    parts.append(types.Part.from_text(part.text))
-                elif isinstance(part, FilePart):
-                    if isinstance(part.file, FileWithBytes):
-                        # Handle file with bytes
-                        parts.append(
-                            types.Part.from_bytes(
-                                part.file.contents, mime_type=part.file.mime_type
-                            )
-                        )
-                    elif isinstance(part.file, FileWithUri):
-                        # Handle file with URI
-                        parts.append(
-                            types.Part.from_uri(
-                                part.file.uri, mime_type=part.file.mime_type
-                            )
-                        )
-                    else:
-                        logger.warning(f"Unsupported file type: {type(part.file)}")
-                else:
-                    logger.warning(f"Unsupported part type: {type(part)}")
+        if self._closed:
+            return
+        send = asyncio.create_task(self._send(event, card))
+        self._sends.add(send)
+        send.add_done_callback(self._sends.discard)
+
+    async def _send(
+        self,
+        event: Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent,
+        card: AgentCard,
+    ) -> None:
+        async with self._lock:
+            if self._closed:
+                return
+            if isinstance(event, TaskArtifactUpdateEvent):
+                if self._on_forward:
+                    self._on_forward()
+                await self._updater.add_artifact(
+                    event.artifact.parts,
+                    name=f'{card.name}: {event.artifact.name or "result"}',
+                )
+            else:
+                message = event.status.message
+                if not message or not message.parts:
+                    return
+                if self._on_forward:
+                    self._on_forward()
+                await self._status_updates.add(
+                    [Part(root=TextPart(text=f'[{card.name}]')), *message.parts]
+                )
+            self.forwarded += 1
+
+    def close(self) -> None:
+        """Drop updates still waiting to be sent once the task has ended."""
+        self._closed = True
+        for send in self._sends:
+            send.cancel()
+
+
+class _Progress:
+    """Streams the workflow steps of one request and times its first progress event."""
+
+    def __init__(self, executor: ADKAgentExecutor, updater: TaskUpdater, task_id: str):
+        self._executor = executor
+        self._updater = updater
+        self._task_id = task_id
+        self._started = time.perf_counter()
+        self._first_event_seen = False
+        self._closed = False
 
-            new_message = types.Content(parts=parts)
-            await self._process_request(
-                new_message, request_context.task.session_id, task_updater
+    def event(self) -> None:
+        """Record that a progress event is being sent."""
+        if self._first_event_seen:
+            return
+        self._first_event_seen = True
+        elapsed = time.perf_counter() - self._started
+        self._executor._first_event_seconds.append(elapsed)
+        logger.info(f'First progress event of task {self._task_id} after {elapsed:.3f}s')
+
+    async def on_step(self, event: str, step: dict[str, Any]) -> None:
+        # Workflow jobs keep running after the request that started them ended
+        if self._closed:
+            return
+        self.event()
+        if event == 'started':
+            await self._updater.update_status(
+                TaskState.working,
+                message=self._updater.new_agent_message(
+                    [Part(root=TextPart(text=f"Workflow step {step['step']} started"))]
+                ),
             )
+            return
+        await self._updater.add_artifact(
+            [
+                Part(
+                    root=DataPart(
+                        data=json_safe(
+                            {
+                                'workflow_id': step.get('workflow_id'),
+                                'step': step.get('step'),
+                                'agent': step.get('agent'),
+                                'status': step.get('status', 'completed'),
+                                'output': step.get('output'),
+                            }
+                        )
+                    )
+                )
+            ],
+            name=f"workflow_step_{step.get('step')}",
+        )
+
+    def close(self) -> None:
+        self._closed = True
+
+
+def _deadline_timeout(context: RequestContext) -> float | None:
+    """Seconds left until the deadline in the request's message metadata, if any."""
+    metadata = (context.message.metadata if context.message else None) or {}
+    try:
+        return float(metadata[DEADLINE_METADATA_KEY]) - time.time()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+async def _fail_deadline_exceeded(updater: TaskUpdater) -> None:
+    await updater.update_status(
+        TaskState.failed,
+        message=updater.new_agent_message(
+            [Part(root=TextPart(text='Deadline exceeded before the task completed'))]
+        ),
+        final=True,
+    )
+
+
+def convert_a2a_part_to_genai(part: Part) -> types.Part:
+    """Convert a single A2A Part type into a Google Gen AI Part type.
 
-        except Exception as e:
-            logger.error(f"Error executing supplier orchestrator agent request: {e}")
-            await task_updater.update_task(
-                state=TaskState.FAILED,
-                result=f"Failed to execute request: {str(e)}",
+    Args:
+        part: The A2A Part to convert
+
+    Returns:
+        The equivalent Google Gen AI Part
+
+    Raises:
+        ValueError: If the part type is not supported
+    """
+    part = part.root
+    if isinstance(part, TextPart):
+        return types.Part(text=part.text)
+    if isinstance(part, FilePart):
+        if isinstance(part.file, FileWithUri):
+            return types.Part(
+                file_data=types.FileData(
+                    file_uri=part.file.uri, mime_type=part.file.mime_type
+                )
+            )
+        if isinstance(part.file, FileWithBytes):
+            return types.Part(
+                inline_data=types.Blob(
+                    data=part.file.bytes, mime_type=part.file.mime_type
+                )
             )
+        raise ValueError(f'Unsupported file type: {type(part.file)}')
+    raise ValueError(f'Unsupported part type: {type(part)}')
 
-    def get_card(self) -> AgentCard:
-        """Return the agent card for the supplier orchestrator agent."""
-        return self._card
 
-    async def check_files_access(self, file_uris: list[str]) -> dict[str, bool]:
-        """Check if the agent can access the given files."""
-        # For now, assume all files are accessible
-        return {uri: True for uri in file_uris}
+def convert_genai_part_to_a2a(part: types.Part) -> Part:
+    """Convert a single Google Gen AI Part type into an A2A Part type.
 
-    async def cancel_request(self, session_id: str, task_id: str) -> None:
-        """Cancel a request for the supplier orchestrator agent."""
-        logger.info(f"Cancelling request for session {session_id}, task {task_id}")
-        # Implementation for cancelling requests
-        pass
+    Args:
+        part: The Google Gen AI Part to convert
 
-    async def execute(self, request_context: RequestContext, task_updater: TaskUpdater) -> None:
-        """Implements the abstract execute method."""
-        await self.execute_request(request_context, task_updater)
+    Returns:
+        The equivalent A2A Part
 
-    async def cancel(self, session_id: str, task_id: str) -> None:
-        """Implements the abstract cancel method."""
-        await self.cancel_request(session_id, task_id)
+    Raises:
+        ValueError: If the part type is not supported
+    """
+    if part.text:
+        return TextPart(text=part.text)
+    if part.file_data:
+        return FilePart(
+            file=FileWithUri(
+                uri=part.file_data.file_uri,
+                mime_type=part.file_data.mime_type,
+            )
+        )
+    if part.inline_data:
+        return Part(
+            root=FilePart(
+                file=FileWithBytes(
+                    bytes=part.inline_data.data,
+                    mime_type=part.inline_data.mime_type,
+                )
+            )
+        )
+    raise ValueError(f'Unsupported part type: {part}')
@@ -0,0 +1,65 @@
+"""
+Splitting of order intelligence results into individual orders for concurrent processing.
+"""
+
+import json
+import sys
+
+from typing import Any
+
+from a2a.types import Message, Task
+from workflow_handoff import extract_task_output
+
+
+# Appended to order intelligence tasks so the orders in the reply can be told apart.
+ORDER_LIST_INSTRUCTION = (
+    'List each order as a single-line JSON object, one order per line, with the keys '
+    'email_message_id (the Message-ID of the email it came in), po_number, customer, '
+    'items (with quantities) and delivery_date.'
+)
+
+
+def _orders_in_data(data: Any) -> list[Any]:
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        orders = data.get('orders')
+        if isinstance(orders, list):
+            return orders
+        return [data]
+    return []
+
+
+def split_orders(result: Task | Message | None) -> list[Any]:
+    """Return the individual orders in an order intelligence result.
+
+    Structured data parts are used when the agent returned any: a list of
+    orders, an object with an ``orders`` list, or one object per order.
+    Otherwise each line of the reply that holds a JSON object is one order.
+    The whole result is read rather than a capped handoff, so no order is
+    cut off. An empty list means the orders could not be told apart.
+    """
+    output = extract_task_output(result, max_chars=sys.maxsize)
+    orders = [order for data in output['data'] for order in _orders_in_data(data)]
+    if orders:
+        return orders
+    for line in output['text'].splitlines():
+        line = line.strip().rstrip(',')
+        if not line.startswith('{'):
+            continue
+        try:
+            order = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(order, dict):
+            orders.append(order)
+    return orders
+
+
+def order_label(order: Any, number: int) -> str:
+    """A short label for an order, preferring its PO number."""
+    if isinstance(order, dict):
+        for key in ('po_number', 'poNumber', 'PO number', 'po', 'order_id', 'id'):
+            if order.get(key):
+                return f'Order {order[key]}'
+    return f'Order {number}'
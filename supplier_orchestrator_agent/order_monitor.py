@@ -0,0 +1,120 @@
+"""
+Background monitoring of incoming orders on an adaptive polling interval.
+"""
+
+import asyncio
+import logging
+import os
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+# Reply the Order Intelligence Agent is asked to give when it finds no new orders.
+NO_NEW_ORDERS_MARKER = 'NO_NEW_ORDERS'
+
+
+def has_new_orders(output: dict[str, Any]) -> bool:
+    """Whether a monitoring step's handoff output reports any new orders.
+
+    Failed steps, empty replies and replies carrying the no-orders marker
+    count as no orders.
+    """
+    if output.get('state') not in (None, 'completed'):
+        return False
+    if output.get('data'):
+        return True
+    text = (output.get('text') or '').strip()
+    return bool(text) and NO_NEW_ORDERS_MARKER not in text
+
+
+class OrderMonitor:
+    """Runs a monitoring cycle repeatedly, polling more often while orders arrive.
+
+    ``run_cycle`` checks for new orders once and returns whether it found
+    any. After a cycle that found orders the next one starts
+    ``min_interval`` seconds later. Each cycle without orders, or that
+    failed, waits the current interval and then multiplies it by
+    ``backoff_factor``, up to ``max_interval``.
+    """
+
+    def __init__(
+        self,
+        run_cycle: Callable[[], Awaitable[bool]],
+        *,
+        min_interval: float = 30.0,
+        max_interval: float = 600.0,
+        backoff_factor: float = 2.0,
+    ):
+        self.run_cycle = run_cycle
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff_factor = max(backoff_factor, 1.0)
+        self.interval = min_interval
+        self.cycles = 0
+        self.cycles_with_orders = 0
+        self.failed_cycles = 0
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(
+        cls, run_cycle: Callable[[], Awaitable[bool]]
+    ) -> 'OrderMonitor | None':
+        """Build a monitor from ``ORDER_MONITOR_*`` environment variables, or None if disabled."""
+        if os.getenv('ORDER_MONITOR_ENABLED', 'false').lower() != 'true':
+            return None
+        return cls(
+            run_cycle,
+            min_interval=float(os.getenv('ORDER_MONITOR_MIN_INTERVAL', '30')),
+            max_interval=float(os.getenv('ORDER_MONITOR_MAX_INTERVAL', '600')),
+            backoff_factor=float(os.getenv('ORDER_MONITOR_BACKOFF_FACTOR', '2')),
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring in the background of the running event loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop monitoring, cancelling a cycle that is in progress."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            self.cycles += 1
+            try:
+                found = await self.run_cycle()
+            except Exception as e:
+                logger.warning(f'Order monitoring cycle failed: {e}')
+                self.failed_cycles += 1
+                found = False
+            if found:
+                self.cycles_with_orders += 1
+                self.interval = self.min_interval
+            await asyncio.sleep(self.interval)
+            if not found:
+                self.interval = min(
+                    self.interval * self.backoff_factor, self.max_interval
+                )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'running': self.running,
+            'cycles': self.cycles,
+            'cycles_with_orders': self.cycles_with_orders,
+            'failed_cycles': self.failed_cycles,
+            'interval_seconds': self.interval,
+        }
@@ -0,0 +1,161 @@
+"""
+Index of orders already recorded in the production queue, so repeated order emails are dropped.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+
+from contextlib import closing
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+_MESSAGE_ID_FIELDS = ('email_message_id', 'message_id', 'messageId')
+_PO_NUMBER_FIELDS = ('po_number', 'poNumber', 'PO number', 'po')
+
+
+def _first(order: dict[str, Any], fields: tuple[str, ...]) -> str:
+    for field in fields:
+        value = order.get(field)
+        if value:
+            return str(value)
+    return ''
+
+
+def order_keys(order: Any) -> list[str]:
+    """The dedup keys of an order: its email message ID and its PO number.
+
+    An order matching a recorded order on either key is a duplicate. This
+    is intended: a PO number identifies one customer order, so a new email
+    carrying a PO number already recorded is a resend of that order, not a
+    new one. Orders without either key, such as free text, are never
+    treated as duplicates.
+    """
+    if not isinstance(order, dict):
+        return []
+    keys = []
+    message_id = _first(order, _MESSAGE_ID_FIELDS).strip().strip('<>')
+    if message_id:
+        keys.append(f'message:{message_id}')
+    po_number = ''.join(_first(order, _PO_NUMBER_FIELDS).split()).upper()
+    if po_number:
+        keys.append(f'po:{po_number}')
+    return keys
+
+
+class ProcessedOrderIndex:
+    """Email message IDs and PO numbers of orders already recorded.
+
+    The SQLite store is loaded into memory when the index is created, and
+    lookups are answered from memory only, so checking an order never waits
+    on disk. Orders recorded by another process after that are not seen.
+    Recorded orders are written to the store from a worker thread. Orders
+    being recorded are claimed in memory, so concurrent workflows in this
+    process do not record the same order twice; a claim is released if
+    recording fails. Keys older than ``retention`` seconds are forgotten.
+    Storage errors are logged rather than raised.
+    """
+
+    def __init__(self, path: str, retention: float = 30 * 24 * 3600.0):
+        self.path = path
+        self.retention = retention
+        self.duplicates = 0
+        self._processed: dict[str, float] = {}
+        self._claimed: set[str] = set()
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with self._connect() as conn, conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS processed_orders ('
+                    'key TEXT PRIMARY KEY, workflow_id TEXT, recorded_at REAL NOT NULL)'
+                )
+                conn.execute(
+                    'DELETE FROM processed_orders WHERE recorded_at < ?',
+                    (time.time() - retention,),
+                )
+                self._processed = dict(
+                    conn.execute('SELECT key, recorded_at FROM processed_orders')
+                )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f'Could not open processed order index {path}: {e}')
+
+    @classmethod
+    def from_env(cls, name: str) -> 'ProcessedOrderIndex':
+        """Build an index configured from ``PROCESSED_ORDER_*`` environment variables."""
+        default_path = os.path.join(
+            os.path.expanduser('~'),
+            '.cache',
+            'a2a_adk_agents',
+            f'{name}_processed_orders.sqlite3',
+        )
+        return cls(
+            path=os.getenv('PROCESSED_ORDER_STORE_PATH', default_path),
+            retention=float(
+                os.getenv('PROCESSED_ORDER_RETENTION', str(30 * 24 * 3600))
+            ),
+        )
+
+    def _connect(self) -> 'closing[sqlite3.Connection]':
+        return closing(sqlite3.connect(self.path, timeout=10))
+
+    def _is_processed(self, key: str) -> bool:
+        recorded_at = self._processed.get(key)
+        return recorded_at is not None and time.time() - recorded_at < self.retention
+
+    def is_duplicate(self, order: Any) -> bool:
+        """Whether order was already recorded or is being recorded right now."""
+        return any(
+            key in self._claimed or self._is_processed(key)
+            for key in order_keys(order)
+        )
+
+    def claim_new(self, orders: list[Any]) -> tuple[list[Any], list[Any]]:
+        """Split orders into new ones, which are claimed for recording, and duplicates.
+
+        Repeats of an order within orders are duplicates too.
+        """
+        new, duplicates = [], []
+        for order in orders:
+            if self.is_duplicate(order):
+                duplicates.append(order)
+                continue
+            self._claimed.update(order_keys(order))
+            new.append(order)
+        self.duplicates += len(duplicates)
+        return new, duplicates
+
+    def release(self, order: Any) -> None:
+        """Give up the claim on an order that could not be recorded."""
+        self._claimed.difference_update(order_keys(order))
+
+    async def mark_processed(self, order: Any, workflow_id: str | None = None) -> None:
+        """Remember that order has been recorded."""
+        keys = order_keys(order)
+        if not keys:
+            return
+        now = time.time()
+        for key in keys:
+            self._processed[key] = now
+        self._claimed.difference_update(keys)
+        await asyncio.to_thread(self._persist, keys, workflow_id, now)
+
+    def _persist(self, keys: list[str], workflow_id: str | None, recorded_at: float) -> None:
+        try:
+            with self._connect() as conn, conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO processed_orders VALUES (?, ?, ?)',
+                    [(key, workflow_id, recorded_at) for key in keys],
+                )
+        except sqlite3.Error as e:
+            logger.warning(f'Could not persist processed order {keys}: {e}')
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'processed_keys': len(self._processed),
+            'claimed_keys': len(self._claimed),
+            'duplicates_dropped': self.duplicates,
+        }
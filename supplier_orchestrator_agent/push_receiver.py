@@ -0,0 +1,197 @@
+"""
+Webhook receiver for A2A push notifications sent to the supplier orchestrator.
+"""
+
+import asyncio
+import logging
+import os
+import secrets
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+import uvicorn
+
+from a2a.types import PushNotificationConfig, Task, TaskState
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = 'X-A2A-Notification-Token'
+# States after which a remote task needs nothing more from the agent, so a
+# workflow waiting on it can go on.
+STOP_WAITING_STATES = frozenset(
+    {
+        TaskState.completed,
+        TaskState.failed,
+        TaskState.canceled,
+        TaskState.rejected,
+        TaskState.input_required,
+        TaskState.auth_required,
+    }
+)
+
+
+def _stopped(task: Task | None) -> bool:
+    return task is not None and task.status.state in STOP_WAITING_STATES
+
+
+class PushNotificationReceiver:
+    """Receives remote task updates and wakes the workflows waiting on them.
+
+    Remote agents POST the Task to ``webhook_url`` whenever its state
+    changes, with ``token`` in the ``X-A2A-Notification-Token`` header.
+    The receiver is served either as a route of the orchestrator's own A2A
+    app or, via ``start``, as a standalone server. A waiting workflow
+    polls the task every ``poll_interval`` seconds only in case a
+    notification was lost.
+    """
+
+    def __init__(
+        self,
+        webhook_url: str,
+        token: str | None = None,
+        *,
+        path: str = '/a2a/push',
+        poll_interval: float = 30.0,
+        max_cached_tasks: int = 1000,
+    ):
+        self.webhook_url = webhook_url
+        self.token = token or secrets.token_urlsafe(24)
+        self.path = path
+        self.poll_interval = poll_interval
+        self.max_cached_tasks = max_cached_tasks
+        self.received = 0
+        self.rejected = 0
+        self.fallback_polls = 0
+        self._tasks: OrderedDict[str, Task] = OrderedDict()
+        self._waiters: dict[str, asyncio.Future] = {}
+        self._listeners: dict[str, Callable[[Task], None]] = {}
+        self._server: uvicorn.Server | None = None
+        self._server_task: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(cls, base_url: str) -> 'PushNotificationReceiver | None':
+        """Build a receiver from ``A2A_PUSH_*`` environment variables, or None if disabled.
+
+        The webhook is served under base_url unless A2A_PUSH_WEBHOOK_URL names
+        another address remote agents should use to reach it.
+        """
+        if os.getenv('A2A_PUSH_NOTIFICATIONS', 'false').lower() != 'true':
+            return None
+        path = '/a2a/push'
+        return cls(
+            webhook_url=os.getenv('A2A_PUSH_WEBHOOK_URL')
+            or f'{base_url.rstrip("/")}{path}',
+            token=os.getenv('A2A_PUSH_TOKEN'),
+            path=path,
+            poll_interval=float(os.getenv('A2A_PUSH_FALLBACK_POLL_SECONDS', '30')),
+        )
+
+    def push_config(self) -> PushNotificationConfig:
+        """The push notification config to send along with a message."""
+        return PushNotificationConfig(url=self.webhook_url, token=self.token)
+
+    def routes(self) -> list[Route]:
+        """Routes to add to an existing Starlette or FastAPI app."""
+        return [Route(self.path, self.handle, methods=['POST'])]
+
+    async def handle(self, request: Request) -> Response:
+        """Accept one pushed Task."""
+        if not secrets.compare_digest(
+            request.headers.get(TOKEN_HEADER, ''), self.token
+        ):
+            self.rejected += 1
+            return Response(status_code=401)
+        try:
+            task = Task.model_validate(await request.json())
+        except ValueError as e:
+            logger.warning(f'Ignoring malformed push notification: {e}')
+            return Response(status_code=400)
+        self.received += 1
+        self._record(task)
+        return Response(status_code=204)
+
+    def _record(self, task: Task) -> None:
+        self._tasks[task.id] = task
+        self._tasks.move_to_end(task.id)
+        while len(self._tasks) > self.max_cached_tasks:
+            self._tasks.popitem(last=False)
+        listener = self._listeners.get(task.id)
+        if listener:
+            listener(task)
+        waiter = self._waiters.get(task.id)
+        if waiter and not waiter.done() and _stopped(task):
+            waiter.set_result(task)
+
+    async def wait_for_task(
+        self,
+        task: Task,
+        poll: Callable[[], Awaitable[Task | None]],
+        on_update: Callable[[Task], None] | None = None,
+    ) -> Task:
+        """Wait until pushed updates show task completed, failed or needing input.
+
+        on_update is called with each update pushed meanwhile. poll fetches the
+        task from the agent; it is only used when no final update has arrived
+        for ``poll_interval`` seconds.
+        """
+        if _stopped(task):
+            return task
+        pushed = self._tasks.pop(task.id, None)
+        if _stopped(pushed):
+            return pushed
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[task.id] = waiter
+        if on_update:
+            self._listeners[task.id] = on_update
+        try:
+            while True:
+                try:
+                    return await asyncio.wait_for(
+                        asyncio.shield(waiter), self.poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    self.fallback_polls += 1
+                    polled = await poll()
+                    if _stopped(polled):
+                        return polled
+        finally:
+            self._waiters.pop(task.id, None)
+            self._listeners.pop(task.id, None)
+            self._tasks.pop(task.id, None)
+
+    async def start(self, host: str, port: int) -> None:
+        """Serve the webhook on its own server, for processes without an A2A app."""
+        app = Starlette(routes=self.routes())
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, host=host, port=port, log_level='warning')
+        )
+        self._server_task = asyncio.create_task(self._server.serve())
+        while not self._server.started:
+            if self._server_task.done():
+                self._server_task.result()
+                raise RuntimeError(f'Push notification receiver failed to start on {host}:{port}')
+            await asyncio.sleep(0.05)
+        print(f'Push notification receiver listening on {host}:{port}{self.path}')
+
+    async def stop(self) -> None:
+        """Stop the standalone server started by ``start``."""
+        if self._server and self._server_task:
+            self._server.should_exit = True
+            await self._server_task
+        self._server = None
+        self._server_task = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'received': self.received,
+            'rejected': self.rejected,
+            'fallback_polls': self.fallback_polls,
+            'waiting': len(self._waiters),
+        }
@@ -2,17 +2,46 @@
 Remote agent connection management for the supplier orchestrator.
 """
 
-from collections.abc import Callable
+import asyncio
+import logging
+import math
+import os
+import time
+import uuid
+
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit
 
 import httpx
 
-from a2a.client import A2AClient
+from a2a.client import (
+    A2ACardResolver,
+    A2AClient,
+    A2AClientHTTPError,
+    A2AClientTimeoutError,
+)
+from a2a.client.errors import A2AClientJSONRPCError
+from circuit_breaker import CircuitBreaker, CircuitOpenError
 from a2a.types import (
     AgentCard,
+    CancelTaskRequest,
+    CancelTaskSuccessResponse,
+    GetTaskRequest,
+    GetTaskSuccessResponse,
+    JSONRPCErrorResponse,
+    Message,
     SendMessageRequest,
     SendMessageResponse,
+    SendStreamingMessageRequest,
     Task,
     TaskArtifactUpdateEvent,
+    TaskIdParams,
+    TaskQueryParams,
+    TaskState,
+    TaskStatus,
     TaskStatusUpdateEvent,
 )
 from dotenv import load_dotenv
@@ -20,26 +49,751 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 
+# Absolute time (Unix seconds) the caller stops waiting for the current call,
+# set by the orchestrator around each deadline-bound delegation.
+call_deadline: ContextVar[float | None] = ContextVar('call_deadline', default=None)
+# A call cancelled this close to its deadline was cut off by the deadline.
+DEADLINE_SLACK_SECONDS = 0.1
+
+# Agents whose calls write state (purchase orders, PO records). A duplicate
+# request could write twice, so they are never hedged, whatever HEDGED_AGENTS
+# says, and only retried when the request never reached them.
+NON_IDEMPOTENT_AGENTS = frozenset(
+    {'Purchase Order Agent', 'Production Queue Management Agent'}
+)
+
+# States in which a remote task is done and needs no cancellation
+_FINISHED_TASK_STATES = frozenset(
+    {TaskState.completed, TaskState.canceled, TaskState.failed, TaskState.rejected}
+)
+
+
+class AgentOverloadedError(Exception):
+    """Raised when an agent turned a request away because it is at capacity.
+
+    The agent did not start on the request, so it is safe to retry.
+    """
+
+    def __init__(self, agent_name: str, message: str):
+        super().__init__(f'{agent_name} is at capacity: {message}')
+        self.agent_name = agent_name
+
+
+def raise_if_overloaded(agent_name: str, failure: object) -> None:
+    """Raise AgentOverloadedError if failure carries a JSON-RPC error the agent marked retryable.
+
+    failure is a response, or a client error raised for an error response;
+    anything else is ignored.
+    """
+    error = getattr(failure, 'error', None)
+    data = getattr(error, 'data', None)
+    if isinstance(data, dict) and data.get('retryable'):
+        raise AgentOverloadedError(agent_name, error.message)
+
+
+def _hedged_agent_names() -> set[str]:
+    return {
+        name.strip()
+        for name in os.getenv('HEDGED_AGENTS', '').split(',')
+        if name.strip()
+    }
+
+
+def apply_task_event(task: Task | None, event: TaskCallbackArg) -> Task:
+    """Fold a streamed Task or task update event into the Task seen so far."""
+    if isinstance(event, Task):
+        return event
+    if task is None:
+        task = Task(
+            id=event.task_id,
+            context_id=event.context_id,
+            status=TaskStatus(state=TaskState.working),
+        )
+    if isinstance(event, TaskStatusUpdateEvent):
+        task.status = event.status
+        return task
+    artifacts = task.artifacts or []
+    for index, artifact in enumerate(artifacts):
+        if artifact.artifact_id == event.artifact.artifact_id:
+            if event.append:
+                artifact.parts.extend(event.artifact.parts)
+            else:
+                artifacts[index] = event.artifact
+            break
+    else:
+        artifacts.append(event.artifact)
+    task.artifacts = artifacts
+    return task
+
+
+def _http2_available() -> bool:
+    """Return True when the optional ``h2`` package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class SharedHttpTransport:
+    """A process-wide pooled httpx client shared by every remote agent connection.
+
+    Card resolution and every A2A call go through the same ``httpx.AsyncClient``
+    so connections are kept alive and reused instead of being opened per agent.
+    HTTP/2 is used when ``h2`` is installed, letting concurrent requests to one
+    agent multiplex over a single connection. httpx only limits the pool as a
+    whole, so a per-host semaphore caps how many requests may target one agent
+    at a time; waiting on it is what the saturation metrics report.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        max_connections_per_host: int = 20,
+        http2: bool = True,
+    ):
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_connections_per_host = max_connections_per_host
+        self.http2 = http2 and _http2_available()
+        if http2 and not self.http2:
+            logger.warning(
+                'HTTP/2 requested but the h2 package is not installed; '
+                'falling back to HTTP/1.1 keep-alive connections.'
+            )
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._host_stats: dict[str, dict[str, float]] = {}
+        self._closing: set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls) -> 'SharedHttpTransport':
+        """Build a transport configured from ``A2A_HTTP_*`` environment variables."""
+        return cls(
+            timeout=float(os.getenv('A2A_HTTP_TIMEOUT', '30')),
+            max_connections=int(os.getenv('A2A_HTTP_MAX_CONNECTIONS', '100')),
+            max_keepalive_connections=int(
+                os.getenv('A2A_HTTP_MAX_KEEPALIVE_CONNECTIONS', '20')
+            ),
+            keepalive_expiry=float(os.getenv('A2A_HTTP_KEEPALIVE_EXPIRY', '30')),
+            max_connections_per_host=int(
+                os.getenv('A2A_HTTP_MAX_CONNECTIONS_PER_HOST', '20')
+            ),
+            http2=os.getenv('A2A_HTTP2', 'true').lower() == 'true',
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client for the running event loop.
+
+        Pooled connections belong to the loop that opened them, so a new client
+        (and new per-host slots) is created when the loop changes, e.g. after
+        cards were resolved under ``asyncio.run`` and the server starts its own
+        loop. The replaced client is closed in the background.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                self._close_stale_client(self._client, self._loop)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits, http2=self.http2
+            )
+            self._loop = loop
+            self._host_slots.clear()
+        return self._client
+
+    def _close_stale_client(
+        self, client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None
+    ) -> None:
+        """Close a client of an earlier loop on that loop, or here once it has stopped."""
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+
+        async def close() -> None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f'Could not close the pooled client of a stopped loop: {e}')
+
+        closing = asyncio.get_running_loop().create_task(close())
+        self._closing.add(closing)
+        closing.add_done_callback(self._closing.discard)
+
+    @asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncIterator[None]:
+        """Hold one of the per-host request slots for ``url`` while the body runs."""
+        host = urlsplit(url).netloc or url
+        # Make sure the slots belong to the running loop before using them.
+        _ = self.client
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(
+                self.max_connections_per_host
+            )
+        stats = self._host_stats.setdefault(
+            host,
+            {
+                'requests': 0,
+                'in_flight': 0,
+                'peak_in_flight': 0,
+                'saturated_waits': 0,
+                'wait_seconds': 0.0,
+            },
+        )
+        if slot.locked():
+            stats['saturated_waits'] += 1
+            logger.warning(
+                f'Connection pool saturated for {host}: '
+                f'{self.max_connections_per_host} requests already in flight'
+            )
+        started = time.perf_counter()
+        async with slot:
+            stats['wait_seconds'] += time.perf_counter() - started
+            stats['requests'] += 1
+            stats['in_flight'] += 1
+            stats['peak_in_flight'] = max(
+                stats['peak_in_flight'], stats['in_flight']
+            )
+            try:
+                yield
+            finally:
+                stats['in_flight'] -= 1
+
+    def metrics(self) -> dict[str, object]:
+        """Return pool configuration and per-host saturation counters."""
+        in_flight = sum(s['in_flight'] for s in self._host_stats.values())
+        return {
+            'http2': self.http2,
+            'max_connections': self.limits.max_connections,
+            'max_keepalive_connections': self.limits.max_keepalive_connections,
+            'max_connections_per_host': self.max_connections_per_host,
+            'in_flight': in_flight,
+            'pool_utilization': in_flight / self.limits.max_connections
+            if self.limits.max_connections
+            else 0.0,
+            'hosts': {host: dict(s) for host, s in self._host_stats.items()},
+        }
+
+    async def aclose(self) -> None:
+        """Close the pooled client if it is still open."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+
+_shared_transport: SharedHttpTransport | None = None
+
+
+def get_shared_transport() -> SharedHttpTransport:
+    """Return the process-wide transport, creating it on first use."""
+    global _shared_transport
+    if _shared_transport is None:
+        _shared_transport = SharedHttpTransport.from_env()
+    return _shared_transport
+
+
+def is_transport_failure(error: BaseException) -> bool:
+    """Return True for errors that say the replica itself is unreachable or unhealthy."""
+    if isinstance(error, A2AClientHTTPError):
+        return error.status_code >= 500 or error.status_code == 429
+    return isinstance(
+        error, (A2AClientTimeoutError, httpx.TransportError, asyncio.TimeoutError)
+    )
+
+
+class AgentReplica:
+    """One URL serving a remote agent, with the state used to route to it."""
+
+    def __init__(self, url: str, agent_name: str = ''):
+        self.url = url
+        self.breaker = CircuitBreaker.from_env(f'{agent_name} at {url}')
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected = False
+        self._agent_client: A2AClient | None = None
+        self._agent_client_http: httpx.AsyncClient | None = None
+
+    def client(self, transport: SharedHttpTransport, card: AgentCard) -> A2AClient:
+        """An A2A client for this replica bound to the current pooled httpx client."""
+        http_client = transport.client
+        if self._agent_client is None or self._agent_client_http is not http_client:
+            self._agent_client = A2AClient(http_client, card, url=self.url)
+            self._agent_client_http = http_client
+        return self._agent_client
+
+    def stats(self) -> dict[str, object]:
+        return {
+            'in_flight': self.in_flight,
+            'requests': self.requests,
+            'failures': self.failures,
+            'ejected': self.ejected,
+            'circuit': self.breaker.stats(),
+        }
+
 
 class RemoteAgentConnections:
-    """A class to hold the connections to the remote supplier agents."""
+    """A class to hold the connections to the remote supplier agents.
+
+    An agent name can be served by several replica URLs. Each request goes to
+    the healthy replica with the fewest requests in flight. A replica is
+    ejected after ``max_consecutive_failures`` transport failures in a row and
+    is re-admitted once a health check reaches it again. Each replica also has
+    a circuit breaker. Requests avoid replicas whose circuit is open and fail
+    fast with CircuitOpenError when every circuit is open.
+
+    Agents listed in ``HEDGED_AGENTS`` are hedged: once a request has taken
+    longer than the ``HEDGE_PERCENTILE`` latency of recent calls, the same
+    request is also sent to a second replica. The first successful response
+    wins and the other request is cancelled.
+    """
 
-    def __init__(self, agent_card: AgentCard, agent_url: str):
+    def __init__(
+        self,
+        agent_card: AgentCard,
+        agent_url: str,
+        transport: SharedHttpTransport | None = None,
+    ):
         print(f'agent_card: {agent_card}')
         print(f'agent_url: {agent_url}')
-        self._httpx_client = httpx.AsyncClient(timeout=30)
-        self.agent_client = A2AClient(
-            self._httpx_client, agent_card, url=agent_url
-        )
+        self._transport = transport or get_shared_transport()
         self.card = agent_card
+        self._streaming_enabled = (
+            os.getenv('A2A_STREAMING', 'true').lower() == 'true'
+        )
+        self.max_consecutive_failures = int(
+            os.getenv('A2A_REPLICA_MAX_FAILURES', '3')
+        )
+        self.replicas: list[AgentReplica] = [
+            AgentReplica(agent_url, agent_card.name)
+        ]
+        self._next_replica = 0
+        hedged = agent_card.name in _hedged_agent_names()
+        if hedged and agent_card.name in NON_IDEMPOTENT_AGENTS:
+            logger.warning(
+                f'Not hedging {agent_card.name}: its requests are not idempotent'
+            )
+        self.hedging_enabled = hedged and agent_card.name not in NON_IDEMPOTENT_AGENTS
+        self.hedge_percentile = float(os.getenv('HEDGE_PERCENTILE', '95'))
+        self.hedge_min_samples = int(os.getenv('HEDGE_MIN_SAMPLES', '10'))
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+        self.tasks_abandoned = 0
+        self._cancellations: set[asyncio.Task] = set()
+        self._latencies: deque[float] = deque(
+            maxlen=int(os.getenv('HEDGE_SAMPLE_WINDOW', '200'))
+        )
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self._streaming_enabled and bool(
+            self.card.capabilities and self.card.capabilities.streaming
+        )
+
+    @property
+    def supports_push_notifications(self) -> bool:
+        return bool(
+            self.card.capabilities and self.card.capabilities.push_notifications
+        )
+
+    @property
+    def agent_url(self) -> str:
+        """URL of the first replica, the one this connection was created for."""
+        return self.replicas[0].url
+
+    @property
+    def replica_urls(self) -> list[str]:
+        return [replica.url for replica in self.replicas]
+
+    @property
+    def agent_client(self) -> A2AClient:
+        """An A2A client for the first replica."""
+        return self.replicas[0].client(self._transport, self.card)
+
+    def add_replica(self, url: str) -> None:
+        """Serve this agent from url as well, if it is not already a replica."""
+        if url not in self.replica_urls:
+            print(f'Adding replica {url} for {self.card.name}')
+            self.replicas.append(AgentReplica(url, self.card.name))
 
     def get_agent(self) -> AgentCard:
         return self.card
 
+    def replica_stats(self) -> dict[str, dict[str, object]]:
+        return {replica.url: replica.stats() for replica in self.replicas}
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging a request, or None if it is not hedged.
+
+        This is the ``hedge_percentile`` latency of recent successful calls.
+        Nothing is hedged until ``hedge_min_samples`` calls have been timed.
+        """
+        if not self.hedging_enabled or len(self.replicas) < 2:
+            return None
+        if len(self._latencies) < self.hedge_min_samples:
+            return None
+        samples = sorted(self._latencies)
+        rank = math.ceil(self.hedge_percentile / 100 * len(samples)) - 1
+        return samples[min(max(rank, 0), len(samples) - 1)]
+
+    def hedge_stats(self) -> dict[str, object]:
+        return {
+            'enabled': self.hedging_enabled,
+            'delay_seconds': self.hedge_delay(),
+            'hedges_sent': self.hedges_sent,
+            'hedge_wins': self.hedge_wins,
+            'latency_samples': len(self._latencies),
+        }
+
+    def _pick_replica(
+        self, exclude: list[AgentReplica] | None = None
+    ) -> AgentReplica:
+        """Choose the healthy replica with the fewest requests in flight.
+
+        Ties go round-robin. Replicas with an open circuit and replicas in
+        exclude are skipped. When every remaining replica is ejected they are
+        tried anyway rather than failing the request outright.
+
+        Raises:
+            CircuitOpenError: If the circuit of every replica is open.
+        """
+        available = [
+            r
+            for r in self.replicas
+            if r not in (exclude or []) and r.breaker.is_available()
+        ]
+        if not available:
+            for replica in self.replicas:
+                replica.breaker.rejected_calls += 1
+            raise CircuitOpenError(
+                f'Circuit open for every replica of {self.card.name}'
+            )
+        candidates = [r for r in available if not r.ejected] or available
+        start = self._next_replica % len(candidates)
+        self._next_replica += 1
+        rotated = candidates[start:] + candidates[:start]
+        replica = min(rotated, key=lambda replica: replica.in_flight)
+        replica.breaker.acquire()
+        return replica
+
+    @asynccontextmanager
+    async def _lease(
+        self, replica: AgentReplica, record_latency: bool = False
+    ) -> AsyncIterator[AgentReplica]:
+        """Count a request against replica and record its outcome.
+
+        With record_latency, a successful request's latency is also added to
+        the samples the hedge delay is taken from. Only message sends that
+        wait for the task, blocking or streaming, are recorded; polls,
+        cancels and push sends return much sooner and would start hedges
+        early.
+        """
+        replica.in_flight += 1
+        replica.requests += 1
+        started = time.perf_counter()
+        try:
+            async with self._transport.host_slot(replica.url):
+                yield replica
+        except Exception as e:
+            failed = is_transport_failure(e)
+            if failed:
+                self._record_failure(replica, e)
+            replica.breaker.record(time.perf_counter() - started, failed)
+            raise
+        except BaseException:
+            # Cancelled. A call cut off by the caller's deadline, or one that
+            # had already run slow, tells the breaker the replica is slow; a
+            # lost hedge or an early cancel by the caller tells it nothing.
+            duration = time.perf_counter() - started
+            expires_at = call_deadline.get()
+            if expires_at is not None and time.time() >= expires_at - DEADLINE_SLACK_SECONDS:
+                replica.breaker.record(duration, True)
+            elif duration >= replica.breaker.slow_call_seconds:
+                replica.breaker.record(duration, False)
+            else:
+                replica.breaker.release()
+            raise
+        else:
+            duration = time.perf_counter() - started
+            replica.consecutive_failures = 0
+            replica.breaker.record(duration, False)
+            if record_latency:
+                self._latencies.append(duration)
+        finally:
+            replica.in_flight -= 1
+
+    def _record_failure(self, replica: AgentReplica, error: BaseException) -> None:
+        replica.failures += 1
+        replica.consecutive_failures += 1
+        if (
+            not replica.ejected
+            and replica.consecutive_failures >= self.max_consecutive_failures
+        ):
+            replica.ejected = True
+            logger.warning(
+                f'Ejecting replica {replica.url} of {self.card.name} after '
+                f'{replica.consecutive_failures} consecutive failures: {error}'
+            )
+
+    async def health_check(self) -> None:
+        """Probe every replica's agent card, ejecting and re-admitting replicas."""
+
+        async def probe(replica: AgentReplica) -> None:
+            resolver = A2ACardResolver(self._transport.client, replica.url)
+            try:
+                async with self._transport.host_slot(replica.url):
+                    await resolver.get_agent_card()
+            except Exception as e:
+                if not replica.ejected:
+                    replica.ejected = True
+                    logger.warning(
+                        f'Ejecting replica {replica.url} of {self.card.name}: health check failed: {e}'
+                    )
+                return
+            if replica.ejected:
+                print(f'Replica {replica.url} of {self.card.name} is healthy again')
+            replica.ejected = False
+            replica.consecutive_failures = 0
+
+        await asyncio.gather(*(probe(replica) for replica in self.replicas))
+
+    async def _hedged(
+        self,
+        attempt: Callable[[AgentReplica, int], Awaitable],
+        on_hedge: Callable[[], None] | None = None,
+    ) -> tuple[object, int]:
+        """Run attempt on a replica, hedging it on a second replica when it is slow.
+
+        attempt is called with the replica and the attempt index, 0 for the
+        first request and 1 for the hedge. on_hedge is called just before the
+        hedge is sent. Returns the first successful result and the index of
+        the attempt that produced it. The losing attempt is cancelled. If
+        every attempt fails, the first error is raised.
+        """
+        delay = self.hedge_delay()
+        if delay is None:
+            async with self._lease(self._pick_replica(), record_latency=True) as replica:
+                return await attempt(replica, 0), 0
+
+        chosen: list[AgentReplica] = []
+
+        async def run(index: int):
+            replica = self._pick_replica(exclude=chosen)
+            chosen.append(replica)
+            async with self._lease(replica, record_latency=True):
+                return await attempt(replica, index)
+
+        attempts = [asyncio.ensure_future(run(0))]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if not done and any(
+                r not in chosen and not r.ejected and r.breaker.is_available()
+                for r in self.replicas
+            ):
+                self.hedges_sent += 1
+                logger.info(
+                    f'Hedging request to {self.card.name} after {delay:.2f}s'
+                )
+                if on_hedge:
+                    on_hedge()
+                attempts.append(asyncio.ensure_future(run(1)))
+
+            pending = set(attempts)
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=attempts.index):
+                    if task.exception() is None:
+                        index = attempts.index(task)
+                        if index == 1:
+                            self.hedge_wins += 1
+                        return task.result(), index
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*attempts, return_exceptions=True)
+
     async def send_message(
         self, message_request: SendMessageRequest
     ) -> SendMessageResponse:
-        return await self.agent_client.send_message(message_request)
+        async def attempt(replica: AgentReplica, index: int) -> SendMessageResponse:
+            response = await replica.client(self._transport, self.card).send_message(
+                message_request
+            )
+            raise_if_overloaded(self.card.name, response.root)
+            return response
+
+        response, _ = await self._hedged(attempt)
+        return response
+
+    async def send_message_for_push(
+        self, message_request: SendMessageRequest
+    ) -> tuple[SendMessageResponse, str]:
+        """Send a non-blocking message whose task updates are pushed to a webhook.
+
+        The request is never hedged, so only one task is created. Returns the
+        response and the URL of the replica holding the task, for polling it.
+        """
+        async with self._lease(self._pick_replica()) as replica:
+            response = await replica.client(self._transport, self.card).send_message(
+                message_request
+            )
+            raise_if_overloaded(self.card.name, response.root)
+            return response, replica.url
+
+    async def get_task(
+        self, task_id: str, replica_url: str | None = None
+    ) -> Task | None:
+        """Fetch a task from the replica at replica_url, or from any replica.
+
+        Returns None when the task cannot be fetched right now, e.g. because
+        the circuit of its replica is open.
+        """
+        replica = next((r for r in self.replicas if r.url == replica_url), None)
+        if replica is None:
+            replica = self._pick_replica()
+        elif not replica.breaker.acquire():
+            return None
+        async with self._lease(replica):
+            response = await replica.client(self._transport, self.card).get_task(
+                GetTaskRequest(id=str(uuid.uuid4()), params=TaskQueryParams(id=task_id))
+            )
+        if isinstance(response.root, GetTaskSuccessResponse):
+            return response.root.result
+        return None
+
+    async def cancel_task(
+        self, task_id: str, replica_url: str | None = None
+    ) -> Task | None:
+        """Ask the replica at replica_url, or any replica, to cancel a task.
+
+        Returns the canceled Task, or None when the agent did not cancel it,
+        e.g. because the task had already finished.
+        """
+        replica = next((r for r in self.replicas if r.url == replica_url), None)
+        if replica is None:
+            replica = self._pick_replica()
+        elif not replica.breaker.acquire():
+            return None
+        async with self._lease(replica):
+            response = await replica.client(self._transport, self.card).cancel_task(
+                CancelTaskRequest(id=str(uuid.uuid4()), params=TaskIdParams(id=task_id))
+            )
+        if isinstance(response.root, CancelTaskSuccessResponse):
+            return response.root.result
+        return None
+
+    def abandon_task(self, task_id: str, replica_url: str | None = None) -> None:
+        """Cancel a remote task nobody waits for any more, in the background.
+
+        This frees the agent's capacity for other work without holding up
+        the caller that gave up on the task. Failures are only logged.
+        """
+        self.tasks_abandoned += 1
+
+        async def cancel() -> None:
+            # The cancel is not bound by the deadline the abandoned call missed
+            call_deadline.set(None)
+            try:
+                if await self.cancel_task(task_id, replica_url):
+                    logger.info(f'Canceled abandoned task {task_id} of {self.card.name}')
+            except Exception as e:
+                logger.info(
+                    f'Could not cancel abandoned task {task_id} of {self.card.name}: {e}'
+                )
+
+        cancellation = asyncio.create_task(cancel())
+        self._cancellations.add(cancellation)
+        cancellation.add_done_callback(self._cancellations.discard)
+
+    async def send_message_streaming(
+        self,
+        message_request: SendStreamingMessageRequest,
+        task_callback: TaskUpdateCallback | None = None,
+    ) -> Task | Message | None:
+        """Send a message over ``message/stream`` and return the resulting Task.
+
+        Task, status and artifact events are forwarded to ``task_callback`` as
+        they arrive and folded into the returned Task. A Message reply ends the
+        interaction and is returned as is. Once a request is hedged, events are
+        held back until one attempt wins and only the winner's are forwarded.
+        """
+        live: list[int | None] = [0]
+        held: dict[int, list[TaskCallbackArg]] = {0: [], 1: []}
+
+        def forward(index: int, event: TaskCallbackArg) -> None:
+            if task_callback is None:
+                return
+            if live[0] == index:
+                task_callback(event, self.card)
+            else:
+                held[index].append(event)
+
+        def hold_events() -> None:
+            live[0] = None
+
+        async def attempt(replica: AgentReplica, index: int) -> Task | Message | None:
+            return await self._stream_from(
+                replica, message_request, lambda event: forward(index, event)
+            )
+
+        result, winner = await self._hedged(attempt, on_hedge=hold_events)
+        if task_callback:
+            for event in held[winner]:
+                task_callback(event, self.card)
+        return result
+
+    async def _stream_from(
+        self,
+        replica: AgentReplica,
+        message_request: SendStreamingMessageRequest,
+        on_event: Callable[[TaskCallbackArg], None],
+    ) -> Task | Message | None:
+        task: Task | None = None
+        client = replica.client(self._transport, self.card)
+        try:
+            try:
+                async for response in client.send_message_streaming(message_request):
+                    if isinstance(response.root, JSONRPCErrorResponse):
+                        raise_if_overloaded(self.card.name, response.root)
+                        print(f'received error event: {response.root.error}')
+                        return task
+                    event = response.root.result
+                    if isinstance(event, Message):
+                        return event
+                    task = apply_task_event(task, event)
+                    on_event(event)
+                    if isinstance(event, TaskStatusUpdateEvent) and event.final:
+                        break
+            except A2AClientJSONRPCError as e:
+                raise_if_overloaded(self.card.name, e)
+                raise
+        except BaseException:
+            # A lost hedge, a deadline or a canceled workflow: stop the
+            # remote task too instead of leaving the agent working on it
+            if task is not None and task.status.state not in _FINISHED_TASK_STATES:
+                self.abandon_task(task.id, replica.url)
+            raise
+        return task
@@ -0,0 +1,124 @@
+"""
+Cache of remote agent results for repeated, identical steps of supplier workflows.
+"""
+
+import logging
+import os
+import time
+
+from collections import OrderedDict
+
+from a2a.types import Task, TaskState
+
+
+logger = logging.getLogger(__name__)
+
+CacheKey = tuple[str, str, str]
+
+
+def normalize_task_text(text: str) -> str:
+    """Collapse whitespace so reformatted prompts share a cache entry."""
+    return ' '.join(text.split())
+
+
+class ResultCache:
+    """Completed remote Tasks by agent name, normalized task text and data version.
+
+    Only agents named in ``agents`` are cached. Entries expire ``ttl``
+    seconds after they are stored, and the least recently used entry is
+    evicted once ``max_entries`` are held. The data version is part of the
+    key, so changing ``data_version`` when the underlying data changes makes
+    earlier entries unreachable until they are evicted. Cached Tasks are
+    shared between callers and must not be modified.
+    """
+
+    def __init__(
+        self,
+        agents: frozenset[str] = frozenset(),
+        *,
+        ttl: float = 300.0,
+        max_entries: int = 256,
+        data_version: str = '',
+    ):
+        self.agents = agents
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.data_version = data_version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: OrderedDict[CacheKey, tuple[float, Task]] = OrderedDict()
+
+    @classmethod
+    def from_env(cls, non_idempotent_agents: frozenset[str] = frozenset()) -> 'ResultCache':
+        """Build a cache configured from ``RESULT_CACHE_*`` environment variables.
+
+        Agents in non_idempotent_agents are never cached, since repeating
+        their tasks is the point of calling them.
+        """
+        agents = frozenset(
+            name.strip()
+            for name in os.getenv('RESULT_CACHE_AGENTS', '').split(',')
+            if name.strip()
+        )
+        for name in agents & non_idempotent_agents:
+            logger.warning(f'Not caching results of {name}, whose tasks are not idempotent')
+        return cls(
+            agents - non_idempotent_agents,
+            ttl=float(os.getenv('RESULT_CACHE_TTL_SECONDS', '300')),
+            max_entries=int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '256')),
+            data_version=os.getenv('RESULT_CACHE_DATA_VERSION', ''),
+        )
+
+    def caches(self, agent_name: str) -> bool:
+        return agent_name in self.agents and self.max_entries > 0
+
+    def _key(self, agent_name: str, task: str) -> CacheKey:
+        return (agent_name, normalize_task_text(task), self.data_version)
+
+    def get(self, agent_name: str, task: str) -> Task | None:
+        """Return the cached result of task on agent_name, or None."""
+        if not self.caches(agent_name):
+            return None
+        key = self._key(agent_name, task)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at >= self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, agent_name: str, task: str, result: object) -> None:
+        """Store result if agent_name is cached and the remote task completed."""
+        if not self.caches(agent_name):
+            return
+        if not isinstance(result, Task) or result.status.state != TaskState.completed:
+            return
+        key = self._key(agent_name, task)
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, agent_name: str | None = None) -> None:
+        """Drop the cached results of one agent, or of all agents."""
+        for key in [k for k in self._entries if agent_name in (None, k[0])]:
+            del self._entries[key]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'size': len(self._entries),
+        }
@@ -0,0 +1,214 @@
+"""
+Background execution of supplier workflows as A2A tasks that callers poll with tasks/get.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from a2a.server.tasks import InMemoryTaskStore, TaskStore
+from a2a.types import (
+    Artifact,
+    DataPart,
+    Message,
+    Part,
+    Role,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from pydantic import BaseModel
+
+
+logger = logging.getLogger(__name__)
+
+
+def json_safe(value: Any) -> Any:
+    """Convert workflow results, which hold remote Task objects, into plain JSON data."""
+
+    def default(item: Any) -> Any:
+        if isinstance(item, BaseModel):
+            return item.model_dump(mode='json', exclude_none=True)
+        return str(item)
+
+    return json.loads(json.dumps(value, default=default))
+
+
+class WorkflowJobManager:
+    """Runs workflows in the background and tracks each one as an A2A Task.
+
+    A submitted workflow is saved to the task store as a Task whose ID is the
+    workflow ID. Callers get that ID back at once and poll ``tasks/get`` (or
+    ``status``) while the workflow moves from submitted to working to
+    completed or failed. The workflow results are attached to the completed
+    Task as a data artifact. At most ``max_concurrency`` workflows run at a
+    time; the rest wait in the submitted state. A canceled workflow stops at
+    once, frees its slot and ends in the canceled state. A workflow ID has at
+    most one job at a time.
+    """
+
+    def __init__(
+        self, task_store: TaskStore | None = None, max_concurrency: int = 100
+    ):
+        self.task_store = task_store or InMemoryTaskStore()
+        self.max_concurrency = max_concurrency
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.canceled = 0
+        self._slots: asyncio.Semaphore | None = None
+        self._jobs: dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def from_env(cls, task_store: TaskStore | None = None) -> 'WorkflowJobManager':
+        """Build a job manager configured from ``WORKFLOW_JOB_*`` environment variables."""
+        return cls(
+            task_store,
+            max_concurrency=int(os.getenv('WORKFLOW_JOB_CONCURRENCY', '100')),
+        )
+
+    def attach_task_store(self, task_store: TaskStore) -> None:
+        """Keep jobs in the task store the A2A server reads, so tasks/get can see them."""
+        self.task_store = task_store
+
+    async def submit(
+        self,
+        workflow_id: str,
+        workflow_type: str,
+        run: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """Start run in the background as the job workflow_id and return at once.
+
+        Raises ValueError if a job for workflow_id is still waiting or running.
+        """
+        if self.is_running(workflow_id):
+            raise ValueError(f'Workflow {workflow_id} is already running')
+        task = Task(
+            id=workflow_id,
+            context_id=str(uuid.uuid4()),
+            status=TaskStatus(
+                state=TaskState.submitted,
+                timestamp=datetime.now(timezone.utc).isoformat(),
+            ),
+            metadata={'workflow_type': workflow_type},
+        )
+        await self.task_store.save(task)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        self.submitted += 1
+        job = asyncio.create_task(self._run(task, run))
+        self._jobs[workflow_id] = job
+        job.add_done_callback(lambda done: self._forget(workflow_id, done))
+        return {
+            'workflow_id': workflow_id,
+            'workflow_type': workflow_type,
+            'status': 'submitted',
+            'note': 'The workflow runs in the background. Poll its status with the workflow_id.',
+        }
+
+    def _forget(self, workflow_id: str, job: asyncio.Task) -> None:
+        if self._jobs.get(workflow_id) is job:
+            del self._jobs[workflow_id]
+
+    def is_running(self, workflow_id: str) -> bool:
+        """Whether a job for workflow_id is waiting or running."""
+        return workflow_id in self._jobs
+
+    async def cancel(self, workflow_id: str) -> bool:
+        """Cancel a job that is waiting or running, e.g. because a newer request superseded it.
+
+        Returns whether such a job was found. The job has stopped, and its
+        Task is canceled, by the time this returns.
+        """
+        job = self._jobs.get(workflow_id)
+        if job is None:
+            return False
+        job.cancel()
+        await asyncio.wait({job})
+        return True
+
+    async def _run(
+        self, task: Task, run: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> None:
+        try:
+            async with self._slots:
+                await self._update(task, TaskState.working)
+                try:
+                    results = await run()
+                except Exception as e:
+                    logger.exception(f'Workflow job {task.id} failed')
+                    self.failed += 1
+                    await self._update(task, TaskState.failed, f'Workflow failed: {e}')
+                    return
+        except asyncio.CancelledError:
+            logger.info(f'Workflow job {task.id} canceled')
+            self.canceled += 1
+            await self._update(task, TaskState.canceled, 'Workflow canceled')
+            raise
+        task.artifacts = [
+            Artifact(
+                artifact_id=str(uuid.uuid4()),
+                name='workflow_result',
+                parts=[Part(root=DataPart(data=json_safe(results)))],
+            )
+        ]
+        if results.get('status') == 'failed':
+            self.failed += 1
+            await self._update(
+                task, TaskState.failed, results.get('error') or 'Workflow failed'
+            )
+        else:
+            self.completed += 1
+            await self._update(task, TaskState.completed, results.get('summary'))
+
+    async def _update(
+        self, task: Task, state: TaskState, text: str | None = None
+    ) -> None:
+        message = None
+        if text:
+            message = Message(
+                role=Role.agent,
+                message_id=str(uuid.uuid4()),
+                task_id=task.id,
+                context_id=task.context_id,
+                parts=[Part(root=TextPart(text=text))],
+            )
+        task.status = TaskStatus(
+            state=state,
+            message=message,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+        )
+        await self.task_store.save(task)
+
+    async def status(self, workflow_id: str) -> dict[str, Any] | None:
+        """Return the state of a job and, once it has finished, its workflow results."""
+        task = await self.task_store.get(workflow_id)
+        if task is None or not (task.metadata or {}).get('workflow_type'):
+            return None
+        status: dict[str, Any] = {
+            'workflow_id': workflow_id,
+            'workflow_type': task.metadata['workflow_type'],
+            'state': task.status.state.value,
+            'updated_at': task.status.timestamp,
+        }
+        for artifact in task.artifacts or []:
+            for part in artifact.parts:
+                if isinstance(part.root, DataPart):
+                    status['result'] = part.root.data
+        return status
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'submitted': self.submitted,
+            'in_flight': len(self._jobs),
+            'completed': self.completed,
+            'failed': self.failed,
+            'canceled': self.canceled,
+        }
@@ -0,0 +1,36 @@
+"""
+Reporting of supplier workflow steps to the A2A executor running the workflow, so it can stream them.
+"""
+
+import logging
+
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+# Called with 'started' or 'finished' and the step. The step is only
+# {'workflow_id', 'step'} when it starts, and the full step when it finishes.
+StepListener = Callable[[str, dict[str, Any]], Awaitable[None]]
+
+# Set by the executor for the request it is running. Workflow steps run in
+# that request's context, including inside ADK tool calls, so they see it.
+step_listener: ContextVar[StepListener | None] = ContextVar(
+    'step_listener', default=None
+)
+
+
+async def report_step(event: str, step: dict[str, Any]) -> None:
+    """Tell the current request's listener, if any, that a step started or finished.
+
+    A failing listener is logged and never fails the workflow.
+    """
+    listener = step_listener.get()
+    if listener is None:
+        return
+    try:
+        await listener(event, step)
+    except Exception as e:
+        logger.warning(f'Could not report step {step.get("step")} {event}: {e}')
@@ -0,0 +1,239 @@
+"""
+SQLite checkpoints of supplier workflow steps, so failed or interrupted workflows can be resumed.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+
+from contextlib import closing
+from typing import Any
+
+from a2a.types import Task
+from pydantic import BaseModel
+
+
+logger = logging.getLogger(__name__)
+
+# Step statuses that mean the step still has to run when the workflow resumes.
+UNFINISHED_STEP_STATUSES = frozenset({'delayed', 'failed', 'partial'})
+# Remote task states that mean the agent did not complete the step's task.
+FAILED_TASK_STATES = frozenset({'failed', 'canceled', 'rejected'})
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json', exclude_none=True)
+    return str(value)
+
+
+def _result_failed(result: Any) -> bool:
+    """Whether result, or any result in a list of them, is not a Task the agent completed.
+
+    Delegations that fail with an error or a non-Task response yield None.
+    """
+    if isinstance(result, list):
+        return any(_result_failed(item) for item in result)
+    return not isinstance(result, Task) or result.status.state.value in FAILED_TASK_STATES
+
+
+def _step_status(step: dict[str, Any]) -> str:
+    if step.get('status'):
+        return step['status']
+    if _result_failed(step.get('result')):
+        return 'failed'
+    return 'completed'
+
+
+def _restore_result(value: Any) -> Any:
+    """Turn serialized remote Tasks back into Task objects."""
+    if isinstance(value, list):
+        return [_restore_result(item) for item in value]
+    if isinstance(value, dict) and value.get('kind') == 'task':
+        try:
+            return Task.model_validate(value)
+        except ValueError:
+            return value
+    return value
+
+
+class WorkflowStore:
+    """Workflows and their completed steps, keyed by workflow ID.
+
+    Every step is written as soon as it finishes. Workflows older than
+    ``retention`` seconds are removed when a new workflow is created. Reads
+    and writes run in a worker thread, so a locked database does not stall
+    the event loop. Storage errors are logged rather than raised, so a
+    workflow still runs when its checkpoints cannot be written.
+    """
+
+    def __init__(self, path: str, retention: float = 7 * 24 * 3600.0):
+        self.path = path
+        self.retention = retention
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with self._connect() as conn:
+                self._create_tables(conn)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f'Could not open workflow store {path}: {e}')
+
+    @staticmethod
+    def _create_tables(conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS workflows (
+                workflow_id TEXT PRIMARY KEY,
+                workflow_type TEXT NOT NULL,
+                request TEXT NOT NULL,
+                status TEXT NOT NULL,
+                summary TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS workflow_steps (
+                workflow_id TEXT NOT NULL,
+                step INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (workflow_id, step)
+            );
+            """
+        )
+
+    @classmethod
+    def from_env(cls, name: str) -> 'WorkflowStore':
+        """Build a store configured from ``WORKFLOW_STORE_*`` environment variables."""
+        default_path = os.path.join(
+            os.path.expanduser('~'),
+            '.cache',
+            'a2a_adk_agents',
+            f'{name}_workflows.sqlite3',
+        )
+        return cls(
+            path=os.getenv('WORKFLOW_STORE_PATH', default_path),
+            retention=float(os.getenv('WORKFLOW_STORE_RETENTION', str(7 * 24 * 3600))),
+        )
+
+    def _connect(self) -> 'closing[sqlite3.Connection]':
+        return closing(sqlite3.connect(self.path, timeout=10))
+
+    async def create(self, workflow_id: str, workflow_type: str, request: str) -> None:
+        """Record a new workflow and drop workflows past the retention period."""
+        await asyncio.to_thread(self._create, workflow_id, workflow_type, request)
+
+    def _create(self, workflow_id: str, workflow_type: str, request: str) -> None:
+        now = time.time()
+        try:
+            with self._connect() as conn, conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO workflows VALUES (?, ?, ?, ?, NULL, ?, ?)',
+                    (workflow_id, workflow_type, request, 'running', now, now),
+                )
+                conn.execute(
+                    'DELETE FROM workflow_steps WHERE workflow_id IN '
+                    '(SELECT workflow_id FROM workflows WHERE updated_at < ?)',
+                    (now - self.retention,),
+                )
+                conn.execute(
+                    'DELETE FROM workflows WHERE updated_at < ?',
+                    (now - self.retention,),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f'Could not record workflow {workflow_id}: {e}')
+
+    async def save_step(self, workflow_id: str, step: dict[str, Any]) -> None:
+        """Checkpoint one step of a workflow, replacing an earlier attempt at it."""
+        await asyncio.to_thread(self._save_step, workflow_id, step)
+
+    def _save_step(self, workflow_id: str, step: dict[str, Any]) -> None:
+        now = time.time()
+        try:
+            with self._connect() as conn, conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO workflow_steps VALUES (?, ?, ?, ?, ?)',
+                    (
+                        workflow_id,
+                        step['step'],
+                        _step_status(step),
+                        json.dumps(step, default=_to_json),
+                        now,
+                    ),
+                )
+                conn.execute(
+                    'UPDATE workflows SET updated_at = ? WHERE workflow_id = ?',
+                    (now, workflow_id),
+                )
+        except sqlite3.Error as e:
+            logger.warning(
+                f'Could not checkpoint step {step["step"]} of workflow {workflow_id}: {e}'
+            )
+
+    async def finish(
+        self, workflow_id: str, status: str, summary: str | None = None
+    ) -> None:
+        """Record the outcome of a workflow run."""
+        await asyncio.to_thread(self._finish, workflow_id, status, summary)
+
+    def _finish(self, workflow_id: str, status: str, summary: str | None) -> None:
+        try:
+            with self._connect() as conn, conn:
+                conn.execute(
+                    'UPDATE workflows SET status = ?, summary = ?, updated_at = ? '
+                    'WHERE workflow_id = ?',
+                    (status, summary, time.time(), workflow_id),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f'Could not record the outcome of workflow {workflow_id}: {e}')
+
+    async def load(self, workflow_id: str) -> dict[str, Any] | None:
+        """Return a workflow with its finished steps by step number, or None if unknown.
+
+        Steps that still have to run, such as a delayed purchase order step,
+        are left out.
+        """
+        return await asyncio.to_thread(self._load, workflow_id)
+
+    def _load(self, workflow_id: str) -> dict[str, Any] | None:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT workflow_type, request, status, summary FROM workflows '
+                    'WHERE workflow_id = ?',
+                    (workflow_id,),
+                ).fetchone()
+                step_rows = conn.execute(
+                    'SELECT step, status, data FROM workflow_steps '
+                    'WHERE workflow_id = ? ORDER BY step',
+                    (workflow_id,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f'Could not load workflow {workflow_id}: {e}')
+            return None
+        if row is None:
+            return None
+        steps = {}
+        for step_number, status, data in step_rows:
+            if status in UNFINISHED_STEP_STATUSES:
+                continue
+            try:
+                step = json.loads(data)
+            except ValueError as e:
+                logger.warning(
+                    f'Ignoring unreadable checkpoint of step {step_number} of {workflow_id}: {e}'
+                )
+                continue
+            step['result'] = _restore_result(step.get('result'))
+            steps[step_number] = step
+        workflow_type, request, status, summary = row
+        return {
+            'workflow_id': workflow_id,
+            'workflow_type': workflow_type,
+            'request': request,
+            'status': status,
+            'summary': summary,
+            'steps': steps,
+        }